@@ -2,26 +2,24 @@
 """
 Kompletny workflow: generuj raport + uruchom serwer
 """
+import argparse
+import importlib.util
 import sys
 import subprocess
 import webbrowser
-import http.server
-import socketserver
 import threading
 import time
 from pathlib import Path
 
-# Dodaj src do ścieżki
-sys.path.insert(0, str(Path(__file__).parent / 'src'))
+# Katalog projektu w ścieżce - importy src.* działają z dowolnego katalogu roboczego
+sys.path.insert(0, str(Path(__file__).parent))
 
-try:
-    from fp_analyzer import FPHoldingAnalyzer
-    from report_generator import ReportGenerator
-    LIBS_OK = True
-except ImportError:
-    LIBS_OK = False
+# Biblioteki raportu dostępne? (bez importu - src.* importujemy dopiero po ewentualnej instalacji)
+LIBS_OK = all(importlib.util.find_spec(name) is not None for name in ('pandas', 'openpyxl', 'plotly', 'numpy'))
 
 PORT = 8000
+EXCEL_FILE = "/Users/michalbaranski/Desktop/Tabela kosztowa doraportu.xlsx"
+REPORT_FILE = "reports/fp_holding_raport.html"
 
 def install_dependencies():
     """Zainstaluj zależności"""
@@ -37,56 +35,70 @@ def install_dependencies():
         print("⚠️  Zainstaluj ręcznie: pip3 install pandas openpyxl plotly numpy")
         return False
 
-def generate_report():
-    """Wygeneruj raport"""
-    print("\n📊 Generuję raport...")
-    
-    excel_file = "/Users/michalbaranski/Desktop/Tabela kosztowa doraportu.xlsx"
+def generate_report(jobs):
+    """Zleć wygenerowanie raportu kolejce zadań - serwer startuje od razu"""
+    excel_file = EXCEL_FILE
     
     if not Path(excel_file).exists():
         print(f"❌ Brak pliku: {excel_file}")
-        return False
+        return None
     
-    try:
-        from fp_analyzer import FPHoldingAnalyzer
-        from report_generator import ReportGenerator
-        
-        analyzer = FPHoldingAnalyzer(excel_file)
-        if not analyzer.run_full_analysis():
-            return False
-        
-        report_gen = ReportGenerator(analyzer)
-        report_path = report_gen.generate_html()
-        print(f"✅ Raport: {report_path}")
-        return True
-    except Exception as e:
-        print(f"❌ Błąd: {e}")
-        return False
+    print("\n📊 Generuję raport w tle...")
+    return jobs.submit(excel_file, 'fp_holding', output_path=REPORT_FILE)
 
-def open_browser():
-    """Otwórz przeglądarkę"""
+def open_browser(job=None):
+    """Otwórz przeglądarkę, gdy raport jest gotowy"""
     time.sleep(2)
-    url = f'http://localhost:{PORT}/reports/fp_holding_raport.html'
+    if job is not None:
+        job.wait()
+        if job.status != 'done':
+            print(f"❌ Błąd generowania raportu: {job.error}")
+            return
+        print(f"✅ Raport: {job.artifact}")
+    url = f'http://localhost:{PORT}/{REPORT_FILE}'
     webbrowser.open(url)
 
-def start_server():
-    """Uruchom serwer"""
+def start_server(watcher=None, job=None):
+    """Uruchom serwer (opcjonalnie z watcherem arkusza w tle)"""
+    from src.server import make_server, serve
+    
     print("\n🌐 Uruchamiam serwer...")
-    print(f"📡 Adres: http://localhost:{PORT}/reports/fp_holding_raport.html")
+    print(f"📡 Adres: http://localhost:{PORT}/{REPORT_FILE}")
     print("⚠️  Zatrzymaj: Ctrl+C\n")
     
-    threading.Thread(target=open_browser, daemon=True).start()
-    
-    Handler = http.server.SimpleHTTPRequestHandler
+    threading.Thread(target=open_browser, args=(job,), daemon=True).start()
     
+    httpd = make_server('.', '', PORT)
+    print("✅ Serwer działa!\n")
+    if watcher is not None:
+        watcher.start()
     try:
-        with socketserver.TCPServer(("", PORT), Handler) as httpd:
-            print("✅ Serwer działa!\n")
-            httpd.serve_forever()
-    except KeyboardInterrupt:
-        print("\n\n✅ Zatrzymano")
+        serve(httpd)
+    finally:
+        if watcher is not None:
+            watcher.stop()
+    print("\n\n✅ Zatrzymano")
+
+def make_watcher(jobs, interval, debounce):
+    """Watcher arkusza kosztowego - raport odświeża się po każdym zapisie w Excelu"""
+    from src.watcher import FPReportTarget, Watcher
+    
+    print(f"👀 Obserwuję: {EXCEL_FILE} (co {interval:g} s, debounce {debounce:g} s)")
+    # Ta sama kolejka i klucz co raport startowy - oba nie zapiszą REPORT_FILE naraz
+    target = FPReportTarget(EXCEL_FILE, output_path=REPORT_FILE, jobs=jobs)
+    return Watcher([target], interval=interval, debounce=debounce)
 
-def main():
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Generuj raport FP HOLDING i uruchom serwer")
+    p.add_argument("--watch", action="store_true", help="Regeneruj raport po każdej zmianie arkusza")
+    p.add_argument("--interval", type=float, default=1.0, help="Co ile sekund sprawdzać arkusz")
+    p.add_argument("--debounce", type=float, default=2.0,
+                   help="Ile sekund ciszy po ostatnim zapisie przed regeneracją")
+    return p.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
     print("=" * 80)
     print("🚀 FP HOLDING - AUTOMATYCZNY RAPORT")
     print("=" * 80)
@@ -97,12 +109,18 @@ def main():
         if not install_dependencies():
             return 1
     
-    # Generuj raport
-    if not generate_report():
+    # Generuj raport (w tle, kolejka zadań)
+    from src.jobs import JobQueue
+    jobs = JobQueue('reports', max_workers=1)
+    job = generate_report(jobs)
+    if job is None:
         return 1
     
     # Uruchom serwer
-    start_server()
+    try:
+        start_server(make_watcher(jobs, args.interval, args.debounce) if args.watch else None, job)
+    finally:
+        jobs.shutdown()
     
     return 0
 
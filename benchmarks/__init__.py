@@ -0,0 +1 @@
+# Benchmarki wydajności generowania raportów
@@ -0,0 +1,61 @@
+"""
+Benchmark: wykresy ReportGenerator z nowych go.Figure vs ze szkieletów
+vs z lekkiego buildera figure_spec (bez walidatorów).
+
+Symuluje seryjne generowanie raportów dla N encji (domyślnie 500) i mierzy
+czas budowy sześciu wykresów na raport w każdym trybie.
+
+    python -m benchmarks.bench_figure_skeletons --entities 500
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.synthetic import cost_table
+from src.figure_cache import clear_skeletons
+from src.fp_holding_analyzer import FPHoldingAnalyzer
+from src.report_generator import ReportGenerator
+
+
+def build_analyzers(count):
+    analyzers = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for seed in range(count):
+            analyzer = FPHoldingAnalyzer(excel_path=f'<synthetic:{seed}>')
+            analyzer.load_and_clean(cost_table(seed)).analyze().find_savings()
+            analyzers.append(analyzer)
+    return analyzers
+
+
+def time_charts(analyzers, reuse_figures=False, fast_figures=False):
+    clear_skeletons()
+    start = time.perf_counter()
+    for analyzer in analyzers:
+        generator = ReportGenerator(analyzer, max_workers=1, reuse_figures=reuse_figures,
+                                    fast_figures=fast_figures)
+        for _, method in ReportGenerator.CHART_BUILDERS:
+            getattr(generator, method)()
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entities', type=int, default=500, help='Liczba raportów (encji)')
+    args = parser.parse_args(argv)
+
+    analyzers = build_analyzers(args.entities)
+    full = time_charts(analyzers, reuse_figures=False)
+    reused = time_charts(analyzers, reuse_figures=True)
+    fast = time_charts(analyzers, fast_figures=True)
+
+    per_report = 1000 / args.entities
+    print(f"Encje: {args.entities}")
+    print(f"go.Figure na raport:  {full * per_report:8.2f} ms  (razem {full:.2f} s)")
+    print(f"Szkielety na raport:  {reused * per_report:8.2f} ms  (razem {reused:.2f} s)")
+    print(f"figure_spec na raport:{fast * per_report:8.2f} ms  (razem {fast:.2f} s)")
+    print(f"Przyspieszenie:       {full / reused:8.1f}x (szkielety), {full / fast:.1f}x (figure_spec)")
+
+
+if __name__ == '__main__':
+    main()
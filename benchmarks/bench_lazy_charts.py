@@ -0,0 +1,69 @@
+"""
+Benchmark: leniwe tworzenie wykresów raportu FP Holding vs render wszystkiego przy starcie.
+
+Bez przeglądarki - skrypt <script id="chart-loader"> z wygenerowanego raportu
+uruchamiamy w node na atrapach DOM, Plotly i IntersectionObserver
+(benchmarks/lazy_charts_harness.js) i liczymy wywołania Plotly.newPlot
+oraz Plotly.Plots.resize. Wartości dla wersji eager wynikają z poprzedniego
+skryptu: 6 × newPlot przy starcie i 6 × resize na każde zdarzenie resize.
+
+    python -m benchmarks.bench_lazy_charts --resize-events 60
+"""
+import argparse
+import contextlib
+import io
+import shutil
+import sys
+
+from benchmarks.lazy_charts import (CHART_IDS, chart_layout, extract_chart_specs, extract_dataset, extract_loader,
+                                    run_harness)
+from benchmarks.synthetic import cost_table
+from src.fp_holding_analyzer import FPHoldingAnalyzer
+from src.report_generator import ReportGenerator
+
+
+def render_report_html(seed=0) -> str:
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = FPHoldingAnalyzer(excel_path=f'<synthetic:{seed}>')
+        analyzer.load_and_clean(cost_table(seed)).analyze().find_savings()
+        stream = io.StringIO()
+        ReportGenerator(analyzer, max_workers=1, fast_figures=True).stream_html(stream)
+    return stream.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--viewport', type=int, default=900, help='Wysokość okna w px')
+    parser.add_argument('--resize-events', type=int, default=60, help='Zdarzenia resize w serii')
+    parser.add_argument('--frames', type=int, default=6, help='Klatki, na które rozkłada się seria resize')
+    args = parser.parse_args(argv)
+
+    if shutil.which('node') is None:
+        sys.exit('❌ Benchmark wymaga node w PATH')
+
+    charts = chart_layout()
+    page_end = max(top + height for top, height in charts.values())
+    per_frame = max(1, args.resize_events // args.frames)
+
+    def resize_burst():
+        return [step for _ in range(args.frames) for step in ({'resize': per_frame}, {'frame': True})]
+
+    scroll = [{'scroll': y} for y in range(0, page_end, 200)]
+    steps = resize_burst() + scroll + resize_burst()
+    html = render_report_html()
+    scenario = {'viewport': args.viewport, 'charts': charts, 'steps': steps, 'reportData': extract_dataset(html),
+                'specs': extract_chart_specs(html)}
+
+    counts = run_harness(extract_loader(html), scenario)
+    bursts = 2 * per_frame * args.frames
+    eager = {'newPlot': len(CHART_IDS), 'resize': len(CHART_IDS) * bursts}
+
+    print(f"Scenariusz: start, {bursts // 2} × resize, przewinięcie do końca, {bursts // 2} × resize")
+    print(f"{'':24}{'eager':>10}{'lazy':>10}")
+    print(f"{'newPlot przy starcie':24}{eager['newPlot']:>10}{counts['afterLoad']['newPlot']:>10}")
+    print(f"{'newPlot razem':24}{eager['newPlot']:>10}{counts['total']['newPlot']:>10}")
+    print(f"{'Plots.resize razem':24}{eager['resize']:>10}{counts['total']['resize']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Uruchamianie skryptu leniwego renderu wykresów (<script id="chart-loader">)
+poza przeglądarką - w node, na atrapach z lazy_charts_harness.js.
+"""
+import json
+import re
+import subprocess
+import tempfile
+from pathlib import Path
+
+HARNESS = Path(__file__).with_name('lazy_charts_harness.js')
+CHART_IDS = ['revenue-chart', 'trend-chart', 'profit-chart', 'zus-chart',
+             'cost-profit-chart', 'cost-breakdown-chart']
+
+
+def extract_loader(html: str) -> str:
+    """Zwraca treść <script id="chart-loader"> z raportu"""
+    match = re.search(r'<script id="chart-loader">(.*?)</script>', html, re.S)
+    if match is None:
+        raise ValueError('Raport nie zawiera skryptu chart-loader')
+    return match.group(1)
+
+
+def extract_dataset(html: str) -> str:
+    """Zwraca treść bloku <script id="report-data"> (JSON zbioru danych raportu)"""
+    match = re.search(r'<script type="application/json" id="report-data">(.*?)</script>', html, re.S)
+    if match is None:
+        raise ValueError('Raport nie zawiera bloku report-data')
+    return match.group(1)
+
+
+def extract_chart_specs(html: str) -> dict:
+    """Zwraca treść bloków <script id="chart-spec-..."> raportu: {id wykresu: JSON}"""
+    return dict(re.findall(r'<script type="application/json" id="chart-spec-([\w-]+)">(.*?)</script>', html, re.S))
+
+
+def extract_kpi_cards(html: str) -> list:
+    """Zwraca karty KPI (#kpi-grid) raportu: [{'className': ..., 'innerHTML': ...}]"""
+    grid = html[html.index('id="kpi-grid"'):]
+    grid = grid[:grid.index('</div>\n            </div>')]
+    cards = re.findall(r'<div class="(metric-card[^"]*)">(.*?<div class="subtitle">.*?</div>)', grid, re.S)
+    return [{'className': class_name, 'innerHTML': inner} for class_name, inner in cards]
+
+
+def chart_layout(first_top=4200, spacing=720, height=580):
+    """Przybliżone położenie kontenerów wykresów w raporcie: {id: [top, height]}"""
+    return {chart_id: [first_top + i * spacing, height] for i, chart_id in enumerate(CHART_IDS)}
+
+
+def run_harness(loader: str, scenario: dict) -> dict:
+    """
+    Uruchamia loader w node: liczniki {'afterLoad': {...}, 'total': {...}},
+    końcowe karty KPI ('kpi') i zdarzenia wysłane na document ('events')
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        loader_path = Path(tmp, 'loader.js')
+        scenario_path = Path(tmp, 'scenario.json')
+        loader_path.write_text(loader, encoding='utf-8')
+        scenario_path.write_text(json.dumps(scenario), encoding='utf-8')
+        output = subprocess.run(['node', str(HARNESS), str(loader_path), str(scenario_path)],
+                                check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
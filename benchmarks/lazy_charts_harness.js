@@ -0,0 +1,140 @@
+// Uruchamia skrypt <script id="chart-loader"> z raportu na atrapach DOM/Plotly
+// i liczy wywołania Plotly.newPlot, Plotly.react oraz Plotly.Plots.resize.
+//
+//     node benchmarks/lazy_charts_harness.js loader.js scenario.json
+//
+// scenario.json: {viewport, reportData, specs, kpi, charts: {id: [top, height]}, steps: [...]}
+// reportData to treść bloku <script id="report-data"> z raportu,
+// specs ({id: treść bloku chart-spec-<id>}) i kpi (karty #kpi-grid jako
+// [{className, innerHTML}]) są opcjonalne.
+// Kroki: {"scroll": y} | {"resize": n_zdarzeń} | {"frame": true}
+//        | {"update": {reportData, specs, kpi}} - nowa wersja raportu dla applyUpdate (live reload)
+// Wynik: liczniki, końcowy stan kart KPI i zdarzenia wysłane na document.
+'use strict';
+
+const fs = require('fs');
+const vm = require('vm');
+
+const [loaderPath, scenarioPath] = process.argv.slice(2);
+const scenario = JSON.parse(fs.readFileSync(scenarioPath, 'utf8'));
+const counts = { newPlot: 0, react: 0, resize: 0, jsonParse: 0 };
+
+let scrollY = 0;
+const listeners = {};
+const frames = [];
+const observers = [];
+const events = [];
+
+function intersects(id, margin) {
+    const [top, height] = scenario.charts[id];
+    const viewTop = scrollY - margin;
+    const viewBottom = scrollY + scenario.viewport + margin;
+    return top < viewBottom && top + height > viewTop;
+}
+
+class IntersectionObserver {
+    constructor(callback, options) {
+        this.callback = callback;
+        this.margin = parseInt((options && options.rootMargin) || '0', 10);
+        this.state = new Map();
+        observers.push(this);
+    }
+
+    observe(target) {
+        // Jak w przeglądarce: pierwszy wpis trafia do callbacku zaraz po observe
+        this.state.set(target, null);
+    }
+
+    check() {
+        const entries = [];
+        this.state.forEach((previous, target) => {
+            const isIntersecting = intersects(target.id, this.margin);
+            if (isIntersecting !== previous) {
+                this.state.set(target, isIntersecting);
+                entries.push({ target, isIntersecting });
+            }
+        });
+        if (entries.length) this.callback(entries, this);
+    }
+}
+
+function pageDocument(page) {
+    return {
+        getElementById(id) {
+            if (id === 'report-data') return { id, textContent: page.reportData };
+            if (id.startsWith('chart-spec-')) {
+                return { id, textContent: (page.specs || {})[id.slice('chart-spec-'.length)] || '{}' };
+            }
+            return { id };
+        },
+        querySelectorAll(selector) {
+            return selector === '#kpi-grid .metric-card' ? page.kpi || [] : [];
+        }
+    };
+}
+
+const sandbox = {
+    JSON: {
+        parse(text) {
+            counts.jsonParse += 1;
+            return JSON.parse(text);
+        },
+        stringify: JSON.stringify
+    },
+    Plotly: {
+        newPlot() { counts.newPlot += 1; },
+        react() { counts.react += 1; },
+        Plots: { resize() { counts.resize += 1; } }
+    },
+    document: Object.assign(pageDocument(scenario), {
+        dispatchEvent(event) { events.push({ type: event.type, detail: event.detail }); }
+    }),
+    CustomEvent: class {
+        constructor(type, options) {
+            this.type = type;
+            this.detail = options && options.detail;
+        }
+    },
+    DOMParser: class {
+        // Atrapa: "HTML" nowej wersji to JSON {reportData, specs}
+        parseFromString(text) { return pageDocument(JSON.parse(text)); }
+    },
+    requestAnimationFrame(callback) {
+        frames.push(callback);
+        return frames.length;
+    },
+    IntersectionObserver,
+    Set,
+    Object,
+};
+sandbox.window = sandbox;
+sandbox.addEventListener = (type, callback) => {
+    (listeners[type] = listeners[type] || []).push(callback);
+};
+
+function flushFrame() {
+    frames.splice(0).forEach(callback => callback());
+    observers.forEach(observer => observer.check());
+}
+
+vm.runInNewContext(fs.readFileSync(loaderPath, 'utf8'), sandbox);
+flushFrame();
+const afterLoad = Object.assign({}, counts);
+
+for (const step of scenario.steps) {
+    if (step.scroll !== undefined) {
+        scrollY = step.scroll;
+        flushFrame();
+    } else if (step.resize !== undefined) {
+        for (let i = 0; i < step.resize; i++) {
+            (listeners.resize || []).forEach(callback => callback());
+        }
+    } else if (step.frame) {
+        flushFrame();
+    } else if (step.update) {
+        sandbox.applyUpdate(JSON.stringify(step.update));
+    }
+}
+flushFrame();
+
+process.stdout.write(JSON.stringify({ afterLoad, total: counts, kpi: scenario.kpi || [], events }));
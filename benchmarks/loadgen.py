@@ -0,0 +1,120 @@
+"""
+Generator obciążenia HTTP: N klientów keep-alive (wątki) na mieszance ścieżek.
+
+Bez zależności od src - używany przez benchmarks/loadtest.py i testy.
+"""
+import http.client
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Percentyl metodą najbliższej rangi z posortowanej listy (0.0 dla pustej)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Sample:
+    """Wynik jednego żądania"""
+
+    __slots__ = ('target', 'latency', 'status', 'size')
+
+    def __init__(self, target, latency, status, size):
+        self.target = target
+        self.latency = latency
+        self.status = status
+        self.size = size
+
+
+def _client(url, targets, requests, offset, headers, samples, start_event, stop_event):
+    parts = urlsplit(url)
+    names = list(targets)
+    conn = None
+    local = []
+    start_event.wait()
+    i = 0
+    while (requests is None or i < requests) and not stop_event.is_set():
+        name = names[(offset + i) % len(names)]
+        i += 1
+        if conn is None:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        started = time.perf_counter()
+        try:
+            conn.request('GET', targets[name], headers=headers)
+            response = conn.getresponse()
+            size = len(response.read())
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = None
+            size, status = 0, None
+        local.append(Sample(name, time.perf_counter() - started, status, size))
+    if conn is not None:
+        conn.close()
+    samples.extend(local)
+
+
+def run_load(url: str, targets: Dict[str, str], clients: int = 8, requests: Optional[int] = 100,
+             duration: Optional[float] = None, headers: Optional[dict] = None) -> dict:
+    """
+    Uruchamia `clients` klientów na `url` i zwraca podsumowanie (summarize).
+
+    Każdy klient wysyła po kolei żądania do targets ({nazwa: ścieżka}),
+    zaczynając od innej ścieżki, aż wyśle `requests` żądań albo minie
+    `duration` sekund.
+    """
+    if requests is None and duration is None:
+        raise ValueError('Podaj liczbę żądań na klienta albo czas trwania')
+    headers = dict(headers or {'Accept-Encoding': 'gzip'})
+    samples: List[Sample] = []
+    start_event, stop_event = threading.Event(), threading.Event()
+    threads = [threading.Thread(target=_client, args=(url, targets, requests, offset, headers, samples,
+                                                      start_event, stop_event), daemon=True)
+               for offset in range(clients)]
+    for thread in threads:
+        thread.start()
+
+    # Wszyscy klienci startują naraz - tworzenie wątków nie wlicza się do czasu
+    started = time.perf_counter()
+    start_event.set()
+    if duration is not None:
+        stop_event.wait(duration)
+        stop_event.set()
+    for thread in threads:
+        thread.join()
+    return summarize(samples, time.perf_counter() - started)
+
+
+def _stats(samples: List[Sample], elapsed: float) -> dict:
+    latencies = sorted(sample.latency for sample in samples)
+    errors = sum(1 for sample in samples if sample.status is None or sample.status >= 400)
+    stats = {
+        'requests': len(samples),
+        'errors': errors,
+        'bytes': sum(sample.size for sample in samples),
+        'throughput_rps': round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+    }
+    for p in PERCENTILES:
+        stats[f'p{p}_ms'] = round(percentile(latencies, p) * 1000, 3)
+    stats['max_ms'] = round(latencies[-1] * 1000, 3) if latencies else 0.0
+    return stats
+
+
+def summarize(samples: List[Sample], elapsed: float) -> dict:
+    """{'elapsed_s', 'total': statystyki, 'targets': {nazwa: statystyki}}"""
+    by_target: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_target.setdefault(sample.target, []).append(sample)
+    return {
+        'elapsed_s': round(elapsed, 3),
+        'total': _stats(samples, elapsed),
+        'targets': {name: _stats(items, elapsed) for name, items in sorted(by_target.items())},
+    }
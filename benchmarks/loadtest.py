@@ -0,0 +1,118 @@
+"""
+Test obciążeniowy lokalnego serwera raportów (src/server.py).
+
+Serwer startuje w osobnym procesie (własny GIL) na wolnym porcie
+localhost, z endpointami jak w run_server.py i syntetycznym arkuszem
+kosztowym. N klientów keep-alive odpytuje na zmianę raport na żądanie,
+API analizy i statyczny raport. Wynik: przepustowość i p50/p95/p99 na
+ścieżkę oraz commit, w JSON do porównywania między commitami.
+
+    python -m benchmarks.loadtest --clients 16 --duration 10 --output wyniki.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.loadgen import PERCENTILES, run_load
+from benchmarks.synthetic import write_cost_workbook
+
+TARGETS = {
+    'report': '/report',
+    'api': '/api/analysis?fields=summary,savings',
+    'static': '/reports/fp_holding_raport.html',
+}
+
+
+def _serve(directory, workbook, workers, ready):
+    """Proces serwera: raport statyczny, endpointy jak w run_server.py, port przez `ready`"""
+    from src.pipeline import ReportService, run_analysis
+    from src.report_generator import ReportGenerator
+    from src.server import ReportRequestHandler, make_server, report_routes, serve
+
+    class QuietHandler(ReportRequestHandler):
+        """Bez logu każdego żądania na stderr"""
+
+        def log_message(self, format, *args):
+            pass
+
+    # Komunikaty analizy (print) przy każdym renderze /report nie są potrzebne
+    with contextlib.redirect_stdout(io.StringIO()):
+        ReportGenerator(run_analysis(workbook), fast_figures=True).generate_html(
+            str(Path(directory, TARGETS['static'].lstrip('/'))))
+        service = ReportService({'fp_holding': workbook})
+        server = make_server(directory, '127.0.0.1', 0, workers, QuietHandler, routes=report_routes(service))
+        ready.send(server.server_address[1])
+        ready.close()
+        serve(server)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(clients, workers, requests=None, duration=None, warmup=20):
+    with tempfile.TemporaryDirectory() as tmp:
+        workbook = str(write_cost_workbook(Path(tmp, 'koszty.xlsx')))
+        ready, child_end = multiprocessing.Pipe(duplex=False)
+        server = multiprocessing.Process(target=_serve, args=(tmp, workbook, workers, child_end), daemon=True)
+        server.start()
+        child_end.close()
+        try:
+            if not ready.poll(120):
+                raise RuntimeError('Serwer nie wystartował w 120 s')
+            url = f'http://127.0.0.1:{ready.recv()}'
+            # Rozgrzewka: pierwszy render /report i cache ETag nie wchodzą do wyników
+            run_load(url, TARGETS, clients=1, requests=warmup)
+            result = run_load(url, TARGETS, clients=clients, requests=requests, duration=duration)
+        finally:
+            server.terminate()
+            server.join()
+
+    result['config'] = {'clients': clients, 'workers': workers, 'requests_per_client': requests,
+                        'duration_s': duration, 'targets': TARGETS}
+    result['commit'] = git_commit()
+    result['python'] = platform.python_version()
+    return result
+
+
+def print_result(result):
+    header = f"{'':10}{'żądań':>8}{'błędy':>7}{'req/s':>9}" + ''.join(f"{f'p{p} ms':>10}" for p in PERCENTILES)
+    print(header)
+    rows = list(result['targets'].items()) + [('razem', result['total'])]
+    for name, stats in rows:
+        print(f"{name:10}{stats['requests']:>8}{stats['errors']:>7}{stats['throughput_rps']:>9.1f}"
+              + ''.join(f"{stats[f'p{p}_ms']:>10.2f}" for p in PERCENTILES))
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Test obciążeniowy serwera raportów na localhost")
+    p.add_argument('--clients', '-c', type=int, default=16, help='Liczba równoczesnych klientów')
+    p.add_argument('--workers', '-w', type=int, default=16, help='Wątki serwera (jak run_server.py --workers)')
+    p.add_argument('--duration', '-d', type=float, default=10.0, help='Czas pomiaru w sekundach')
+    p.add_argument('--requests', '-n', type=int, help='Zamiast czasu: liczba żądań na klienta')
+    p.add_argument('--output', '-o', help='Zapisz wynik jako JSON')
+    args = p.parse_args(argv)
+
+    duration = None if args.requests else args.duration
+    mode = f"{args.requests} żądań na klienta" if args.requests else f"{duration:g} s"
+    print(f"🚦 {args.clients} klientów, {args.workers} workerów serwera, {mode}", file=sys.stderr)
+    result = run(args.clients, args.workers, requests=args.requests, duration=duration)
+    print_result(result)
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"💾 Wynik: {args.output} (commit {result['commit']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Pomiar czasu i szczytu pamięci pojedynczego benchmarku.
+
+Bez zależności od src - używany przez benchmarks/suite.py i testy.
+"""
+import gc
+import statistics
+import time
+import tracemalloc
+from typing import Callable, List
+
+
+def median(values: List[float]) -> float:
+    return statistics.median(values) if values else 0.0
+
+
+def mad(values: List[float]) -> float:
+    """Mediana odchyleń bezwzględnych od mediany - rozrzut odporny na pojedyncze zakłócenia"""
+    center = median(values)
+    return median([abs(value - center) for value in values])
+
+
+def measure(func: Callable[[], object], repeat: int = 5, warmup: int = 1, memory: bool = True) -> dict:
+    """
+    Wywołuje func `warmup` + `repeat` razy i zwraca czasy powtórzeń (s).
+
+    Szczyt pamięci (tracemalloc, razem z tablicami numpy) mierzy osobne,
+    dodatkowe wywołanie - śledzenie alokacji nie zawyża zapisanych czasów.
+    """
+    for _ in range(warmup):
+        func()
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    result = {
+        'times_s': [round(value, 6) for value in times],
+        'median_s': round(median(times), 6),
+        'mad_s': round(mad(times), 6),
+        'min_s': round(min(times), 6) if times else 0.0,
+        'peak_bytes': None,
+    }
+    if memory:
+        gc.collect()
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        try:
+            func()
+            result['peak_bytes'] = max(0, tracemalloc.get_traced_memory()[1] - baseline)
+        finally:
+            if started:
+                tracemalloc.stop()
+    return result
@@ -0,0 +1,210 @@
+"""
+Bramka regresji wydajności: porównanie benchmarków z zapisaną linią bazową.
+
+Linia bazowa (benchmarks/baseline.json, w repozytorium) trzyma dla każdego
+benchmarku i skali medianę czasu, jej MAD (mediana odchyleń bezwzględnych)
+i szczyt pamięci. JSON jest zapisywany z posortowanymi kluczami, jeden
+benchmark na blok - `git diff` pokazuje, co zmieniło się między commitami.
+
+Próg regresji czasu zależy od szumu pomiaru:
+
+    próg = max(k × 1.4826 × MAD, tolerancja × mediana bazowa, min_ms)
+
+(1.4826 × MAD szacuje odchylenie standardowe; brany jest większy MAD
+z bazy i bieżącego przebiegu). Pamięć: wzrost szczytu ponad tolerancję
+i 64 kB. Kod wyjścia 1, gdy któryś etap się pogorszył.
+
+    python -m benchmarks.regression                 # sprawdź względem bazy
+    python -m benchmarks.regression --update        # zapisz nową bazę
+    python -m benchmarks.regression --results bench.json   # porównaj zapisany wynik suite
+
+Moduł nie importuje src przy imporcie (zestaw benchmarków ładuje się
+dopiero w main), więc porównanie jest testowane bez uruchamiania pipeline'u.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).with_name('baseline.json')
+DEFAULT_SCALES = ('14', '1k')
+MAD_TO_SIGMA = 1.4826
+MEMORY_SLACK_BYTES = 64 * 1024
+
+OK, REGRESSION, IMPROVED, NEW = 'ok', 'regresja', 'szybciej', 'nowy'
+
+
+def entry_key(entry) -> str:
+    return f"{entry['name']}@{entry['scale']}"
+
+
+def baseline_from_results(result, previous=None) -> dict:
+    """Linia bazowa z wyniku run_suite; benchmarki spoza przebiegu zostają z `previous`"""
+    benchmarks = dict((previous or {}).get('benchmarks', {}))
+    for entry in result['results']:
+        if 'skipped' in entry:
+            continue
+        benchmarks[entry_key(entry)] = {
+            'median_ms': round(entry['median_s'] * 1000, 3),
+            'mad_ms': round(entry['mad_s'] * 1000, 3),
+            'peak_kb': None if entry.get('peak_bytes') is None else round(entry['peak_bytes'] / 1024, 1),
+            'repeat': len(entry['times_s']),
+        }
+    return {
+        'version': 1,
+        'commit': result.get('commit'),
+        'environment': {'python': result.get('python'), 'platform': result.get('platform')},
+        'benchmarks': benchmarks,
+    }
+
+
+def write_baseline(baseline, path=BASELINE_PATH):
+    Path(path).write_text(json.dumps(baseline, indent=2, sort_keys=True, ensure_ascii=False) + '\n',
+                          encoding='utf-8')
+    return path
+
+
+def load_baseline(path=BASELINE_PATH):
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def time_threshold_ms(base, current, k=3.0, tolerance=0.10, min_ms=0.05) -> float:
+    """Dopuszczalny wzrost mediany (ms) - szum z MAD, ale nie mniej niż tolerancja i min_ms"""
+    spread = MAD_TO_SIGMA * max(base['mad_ms'], current['mad_ms'])
+    return max(k * spread, tolerance * base['median_ms'], min_ms)
+
+
+def compare(baseline, result, k=3.0, tolerance=0.10, memory_tolerance=0.10, min_ms=0.05):
+    """
+    Porównuje wynik run_suite z linią bazową.
+
+    Zwraca listę wierszy {key, status, base, current, change, threshold_ms, memory}
+    w kolejności wyniku; benchmarki z bazy, których nie uruchomiono, nie są
+    raportowane (bramka sprawdza tylko to, co zmierzyła).
+    """
+    current = baseline_from_results(result)['benchmarks']
+    known = baseline.get('benchmarks', {}) if baseline else {}
+    rows = []
+    for key, now in current.items():
+        base = known.get(key)
+        row = {'key': key, 'current': now, 'base': base, 'change': None, 'threshold_ms': None, 'memory': None}
+        if base is None:
+            row['status'] = NEW
+            rows.append(row)
+            continue
+
+        threshold = time_threshold_ms(base, now, k, tolerance, min_ms)
+        delta = now['median_ms'] - base['median_ms']
+        row['threshold_ms'] = round(threshold, 3)
+        row['change'] = delta / base['median_ms'] if base['median_ms'] else None
+        if delta > threshold:
+            row['status'] = REGRESSION
+        elif -delta > threshold:
+            row['status'] = IMPROVED
+        else:
+            row['status'] = OK
+
+        if base.get('peak_kb') is not None and now.get('peak_kb') is not None:
+            growth = (now['peak_kb'] - base['peak_kb']) * 1024
+            allowed = max(memory_tolerance * base['peak_kb'] * 1024, MEMORY_SLACK_BYTES)
+            row['memory'] = REGRESSION if growth > allowed else OK
+            if row['memory'] == REGRESSION:
+                row['status'] = REGRESSION
+        rows.append(row)
+    return rows
+
+
+def regressions(rows):
+    return [row for row in rows if row['status'] == REGRESSION]
+
+
+def _timing(values):
+    if values is None:
+        return '-'
+    return f"{values['median_ms']:.2f} ±{values['mad_ms']:.2f}"
+
+
+def _memory(values):
+    if values is None or values.get('peak_kb') is None:
+        return '-'
+    return f"{values['peak_kb']:.0f}"
+
+
+def format_report(rows) -> str:
+    """Tabela porównania dla terminala (stała szerokość kolumn, bez kolorów)"""
+    icons = {OK: '✅', REGRESSION: '❌', IMPROVED: '⚡', NEW: '🆕'}
+    lines = [f"{'':3}{'benchmark@skala':26}{'baza ms':>16}{'teraz ms':>16}{'zmiana':>9}{'próg ms':>9}"
+             f"{'baza kB':>10}{'teraz kB':>10}  status"]
+    for row in rows:
+        change = '-' if row['change'] is None else f"{row['change'] * 100:+.1f}%"
+        threshold = '-' if row['threshold_ms'] is None else f"{row['threshold_ms']:.2f}"
+        status = row['status'] + (' (pamięć)' if row['memory'] == REGRESSION else '')
+        lines.append(f"{icons[row['status']]:3}{row['key']:26}{_timing(row['base']):>16}{_timing(row['current']):>16}"
+                     f"{change:>9}{threshold:>9}{_memory(row['base']):>10}{_memory(row['current']):>10}  {status}")
+    failed = regressions(rows)
+    if failed:
+        lines.append(f"❌ Regresja: {', '.join(row['key'] for row in failed)}")
+    else:
+        lines.append(f"✅ Bez regresji ({len(rows)} benchmarków)")
+    return '\n'.join(lines)
+
+
+def environment_warning(baseline, result):
+    """Ostrzeżenie, gdy baza pochodzi z innego Pythona lub platformy (czasy nieporównywalne)"""
+    if not baseline:
+        return None
+    environment = baseline.get('environment', {})
+    current = {'python': result.get('python'), 'platform': result.get('platform')}
+    differing = [name for name, value in current.items() if environment.get(name) not in (None, value)]
+    if not differing:
+        return None
+    details = ', '.join(f"{name}: {environment[name]} → {current[name]}" for name in differing)
+    return f"⚠️  Linia bazowa z innego środowiska ({details}) - zaktualizuj ją na tej maszynie (--update)"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--baseline', default=str(BASELINE_PATH), help='Plik linii bazowej (JSON)')
+    parser.add_argument('--update', action='store_true', help='Zapisz wynik jako nową linię bazową')
+    parser.add_argument('--results', help='Porównaj zapisany wynik benchmarks.suite zamiast uruchamiać')
+    parser.add_argument('--scale', action='append', help=f"Skale (domyślnie {', '.join(DEFAULT_SCALES)})")
+    parser.add_argument('--only', action='append', help='Benchmarki lub grupy (domyślnie etapy pipeline\'u)')
+    parser.add_argument('--repeat', '-n', type=int, default=7, help='Powtórzenia pomiaru')
+    parser.add_argument('--data-dir', help='Katalog na wygenerowane dane (jak w benchmarks.suite)')
+    parser.add_argument('-k', type=float, default=3.0, help='Ile odchyleń (1.4826 × MAD) to jeszcze szum')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='Minimalny względny próg czasu')
+    parser.add_argument('--memory-tolerance', type=float, default=0.10, help='Względny próg szczytu pamięci')
+    args = parser.parse_args(argv)
+
+    if args.results:
+        result = json.loads(Path(args.results).read_text(encoding='utf-8'))
+    else:
+        from benchmarks.suite import PIPELINE, run_suite
+
+        result = run_suite(args.scale or DEFAULT_SCALES, args.only or PIPELINE, repeat=args.repeat,
+                           data_dir=args.data_dir)
+
+    baseline = load_baseline(args.baseline)
+    if args.update:
+        write_baseline(baseline_from_results(result, baseline), args.baseline)
+        print(f"💾 Linia bazowa: {args.baseline} (commit {result.get('commit')})")
+        return 0
+
+    if baseline is None:
+        print(f"❌ Brak linii bazowej {args.baseline} - utwórz ją: python -m benchmarks.regression --update",
+              file=sys.stderr)
+        return 2
+    warning = environment_warning(baseline, result)
+    if warning:
+        print(warning)
+    print(f"📏 Baza: commit {baseline.get('commit')}, teraz: commit {result.get('commit')}")
+    rows = compare(baseline, result, args.k, args.tolerance, args.memory_tolerance)
+    print(format_report(rows))
+    return 1 if regressions(rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,295 @@
+"""
+Zestaw benchmarków pipeline'u raportów na danych syntetycznych w kilku skalach.
+
+Skale (wiersze wejścia): 14 (jak prawdziwy arkusz), 1k, 100k, 10M.
+Dane tworzą deterministyczne generatory z benchmarks/synthetic.py (seed)
+w układach, których oczekuje kod: CSV sprzedaży, arkusz kosztowy .xlsx
+i arkusz dzienny z wierszami 'dd.mm.YYYY HH:MM do dd.mm.YYYY HH:MM'.
+
+Grupy:
+- ingest   read_sales_csv, FPHoldingAnalyzer.load_and_clean, extract_daily_data
+- analysis summarize_sales (DataFrame i memmap z src/columnar.py), rollup_months (miesiące
+           z kostki agregatów, src/rollup.py), FPHoldingAnalyzer.validate, analyze, find_savings
+- report   build_charts, stream_html (render raportu razem z wykresami)
+
+Benchmark powyżej swojego limitu wierszy jest pomijany z powodem:
+arkusz .xlsx mieści ~1 mln wierszy, a extract_daily_data przetwarza
+wiersze w pętli Pythona (10M wierszy to dziesiątki minut). Analizator FP
+czyta 14 pierwszych wierszy arkusza, więc jego etapy nie rosną ze skalą -
+benchmark to pokazuje.
+
+    python -m benchmarks.suite --scale 14 --scale 1k --repeat 5 --output wyniki.json
+    python -m benchmarks.suite --only ingest --data-dir .bench-data
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.loadtest import git_commit
+from benchmarks.measure import measure
+from benchmarks.synthetic import EXCEL_MAX_ROWS, daily_rows, write_cost_workbook, write_sales_csv
+from src.advanced_dashboard import AdvancedSalesDashboard
+from src.analysis import summarize_sales
+from src.columnar import ColumnarStore
+from src.fp_holding_analyzer import FPHoldingAnalyzer
+from src.ingest import read_sales_csv
+from src.report_generator import ReportGenerator
+from src.rollup import RollupCube
+
+SCALES = {'14': 14, '1k': 1_000, '100k': 100_000, '10M': 10_000_000}
+DAILY_MAX_ROWS = 100_000
+# Etapy pipeline'u FPHoldingAnalyzer / ReportGenerator (bramka regresji, benchmarks/regression.py)
+PIPELINE = ('load_and_clean', 'validate', 'analyze', 'find_savings', 'build_charts', 'render')
+
+
+class Inputs:
+    """
+    Dane wejściowe dla jednej skali, tworzone przy pierwszym użyciu.
+
+    Pliki trafiają do `directory` pod nazwą z liczbą wierszy i seedem -
+    z trwałym katalogiem (--data-dir) drugi przebieg ich nie generuje.
+    """
+
+    def __init__(self, directory, seed: int = 0):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.seed = seed
+        self._memo = {}
+
+    def _file(self, kind, rows, suffix, writer):
+        path = self.directory / f'{kind}_{rows}_s{self.seed}{suffix}'
+        if not path.exists():
+            print(f"🧪 Generuję {path.name}...", file=sys.stderr)
+            tmp = path.with_name(f'.{path.name}.tmp{suffix}')
+            writer(tmp, rows)
+            tmp.replace(path)
+        return path
+
+    def _cached(self, key, factory):
+        if key not in self._memo:
+            self._memo[key] = factory()
+        return self._memo[key]
+
+    def sales_csv(self, rows):
+        return self._file('sprzedaz', rows, '.csv', lambda path, n: write_sales_csv(path, n, self.seed))
+
+    def cost_workbook(self, rows):
+        return self._file('koszty', rows, '.xlsx', lambda path, n: write_cost_workbook(path, self.seed, n))
+
+    def columnar(self, rows):
+        """Magazyn kolumnowy z CSV sprzedaży tej skali (encja 'bench')"""
+        path = self.directory / f'kolumny_{rows}_s{self.seed}'
+        if not path.exists():
+            print(f"🧪 Buduję {path.name}...", file=sys.stderr)
+            ColumnarStore(path).ingest_sales_csv('bench', self.sales_csv(rows))
+        return path
+
+    def sales_frame(self, rows):
+        return self._cached(('sales', rows), lambda: read_sales_csv(self.sales_csv(rows)))
+
+    def daily_frame(self, rows):
+        return self._cached(('daily', rows), lambda: daily_rows(rows, self.seed))
+
+    def rollup(self, rows):
+        """Kostka agregatów przychodu z CSV sprzedaży tej skali (encja 'bench')"""
+        return self._cached(('rollup', rows),
+                            lambda: RollupCube.from_frame('bench', self.sales_frame(rows), 'date', ['revenue']))
+
+    def analyzer(self, rows):
+        """Analizator po load_and_clean, analyze i find_savings (wejście benchmarków raportu)"""
+        def load():
+            analyzer = FPHoldingAnalyzer(str(self.cost_workbook(rows)))
+            return analyzer.load_and_clean().validate().analyze().find_savings()
+        return self._cached(('analyzer', rows), load)
+
+    def clear(self):
+        """Zwalnia ramki danych trzymane w pamięci (przed następną skalą)"""
+        self._memo.clear()
+
+
+class Benchmark:
+    """
+    prepare(inputs, rows) przygotowuje dane (poza pomiarem) i zwraca funkcję mierzoną.
+    max_rows - największa skala, którą benchmark obsługuje; `limit` to powód.
+    """
+
+    def __init__(self, name, group, prepare, max_rows=None, limit=None):
+        self.name = name
+        self.group = group
+        self.prepare = prepare
+        self.max_rows = max_rows
+        self.limit = limit
+
+    def skip_reason(self, rows):
+        if self.max_rows is not None and rows > self.max_rows:
+            return self.limit
+        return None
+
+
+def _read_sales_csv(inputs, rows):
+    path = inputs.sales_csv(rows)
+    return lambda: read_sales_csv(path)
+
+
+def _summarize_sales(inputs, rows):
+    frame = inputs.sales_frame(rows)
+    return lambda: summarize_sales(frame)
+
+
+def _summarize_sales_mmap(inputs, rows):
+    # Otwarcie magazynu jest częścią pomiaru - to zamiennik read_sales_csv + summarize_sales
+    path = inputs.columnar(rows)
+    return lambda: summarize_sales(ColumnarStore(path).sales_slice('bench'))
+
+
+def _rollup_months(inputs, rows):
+    # Szereg miesięczny dashboardu z magazynu (load_from_rollup) - komórki miesięcy zamiast wierszy sprzedaży
+    cube = inputs.rollup(rows)
+    return lambda: cube.query('bench', 'month', '2020-02-10', '2024-11-03', clip=True)
+
+
+def _load_and_clean(inputs, rows):
+    workbook = str(inputs.cost_workbook(rows))
+    return lambda: FPHoldingAnalyzer(workbook).load_and_clean()
+
+
+def _extract_daily_data(inputs, rows):
+    frame = inputs.daily_frame(rows)
+    dashboard = AdvancedSalesDashboard.__new__(AdvancedSalesDashboard)
+    return lambda: dashboard.extract_daily_data(frame)
+
+
+def _validate(inputs, rows):
+    analyzer = inputs.analyzer(rows)
+    return analyzer.validate
+
+
+def _analyze(inputs, rows):
+    analyzer = inputs.analyzer(rows)
+    return analyzer.analyze
+
+
+def _find_savings(inputs, rows):
+    analyzer = inputs.analyzer(rows)
+    return analyzer.find_savings
+
+
+def _build_charts(inputs, rows):
+    # Jeden wątek - czas to praca wykresów, nie szeregowanie puli
+    generator = ReportGenerator(inputs.analyzer(rows), max_workers=1, fast_figures=True)
+    return generator.build_charts
+
+
+def _render(inputs, rows):
+    generator = ReportGenerator(inputs.analyzer(rows), max_workers=1, fast_figures=True)
+    return lambda: generator.stream_html(io.StringIO())
+
+
+_EXCEL_LIMIT = f'arkusz .xlsx mieści {EXCEL_MAX_ROWS - 1} wierszy danych'
+
+BENCHMARKS = [
+    Benchmark('read_sales_csv', 'ingest', _read_sales_csv),
+    Benchmark('load_and_clean', 'ingest', _load_and_clean, EXCEL_MAX_ROWS - 1, _EXCEL_LIMIT),
+    Benchmark('extract_daily_data', 'ingest', _extract_daily_data, DAILY_MAX_ROWS,
+              'pętla po wierszach w Pythonie - powyżej 100k wierszy trwa minuty'),
+    Benchmark('summarize_sales', 'analysis', _summarize_sales),
+    Benchmark('summarize_sales_mmap', 'analysis', _summarize_sales_mmap),
+    Benchmark('rollup_months', 'analysis', _rollup_months),
+    Benchmark('validate', 'analysis', _validate, EXCEL_MAX_ROWS - 1, _EXCEL_LIMIT),
+    Benchmark('analyze', 'analysis', _analyze, EXCEL_MAX_ROWS - 1, _EXCEL_LIMIT),
+    Benchmark('find_savings', 'analysis', _find_savings, EXCEL_MAX_ROWS - 1, _EXCEL_LIMIT),
+    Benchmark('build_charts', 'report', _build_charts, EXCEL_MAX_ROWS - 1, _EXCEL_LIMIT),
+    Benchmark('render', 'report', _render, EXCEL_MAX_ROWS - 1, _EXCEL_LIMIT),
+]
+
+
+def select(only=None):
+    """Benchmarki o nazwach albo z grup podanych w `only` (wszystkie, gdy puste)"""
+    if not only:
+        return list(BENCHMARKS)
+    selected = [bench for bench in BENCHMARKS if bench.name in only or bench.group in only]
+    unknown = set(only) - {bench.name for bench in BENCHMARKS} - {bench.group for bench in BENCHMARKS}
+    if unknown:
+        raise ValueError(f"Nieznane benchmarki: {', '.join(sorted(unknown))}")
+    return selected
+
+
+def run_suite(scales=('14', '1k'), only=None, repeat=5, warmup=1, memory=True, data_dir=None, seed=0):
+    """Uruchamia benchmarki w podanych skalach; zwraca wynik gotowy do zapisu w JSON"""
+    benchmarks = select(only)
+    results = []
+    with contextlib.ExitStack() as stack:
+        directory = data_dir or stack.enter_context(tempfile.TemporaryDirectory(prefix='bench-'))
+        inputs = Inputs(directory, seed)
+        for scale in scales:
+            rows = SCALES[scale]
+            for bench in benchmarks:
+                entry = {'name': bench.name, 'group': bench.group, 'scale': scale, 'rows': rows}
+                reason = bench.skip_reason(rows)
+                if reason:
+                    entry['skipped'] = reason
+                else:
+                    print(f"⏱️  {bench.name} [{scale}]...", file=sys.stderr)
+                    # Komunikaty analizatora (print) nie są częścią wyniku
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        func = bench.prepare(inputs, rows)
+                        entry.update(measure(func, repeat=repeat, warmup=warmup, memory=memory))
+                results.append(entry)
+            inputs.clear()
+
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {'scales': list(scales), 'repeat': repeat, 'warmup': warmup, 'seed': seed},
+        'results': results,
+    }
+
+
+def _format_bytes(value):
+    if value is None:
+        return '-'
+    return f'{value / (1024 * 1024):.1f} MB'
+
+
+def print_results(result, file=None):
+    print(f"{'benchmark':20}{'skala':>7}{'mediana':>12}{'min':>12}{'pamięć':>11}", file=file)
+    for entry in result['results']:
+        label = f"{entry['name']:20}{entry['scale']:>7}"
+        if 'skipped' in entry:
+            print(f"{label}   pominięty: {entry['skipped']}", file=file)
+            continue
+        print(f"{label}{entry['median_s'] * 1000:>9.2f} ms{entry['min_s'] * 1000:>9.2f} ms"
+              f"{_format_bytes(entry['peak_bytes']):>11}", file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', action='append', choices=list(SCALES),
+                        help='Skala wejścia (można powtarzać); domyślnie wszystkie')
+    parser.add_argument('--only', action='append', help='Nazwa benchmarku albo grupy (ingest, analysis, report)')
+    parser.add_argument('--repeat', '-n', type=int, default=5, help='Powtórzenia pomiaru')
+    parser.add_argument('--warmup', type=int, default=1, help='Wywołania przed pomiarem')
+    parser.add_argument('--no-memory', action='store_true', help='Bez pomiaru szczytu pamięci (tracemalloc)')
+    parser.add_argument('--data-dir', help='Katalog na wygenerowane dane (zostają między uruchomieniami)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed generatorów danych')
+    parser.add_argument('--output', '-o', help='Zapisz wynik jako JSON')
+    args = parser.parse_args(argv)
+
+    result = run_suite(args.scale or list(SCALES), args.only, args.repeat, args.warmup, not args.no_memory,
+                       args.data_dir, args.seed)
+    print_results(result)
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"💾 Wynik: {args.output} (commit {result['commit']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""
+Syntetyczne dane w układzie arkuszy FP HOLDING (deterministyczne - seed).
+
+Moduł nie importuje kodu z src, więc korzystają z niego zarówno benchmarki,
+jak i testy.
+"""
+import csv
+
+import numpy as np
+import pandas as pd
+
+# Limit wierszy arkusza .xlsx (Excel 2007+) - większych skoroszytów nie da się zapisać
+EXCEL_MAX_ROWS = 1_048_576
+# Okresy ponad tyle miesięcy powtarzają się (daty pandas kończą się w 2262 r.)
+_PERIOD_CYCLE = 1200
+# Generowanie dużych CSV porcjami - ta sama porcja daje ten sam plik dla danego seeda
+_CHUNK_ROWS = 1_000_000
+
+
+def cost_table(seed: int = 0, months: int = 14, start: str = '2024-08-01') -> pd.DataFrame:
+    """
+    Surowy arkusz kosztowy: kolumny A-M jak w 'Tabela kosztowa doraportu.xlsx'.
+
+    months > 14 daje dłuższy arkusz (skale benchmarków); ponad 100 lat
+    okresy się powtarzają. FPHoldingAnalyzer i tak czyta 14 pierwszych wierszy.
+    """
+    rng = np.random.default_rng(seed)
+    revenue_net = rng.uniform(250_000, 450_000, months).round(2)
+    kwota_netto = rng.uniform(150_000, 300_000, months).round(2)
+    zus = rng.uniform(20_000, 60_000, months).round(2)
+    pit = rng.uniform(5_000, 15_000, months).round(2)
+    employee = rng.uniform(30_000, 80_000, months).round(2)
+    receipts = rng.integers(3_000, 6_000, months)
+    periods = pd.date_range(start, periods=min(months, _PERIOD_CYCLE), freq='MS')
+    return pd.DataFrame({
+        'Okres': np.resize(periods.values, months),
+        'Obrót brutto': (revenue_net * 1.08).round(2),
+        'Obrót netto': revenue_net,
+        'VAT': (revenue_net * 0.08).round(2),
+        'Koszta brutto': (kwota_netto * 1.23).round(2),
+        'Kwota netto': kwota_netto,
+        'VAT koszt': (kwota_netto * 0.23).round(2),
+        'ZUS': zus,
+        'PIT': pit,
+        'Koszt pracowniczy': employee,
+        'ZYSK': (revenue_net - kwota_netto - zus - pit - employee).round(2),
+        'Średni rachunek': (revenue_net / receipts).round(2),
+        'Ilość rachunków': receipts,
+    })
+
+
+def write_cost_workbook(path, seed: int = 0, months: int = 14):
+    """Zapisuje cost_table(seed, months) jako .xlsx"""
+    if months + 1 > EXCEL_MAX_ROWS:
+        raise ValueError(f"Arkusz .xlsx mieści {EXCEL_MAX_ROWS - 1} wierszy danych, podano {months}")
+    cost_table(seed, months).to_excel(path, index=False)
+    return path
+
+
+def monthly_sales(months: int = 12, seed: int = 0, start: str = '2024-10-01') -> pd.DataFrame:
+    """Miesięczne rozliczenie sprzedaży (CSV dashboardu): date, customer, revenue"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=months, freq='MS')
+    return pd.DataFrame({
+        'date': dates.strftime('%Y-%m-%d'),
+        'customer': dates.strftime('%b %Y'),
+        'revenue': rng.uniform(200_000, 400_000, months).round(2),
+    })
+
+
+def daily_sheet(days: int = 30, seed: int = 0, start: str = '2025-09-01') -> pd.DataFrame:
+    """
+    Arkusz 'Zestawienie sprzedaży' z dziennymi wierszami, jak czyta go
+    AdvancedSalesDashboard.extract_daily_data: kolumna D to zakres
+    'dd.mm.YYYY HH:MM do dd.mm.YYYY HH:MM', kolumna E to kwota.
+    """
+    rng = np.random.default_rng(seed)
+    opening = pd.date_range(start, periods=days, freq='D') + pd.Timedelta(hours=8)
+    closing = opening + pd.Timedelta(hours=15)
+    ranges = opening.strftime('%d.%m.%Y %H:%M') + ' do ' + closing.strftime('%d.%m.%Y %H:%M')
+    return pd.DataFrame({
+        'Lp': np.arange(1, days + 1),
+        'Punkt': 'Forum Panorama',
+        'Kasa': 'K1',
+        'Okres': ranges,
+        'Kwota': rng.uniform(5_000, 20_000, days).round(2),
+    })
+
+
+def write_dashboard_sources(directory, days: int = 30, seed: int = 0):
+    """Zapisuje CSV miesięczny i arkusz dzienny dla AdvancedSalesDashboard; zwraca (csv, xlsx)"""
+    csv_path = f'{directory}/rozliczenie_data.csv'
+    excel_path = f'{directory}/zestawienie_sprzedazy.xlsx'
+    monthly_sales(seed=seed).to_csv(csv_path, index=False)
+    daily_sheet(days, seed).to_excel(excel_path, index=False)
+    return csv_path, excel_path
+
+
+def sales_orders(rows: int, seed: int = 0, start: str = '2020-01-01', days: int = 1826,
+                 customers: int = 500) -> pd.DataFrame:
+    """
+    Zamówienia w układzie CSV sprzedaży (read_sales_csv, summarize_sales):
+    date, customer, revenue - `rows` wierszy rozłożonych po `days` dniach.
+    """
+    rng = np.random.default_rng(seed)
+    day = rng.integers(0, days, rows)
+    dates = np.datetime64(start, 'D') + np.sort(day)
+    names = np.array([f'Klient {i:04d}' for i in range(1, customers + 1)], dtype=object)
+    return pd.DataFrame({
+        'date': np.datetime_as_string(dates, unit='D'),
+        'customer': names[rng.integers(0, customers, rows)],
+        'revenue': rng.lognormal(5.5, 0.8, rows).round(2),
+    })
+
+
+def write_sales_csv(path, rows: int, seed: int = 0):
+    """
+    Zapisuje `rows` zamówień (jak sales_orders) do CSV porcjami po 1 mln
+    wierszy - 10 mln wierszy nie trzyma całej tabeli w pamięci naraz.
+    """
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerow(['date', 'customer', 'revenue'])
+        for index, offset in enumerate(range(0, rows, _CHUNK_ROWS)):
+            chunk = sales_orders(min(_CHUNK_ROWS, rows - offset), seed=seed * 100_003 + index)
+            chunk.to_csv(f, header=False, index=False)
+    return path
+
+
+def daily_rows(rows: int, seed: int = 0, start: str = '2015-01-01', days: int = 3652) -> pd.DataFrame:
+    """
+    Arkusz dzienny (jak daily_sheet) o `rows` wierszach: przy dużych skalach
+    kilka kas (zmian) na dzień, w kolejności dat.
+
+    Co dziesiąta kwota jest tekstem z przecinkiem ('12 345,67'), a co setny
+    wiersz to podsumowanie bez zakresu dat - oba przypadki obsługuje
+    AdvancedSalesDashboard.extract_daily_data.
+    """
+    rng = np.random.default_rng(seed)
+    index = np.arange(rows)
+    day = index * min(rows, days) // max(rows, 1)
+    opening = pd.Timestamp(start) + pd.to_timedelta(day, unit='D') + pd.Timedelta(hours=8)
+    closing = opening + pd.Timedelta(hours=15)
+    ranges = np.asarray(opening.strftime('%d.%m.%Y %H:%M') + ' do ' + closing.strftime('%d.%m.%Y %H:%M'),
+                        dtype=object)
+    amounts = rng.uniform(500, 20_000, rows).round(2).astype(object)
+    text = index % 10 == 9
+    amounts[text] = [f'{value:,.2f}'.replace(',', ' ').replace('.', ',') for value in amounts[text]]
+    summary = index % 100 == 99
+    shift = index - np.searchsorted(day, day) + 1
+    ranges[summary] = None
+    amounts[summary] = None
+    return pd.DataFrame({
+        'Lp': index + 1,
+        'Punkt': 'Forum Panorama',
+        'Kasa': np.where(summary, 'Razem', 'K' + pd.Series(shift).astype(str)),
+        'Okres': ranges,
+        'Kwota': amounts,
+    })
@@ -2,16 +2,15 @@
 """
 Główny skrypt generujący raport FP HOLDING
 """
+import argparse
 import sys
 from pathlib import Path
 
-# Dodaj src do ścieżki
-sys.path.insert(0, str(Path(__file__).parent / 'src'))
+from src.fp_holding_analyzer import FPHoldingAnalyzer
+from src.profiler import SamplingProfiler
+from src.report_generator import ReportGenerator
 
-from fp_holding_analyzer import FPHoldingAnalyzer
-from report_generator import ReportGenerator
-
-def main():
+def generate():
     print("=" * 80)
     print("🚀 GENEROWANIE RAPORTU FP HOLDING")
     print("=" * 80)
@@ -45,5 +44,20 @@ def main():
     
     return 0
 
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Generuj raport FP HOLDING")
+    p.add_argument("--profile", metavar="PLIK",
+                   help="Profil próbkujący (collapsed stacks dla flamegraph.pl / speedscope)")
+    args = p.parse_args(argv)
+    if not args.profile:
+        return generate()
+    
+    with SamplingProfiler() as profiler:
+        code = generate()
+    profiler.write(args.profile)
+    print(f"🔬 Profil: {args.profile}")
+    profiler.print_summary()
+    return code
+
 if __name__ == "__main__":
     sys.exit(main())
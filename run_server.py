@@ -1,67 +1,36 @@
 """
 Lokalny serwer HTTP do wyświetlania raportu FP HOLDING
 """
-import http.server
-import socketserver
-import webbrowser
-import time
-import threading
-from pathlib import Path
-import os
-
-
-PORT = 8000
-
-
-def open_browser():
-    """Otwórz przeglądarkę po 2 sekundach"""
-    time.sleep(2)
-    url = f'http://localhost:{PORT}/reports/fp_holding_raport.html'
-    print(f"🌐 Otwieram przeglądarkę: {url}")
-    webbrowser.open(url)
-
-
-def main():
-    # Sprawdź czy raport istnieje
-    report = Path('reports/fp_holding_raport.html')
-    
-    if not report.exists():
-        print("❌ Raport nie istnieje!")
-        print("\n📝 Najpierw wygeneruj raport:")
-        print("   python3 generate_fp_report.py")
-        return
-    
-    print("=" * 80)
-    print("🚀 URUCHAMIANIE LOKALNEGO SERWERA")
-    print("=" * 80)
-    print(f"\n📡 Serwer: http://localhost:{PORT}")
-    print(f"📊 Raport: http://localhost:{PORT}/reports/fp_holding_raport.html")
-    print("\n🌐 Przeglądarka otworzy się automatycznie za 2 sekundy...")
-    print("\n⚠️  Aby zatrzymać serwer: naciśnij Ctrl+C")
-    print("=" * 80 + "\n")
-    
-    # Otwórz przeglądarkę w osobnym wątku
-    browser_thread = threading.Thread(target=open_browser, daemon=True)
-    browser_thread.start()
-    
-    # Uruchom serwer
-    Handler = http.server.SimpleHTTPRequestHandler
-    
-    try:
-        with socketserver.TCPServer(("", PORT), Handler) as httpd:
-            print(f"✅ Serwer działa na porcie {PORT}")
-            print(f"✅ Raport dostępny pod: http://localhost:{PORT}/reports/fp_holding_raport.html\n")
-            httpd.serve_forever()
-    except KeyboardInterrupt:
-        print("\n\n✅ Serwer zatrzymany")
-        print("💡 Raport pozostaje w folderze 'reports/' i można go otworzyć bezpośrednio")
-    except OSError as e:
-        if "Address already in use" in str(e):
-            print(f"\n❌ Port {PORT} jest już zajęty!")
-            print(f"\n💡 Zatrzym inny serwer lub użyj innego portu:")
-            print(f"   python3 -m http.server 8080")
-        else:
-            print(f"\n❌ Błąd: {e}")
+import argparse
+
+from src.app import parse_workbook, run_server
+from src.pipeline import DEFAULT_CACHE_BYTES
+from src.server import DEFAULT_PORT, DEFAULT_WORKERS
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Lokalny serwer raportu FP HOLDING")
+    p.add_argument("--port", "-p", type=int, default=DEFAULT_PORT, help="Port serwera")
+    p.add_argument("--bind", "-b", default="", help="Adres nasłuchiwania (domyślnie wszystkie interfejsy)")
+    p.add_argument("--workers", "-w", type=int, default=DEFAULT_WORKERS,
+                   help="Maksymalna liczba równocześnie obsługiwanych połączeń")
+    p.add_argument("--no-browser", action="store_true", help="Nie otwieraj przeglądarki")
+    p.add_argument("--workbook", action="append", required=True, type=parse_workbook, metavar="ENCJA=ŚCIEŻKA",
+                   help="Arkusz kosztowy encji dla /report (wymagany, można podać wielokrotnie)")
+    p.add_argument("--cache-mb", type=int, default=DEFAULT_CACHE_BYTES // (1024 * 1024),
+                   help="Limit pamięci cache raportów /report w MB")
+    p.add_argument("--job-workers", type=int, default=2,
+                   help="Wątki kolejki zadań generowania raportów (/api/jobs)")
+    p.add_argument("--no-live-reload", action="store_true",
+                   help="Nie powiadamiaj otwartych kart o nowej wersji raportu (SSE /events)")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    run_server(dict(args.workbook), port=args.port, bind=args.bind,
+               workers=args.workers, cache_bytes=args.cache_mb * 1024 * 1024, job_workers=args.job_workers,
+               live_reload=not args.no_live_reload, browser=not args.no_browser)
 
 
 if __name__ == "__main__":
@@ -11,19 +11,54 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import plotly.offline as pyo
 from datetime import datetime, timedelta
+from functools import partial
 import warnings
 warnings.filterwarnings('ignore')
 
+from . import figure_spec
+from .atomic import atomic_open
+from .columnar import ColumnarStore
+from .compression import precompress
+from .downsample import downsample_indices
+from .ingest import daily_frame, parse_daily_rows
+from .parallel import deferred_builders, run_builders
+from .templating import stream_template
+
 class AdvancedSalesDashboard:
-    def __init__(self, csv_path, excel_path):
+    # Docelowa liczba punktów na serię wykresu dziennego - dłuższe szeregi są downsamplowane
+    DAILY_MAX_POINTS = 2000
+    # Powyżej tylu punktów serie rysujemy przez WebGL (Scattergl) zamiast SVG
+    SCATTERGL_THRESHOLD = 1000
+
+    def __init__(self, csv_path, excel_path, max_workers=None, use_processes=False, fast_figures=False,
+                 max_points=DAILY_MAX_POINTS, downsample_method='lttb', store=None, entity=None,
+                 start=None, end=None):
         self.csv_path = csv_path
         self.excel_path = excel_path
+        # store (src/store.py, src/columnar.py): dane encji z magazynu zamiast CSV i arkusza, zawężone do start-end
+        self.store = store
+        self.entity = entity
+        self.start = start
+        self.end = end
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.max_points = max_points
+        self.downsample_method = downsample_method
+        # fast_figures: słowniki z figure_spec zamiast walidowanych obiektów plotly
+        self.fast_figures = fast_figures
+        self._bind_figures()
+        self.chart_timings = {}
         self.df_monthly = None
         self.df_daily = None
+        # Tygodnie ISO z kostki agregatów (load_from_rollup); None - liczone z df_daily
+        self.df_weekly = None
         self.load_data()
         
     def load_data(self):
         """Ładowanie i przygotowanie danych"""
+        if self.store is not None:
+            self.load_from_store()
+            return
         # Dane miesięczne z CSV
         self.df_monthly = pd.read_csv(self.csv_path)
         self.df_monthly['date'] = pd.to_datetime(self.df_monthly['date'], errors='coerce')
@@ -36,42 +71,59 @@ class AdvancedSalesDashboard:
             print(f"Błąd przy ładowaniu Excela: {e}")
             self.df_daily = pd.DataFrame()
     
+    def load_from_store(self):
+        """Sprzedaż i dni encji z magazynu - zapytania po indeksie (entity, date) zamiast parsowania plików"""
+        rollup = getattr(self.store, 'rollup', None)
+        if rollup is not None and self.entity in rollup('daily').entities():
+            self.load_from_rollup(rollup('sales'), rollup('daily'))
+            return
+        self.df_monthly = self.store.sales(self.entity, self.start, self.end)
+        self.df_monthly['date'] = pd.to_datetime(self.df_monthly['date'], errors='coerce')
+        self.df_daily = self.store.daily(self.entity, self.start, self.end)
+    
+    def load_from_rollup(self, sales, daily):
+        """
+        Miesiące sprzedaży, dni i tygodnie z kostek agregatów (src/rollup.py) -
+        wykresy czytają ziarno, o które pytają: pięć lat to 60 miesięcy
+        i ~1800 dni zamiast milionów paragonów. Dzień to suma wszystkich
+        wierszy (zmian, kas) z tej daty; brzegowe tygodnie i miesiące obejmują
+        tylko dni zakresu, jak df_daily.
+        """
+        months = sales.query(self.entity, 'month', self.start, self.end, clip=True)
+        self.df_monthly = pd.DataFrame({
+            'date': months['period'],
+            'customer': months['period'].dt.strftime('%b %Y'),
+            'revenue': months['revenue_sum'],
+        })
+        days = daily.query(self.entity, 'day', self.start, self.end)
+        self.df_daily = daily_frame(days['period'], days['amount_sum'])
+        self.df_weekly = daily.query(self.entity, 'week', self.start, self.end, clip=True)
+    
+    def _bind_figures(self):
+        self.graph_objects = figure_spec if self.fast_figures else go
+        self.make_subplots = figure_spec.make_subplots if self.fast_figures else make_subplots
+    
+    def __getstate__(self):
+        # Do procesów wykresów (use_processes) magazyn kolumnowy trafia jako ścieżka, bez ramek - worker
+        # wczytuje wycinek sam z memmap (wspólny page cache). Połączenie SQLite się nie serializuje,
+        # więc bez niego (i dla plików) trafiają ramki; moduły plotly są wiązane ponownie.
+        state = self.__dict__.copy()
+        if isinstance(self.store, ColumnarStore):
+            state.update(df_monthly=None, df_daily=None, df_weekly=None)
+        else:
+            state['store'] = None
+        del state['graph_objects'], state['make_subplots']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bind_figures()
+        if self.store is not None:
+            self.load_from_store()
+    
     def extract_daily_data(self, df_excel):
-        """Wyciąganie dziennych danych z Excela"""
-        daily_data = []
-        
-        for i in range(len(df_excel)):
-            if pd.notna(df_excel.iloc[i, 3]) and 'do' in str(df_excel.iloc[i, 3]):
-                date_range = str(df_excel.iloc[i, 3])
-                amount = df_excel.iloc[i, 4]
-                
-                if pd.notna(amount) and isinstance(amount, (int, float, str)):
-                    try:
-                        # Parsowanie daty początku
-                        if 'do' in date_range:
-                            start_date = date_range.split(' do ')[0]
-                            date_obj = pd.to_datetime(start_date, format='%d.%m.%Y %H:%M')
-                            
-                            # Konwersja kwoty
-                            if isinstance(amount, str):
-                                amount_clean = amount.replace(' ', '').replace(',', '.')
-                                amount_float = float(amount_clean)
-                            else:
-                                amount_float = float(amount)
-                            
-                            daily_data.append({
-                                'date': date_obj.date(),
-                                'amount': amount_float,
-                                'day_of_week': date_obj.strftime('%A'),
-                                'week_number': date_obj.isocalendar()[1]
-                            })
-                    except:
-                        continue
-        
-        self.df_daily = pd.DataFrame(daily_data)
-        if not self.df_daily.empty:
-            self.df_daily['date'] = pd.to_datetime(self.df_daily['date'])
-            self.df_daily = self.df_daily.sort_values('date')
+        """Wyciąganie dziennych danych z Excela (ingest.parse_daily_rows)"""
+        self.df_daily = parse_daily_rows(df_excel)
     
     def calculate_trends(self):
         """Obliczanie trendów i statystyk"""
@@ -104,6 +156,7 @@ class AdvancedSalesDashboard:
     
     def create_monthly_chart(self):
         """Wykres miesięcznych przychodów"""
+        go = self.graph_objects
         if self.df_monthly.empty:
             return go.Figure()
         
@@ -146,20 +199,35 @@ class AdvancedSalesDashboard:
     
     def create_daily_chart(self):
         """Wykres dziennych sprzedaży"""
+        go = self.graph_objects
         if self.df_daily.empty:
             return go.Figure()
         
-        fig = make_subplots(
+        fig = self.make_subplots(
             rows=2, cols=1,
             subplot_titles=('Dzienna Sprzedaż - Wrzesień 2025', 'Analiza Tygodniowa'),
             vertical_spacing=0.12
         )
         
+        dates = self.df_daily['date']
+        amounts = self.df_daily['amount']
+        # Średnia ruchoma (7 dni) - lokalnie, bez modyfikacji df_daily (wykresy budowane współbieżnie)
+        moving_avg = amounts.rolling(window=7).mean() if len(self.df_daily) >= 7 else None
+        
+        # Downsampling długich szeregów - średnia ruchoma dostaje te same punkty co sprzedaż
+        if self.max_points and len(amounts) > self.max_points:
+            keep = downsample_indices(dates, amounts, self.max_points, self.downsample_method)
+            print(f"📉 Dzienna sprzedaż: {len(amounts)} → {len(keep)} punktów ({self.downsample_method})")
+            dates, amounts = dates.iloc[keep], amounts.iloc[keep]
+            if moving_avg is not None:
+                moving_avg = moving_avg.iloc[keep]
+        scatter = go.Scattergl if len(amounts) > self.SCATTERGL_THRESHOLD else go.Scatter
+        
         # Wykres dzienny
         fig.add_trace(
-            go.Scatter(
-                x=self.df_daily['date'],
-                y=self.df_daily['amount'],
+            scatter(
+                x=dates,
+                y=amounts,
                 mode='lines+markers',
                 name='Dzienna sprzedaż',
                 line=dict(color='rgb(46, 204, 113)', width=2),
@@ -169,13 +237,11 @@ class AdvancedSalesDashboard:
             row=1, col=1
         )
         
-        # Średnia ruchoma (7 dni)
-        if len(self.df_daily) >= 7:
-            self.df_daily['moving_avg'] = self.df_daily['amount'].rolling(window=7).mean()
+        if moving_avg is not None:
             fig.add_trace(
-                go.Scatter(
-                    x=self.df_daily['date'],
-                    y=self.df_daily['moving_avg'],
+                scatter(
+                    x=dates,
+                    y=moving_avg,
                     mode='lines',
                     name='Średnia 7-dniowa',
                     line=dict(color='rgb(231, 76, 60)', width=3, dash='dash')
@@ -183,12 +249,18 @@ class AdvancedSalesDashboard:
                 row=1, col=1
             )
         
-        # Analiza tygodniowa
-        weekly_data = self.df_daily.groupby('week_number')['amount'].agg(['sum', 'mean', 'count']).reset_index()
+        # Analiza tygodniowa - z kostki agregatów, gdy jest (tygodnie ISO kolejnych lat się nie sklejają)
+        if self.df_weekly is not None:
+            week_labels = list(self.df_weekly['label'])  # '2016-W02'
+            weekly_sum = self.df_weekly['amount_sum']
+        else:
+            weekly_data = self.df_daily.groupby('week_number')['amount'].agg(['sum', 'mean', 'count']).reset_index()
+            week_labels = [f'Tydzień {w}' for w in weekly_data['week_number']]
+            weekly_sum = weekly_data['sum']
         fig.add_trace(
             go.Bar(
-                x=[f'Tydzień {w}' for w in weekly_data['week_number']],
-                y=weekly_data['sum'],
+                x=week_labels,
+                y=weekly_sum,
                 name='Suma tygodniowa',
                 marker_color='rgb(155, 89, 182)'
             ),
@@ -223,6 +295,7 @@ class AdvancedSalesDashboard:
     
     def create_day_of_week_analysis(self):
         """Analiza sprzedaży według dni tygodnia"""
+        go = self.graph_objects
         if self.df_daily.empty:
             return go.Figure()
         
@@ -262,184 +335,63 @@ class AdvancedSalesDashboard:
         
         return fig
     
-    def generate_dashboard_html(self, output_path='reports/advanced_dashboard.html'):
-        """Generowanie kompletnego dashboardu HTML"""
+    def _chart_json(self, method):
+        """Buduje wykres wskazaną metodą i serializuje go do JSON"""
+        return getattr(self, method)().to_json()
+    
+    def _chart_builders(self):
+        return {
+            'monthly': partial(self._chart_json, 'create_monthly_chart'),
+            'daily': partial(self._chart_json, 'create_daily_chart'),
+            'day_analysis': partial(self._chart_json, 'create_day_of_week_analysis'),
+        }
+    
+    def _print_chart_timings(self):
+        for name, elapsed in self.chart_timings.items():
+            print(f"  ⏱️  {name}: {elapsed * 1000:.0f} ms")
+    
+    def build_charts(self):
+        """Buduje wykresy dashboardu współbieżnie i zapisuje czasy w self.chart_timings"""
+        charts, self.chart_timings = run_builders(self._chart_builders(), self.max_workers, self.use_processes)
+        self._print_chart_timings()
+        return charts
+    
+    def stream_dashboard_html(self, fp):
+        """
+        Zapisuje dashboard strumieniowo do strumienia tekstowego (plik, gniazdo).
         
-        # Tworzenie wykresów
-        monthly_chart = self.create_monthly_chart()
-        daily_chart = self.create_daily_chart()
-        day_analysis = self.create_day_of_week_analysis()
+        Wykresy budują się w tle, a gotowe fragmenty HTML trafiają do strumienia
+        od razu. Zwraca liczbę zapisanych znaków.
+        """
         trends, metrics = self.create_performance_metrics()
+        best_day = (
+            self.df_daily.loc[self.df_daily['amount'].idxmax(), 'date'].strftime('%d.%m.%Y')
+            if not self.df_daily.empty else 'Brak danych'
+        )
+        
+        # Szablon HTML (src/templates/advanced_dashboard.html.j2)
+        with deferred_builders(self._chart_builders(), self.max_workers, self.use_processes) as charts:
+            written = stream_template(
+                'advanced_dashboard.html.j2',
+                fp,
+                generated_at=datetime.now(),
+                trends=trends,
+                best_day=best_day,
+                monthly_json=charts['monthly'],
+                daily_json=charts['daily'],
+                day_analysis_json=charts['day_analysis']
+            )
         
-        # Konwersja wykresów do JSON
-        import json
-        monthly_json = monthly_chart.to_json()
-        daily_json = daily_chart.to_json()
-        day_analysis_json = day_analysis.to_json()
-        
-        # HTML template
-        html_content = f"""<!DOCTYPE html>
-<html lang="pl">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Dashboard Sprzedaży FP-HOLDING</title>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            padding: 30px;
-            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 40px;
-            background: linear-gradient(45deg, #2c3e50, #3498db);
-            color: white;
-            padding: 30px;
-            border-radius: 10px;
-        }}
-        .header h1 {{
-            margin: 0;
-            font-size: 2.5rem;
-            font-weight: 300;
-        }}
-        .header p {{
-            margin: 10px 0 0 0;
-            opacity: 0.9;
-            font-size: 1.1rem;
-        }}
-        .metrics-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-        .metric-card {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 25px;
-            border-radius: 12px;
-            color: white;
-            text-align: center;
-            box-shadow: 0 10px 20px rgba(0,0,0,0.1);
-            transition: transform 0.3s ease;
-        }}
-        .metric-card:hover {{
-            transform: translateY(-5px);
-        }}
-        .metric-value {{
-            font-size: 2rem;
-            font-weight: bold;
-            margin-bottom: 5px;
-        }}
-        .metric-title {{
-            font-size: 0.9rem;
-            opacity: 0.9;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }}
-        .chart-container {{
-            margin-bottom: 30px;
-            background: white;
-            border-radius: 10px;
-            padding: 20px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.08);
-        }}
-        .insights {{
-            background: #f8f9fa;
-            padding: 20px;
-            border-radius: 10px;
-            margin-top: 30px;
-            border-left: 5px solid #3498db;
-        }}
-        .insights h3 {{
-            color: #2c3e50;
-            margin-top: 0;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🏢 Dashboard Sprzedaży FP-HOLDING</h1>
-            <p>Zaawansowana analiza sprzedaży i trendów - Wrzesień 2025</p>
-            <p>Ostatnia aktualizacja: {datetime.now().strftime('%d.%m.%Y %H:%M')}</p>
-        </div>
-        
-        <div class="metrics-grid">
-            <div class="metric-card">
-                <div class="metric-value">{trends.get('avg_daily_revenue', 0):,.0f} zł</div>
-                <div class="metric-title">Średnia Dzienna</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{trends.get('max_daily_revenue', 0):,.0f} zł</div>
-                <div class="metric-title">Najwyższy Dzień</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{trends.get('total_revenue', 0):,.0f} zł</div>
-                <div class="metric-title">Łączny Przychód</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{trends.get('weekly_trend', 0):+.1f}%</div>
-                <div class="metric-title">Trend Tygodniowy</div>
-            </div>
-        </div>
-        
-        <div class="chart-container">
-            <div id="monthly-chart" style="height: 500px;"></div>
-        </div>
-        
-        <div class="chart-container">
-            <div id="daily-chart" style="height: 800px;"></div>
-        </div>
-        
-        <div class="chart-container">
-            <div id="day-analysis" style="height: 400px;"></div>
-        </div>
-        
-        <div class="insights">
-            <h3>📊 Kluczowe Insights</h3>
-            <ul>
-                <li><strong>Najlepszy dzień:</strong> {self.df_daily.loc[self.df_daily['amount'].idxmax(), 'date'].strftime('%d.%m.%Y') if not self.df_daily.empty else 'Brak danych'} 
-                    ({trends.get('max_daily_revenue', 0):,.0f} zł)</li>
-                <li><strong>Trend tygodniowy:</strong> 
-                    {'📈 Wzrost' if trends.get('weekly_trend', 0) > 0 else '📉 Spadek' if trends.get('weekly_trend', 0) < 0 else '➡️ Stabilny'} 
-                    ({trends.get('weekly_trend', 0):+.1f}%)</li>
-                <li><strong>Średnia dzienna:</strong> {trends.get('avg_daily_revenue', 0):,.0f} zł</li>
-                <li><strong>Zakres dzienny:</strong> {trends.get('min_daily_revenue', 0):,.0f} - {trends.get('max_daily_revenue', 0):,.0f} zł</li>
-            </ul>
-        </div>
-    </div>
+        self.chart_timings = {name: chart.elapsed for name, chart in charts.items()}
+        self._print_chart_timings()
+        return written
     
-    <script>
-        // Wykres miesięczny
-        var monthlyConfig = {monthly_json};
-        Plotly.newPlot('monthly-chart', monthlyConfig.data, monthlyConfig.layout, {{responsive: true}});
-        
-        // Wykres dzienny
-        var dailyConfig = {daily_json};
-        Plotly.newPlot('daily-chart', dailyConfig.data, dailyConfig.layout, {{responsive: true}});
-        
-        // Analiza dni tygodnia
-        var dayConfig = {day_analysis_json};
-        Plotly.newPlot('day-analysis', dayConfig.data, dayConfig.layout, {{responsive: true}});
-    </script>
-</body>
-</html>"""
-        
-        # Zapisanie pliku
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+    def generate_dashboard_html(self, output_path='reports/advanced_dashboard.html'):
+        """Generowanie kompletnego dashboardu HTML"""
+        with atomic_open(output_path) as f:
+            self.stream_dashboard_html(f)
+        # Warianty .gz/.br dla serwera (src/server.py)
+        precompress(output_path)
         
         print(f"✅ Dashboard wygenerowany: {output_path}")
         return output_path
@@ -0,0 +1,129 @@
+"""
+Uruchamianie serwera raportów: endpointy, kolejka zadań, live reload.
+
+Wspólne dla run_server.py i `python -m src.cli serve`.
+"""
+import argparse
+import threading
+import time
+import webbrowser
+from pathlib import Path
+
+from . import metrics
+from .events import EventBroadcaster, events_route
+from .jobs import JobQueue
+from .pipeline import DEFAULT_CACHE_BYTES, ReportService
+from .server import DEFAULT_PORT, DEFAULT_WORKERS, jobs_route, make_server, report_routes, serve
+from .watcher import NotifyTarget, Watcher
+
+STATIC_REPORT = 'reports/fp_holding_raport.html'
+
+
+def parse_workbook(value):
+    """'encja=ścieżka' -> (encja, ścieżka)"""
+    entity, sep, path = value.partition('=')
+    if not sep or not entity or not path:
+        raise argparse.ArgumentTypeError(f"oczekiwano ENCJA=ŚCIEŻKA, podano: {value}")
+    return entity, path
+
+
+def open_browser(port):
+    """Otwórz przeglądarkę po 2 sekundach"""
+    time.sleep(2)
+    url = f'http://localhost:{port}/{STATIC_REPORT}'
+    print(f"🌐 Otwieram przeglądarkę: {url}")
+    webbrowser.open(url)
+
+
+def make_live_reload(broadcaster, sources):
+    """Watcher publikujący report-updated po zapisie raportu statycznego i arkuszy /report"""
+    targets = [NotifyTarget([STATIC_REPORT], '/' + STATIC_REPORT, broadcaster),
+               NotifyTarget(sources.values(), '/report', broadcaster)]
+    # Raporty są zapisywane atomowo - krótki debounce wystarczy
+    return Watcher(targets, interval=0.5, debounce=0.5)
+
+
+def job_notifier(broadcaster):
+    """Zmiany stanu zadań jako zdarzenia job-updated (SSE), jeśli live reload jest włączony"""
+    if broadcaster is None:
+        return None
+    return lambda job: broadcaster.publish('job-updated', job.to_dict('.'))
+
+
+def run_server(sources, port=DEFAULT_PORT, bind='', workers=DEFAULT_WORKERS, cache_bytes=DEFAULT_CACHE_BYTES,
+               job_workers=2, live_reload=True, browser=True, artifact_cache=None):
+    """
+    Serwuje katalog bieżący z /report, /api/analysis, /api/jobs, /metrics
+    (i /events przy live reload) do Ctrl+C / SIGTERM.
+
+    sources: {encja: arkusz kosztowy}; artifact_cache - katalog cache wyników
+    kolejki zadań (jobs.JobQueue). Zwraca False, gdy serwer nie wystartował.
+    """
+    # Sprawdź czy raport istnieje
+    report = Path(STATIC_REPORT)
+    
+    if not report.exists():
+        print("⚠️  Raport statyczny nie istnieje - dostępny będzie tylko /report")
+        print("📝 Aby go wygenerować: python3 generate_report.py\n")
+    
+    sources = dict(sources)
+    service = ReportService(sources, cache_bytes=cache_bytes)
+    metrics.register_cache('reports', lambda: (service.cache.hits, service.cache.misses))
+    
+    print("=" * 80)
+    print("🚀 URUCHAMIANIE LOKALNEGO SERWERA")
+    print("=" * 80)
+    print(f"\n📡 Serwer: http://localhost:{port} (workerzy: {workers}, HTTP/1.1 keep-alive)")
+    print(f"📊 Raport: http://localhost:{port}/{STATIC_REPORT}")
+    print(f"🧮 Na żądanie: http://localhost:{port}/report?entity=...&from=2024-10&to=2025-03")
+    print(f"📈 KPI (JSON): http://localhost:{port}/api/analysis?fields=summary,savings")
+    print(f"📏 Metryki (Prometheus): http://localhost:{port}/metrics")
+    print(f"🧵 Zadania w tle: POST http://localhost:{port}/api/jobs (entity, from, to, format), "
+          f"status: /api/jobs?id=...")
+    if live_reload:
+        print("🔄 Live reload: otwarte karty odświeżają wykresy po zapisie raportu (/events)")
+    print(f"   Encje: {', '.join(sorted(sources))}")
+    if browser:
+        print("\n🌐 Przeglądarka otworzy się automatycznie za 2 sekundy...")
+    print("\n⚠️  Aby zatrzymać serwer: naciśnij Ctrl+C")
+    print("=" * 80 + "\n")
+    
+    try:
+        routes = report_routes(service)
+        broadcaster = None
+        if live_reload:
+            broadcaster = EventBroadcaster()
+            routes['/events'] = events_route(broadcaster)
+        jobs = JobQueue('reports', max_workers=job_workers, on_update=job_notifier(broadcaster),
+                        cache_dir=artifact_cache)
+        routes['/api/jobs'] = jobs_route(jobs, sources)
+        httpd = make_server('.', bind, port, workers, routes=routes)
+    except OSError as e:
+        if "Address already in use" in str(e):
+            print(f"\n❌ Port {port} jest już zajęty!")
+            print(f"\n💡 Zatrzym inny serwer lub użyj innego portu:")
+            print(f"   python3 run_server.py --port 8080")
+        else:
+            print(f"\n❌ Błąd: {e}")
+        if broadcaster is not None:
+            broadcaster.close()
+        jobs.shutdown()
+        return False
+    
+    # Otwórz przeglądarkę w osobnym wątku
+    if browser:
+        threading.Thread(target=open_browser, args=(port,), daemon=True).start()
+    
+    print(f"✅ Serwer działa na porcie {port}")
+    print(f"✅ Raport dostępny pod: http://localhost:{port}/{STATIC_REPORT}\n")
+    watcher = make_live_reload(broadcaster, sources).start() if broadcaster is not None else None
+    try:
+        serve(httpd)
+    finally:
+        jobs.shutdown()
+        if watcher is not None:
+            watcher.stop()
+            broadcaster.close()
+    print("\n\n✅ Serwer zatrzymany")
+    print("💡 Raport pozostaje w folderze 'reports/' i można go otworzyć bezpośrednio")
+    return True
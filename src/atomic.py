@@ -0,0 +1,29 @@
+"""
+Atomowy zapis plików wynikowych.
+
+Raport zapisujemy do pliku tymczasowego w tym samym katalogu i dopiero
+po zamknięciu podmieniamy go os.replace - serwer czytający raport w tym
+czasie widzi starą albo nową wersję, nigdy połowę pliku.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+@contextmanager
+def atomic_open(path, mode='w', encoding='utf-8'):
+    """open() do pliku tymczasowego, podmienianego na `path` po udanym zapisie"""
+    path = Path(path)
+    # pid + wątek: równoległe zapisy (watcher, kolejka zadań) nie dzielą pliku tymczasowego
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    kwargs = {} if 'b' in mode else {'encoding': encoding}
+    try:
+        with open(tmp, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
@@ -1,37 +1,407 @@
 """
-Prosty CLI dla generatora raportów sprzedażowych.
+CLI generatora raportów: python -m src.cli <polecenie> [opcje]
+
+Polecenia:
+  fp-report  raport FP HOLDING z arkusza kosztowego albo magazynu --db (html / json / csv)
+  dashboard  dashboard sprzedaży (CSV miesięczny + arkusz dzienny albo magazyn --db / --columnar)
+  ingest     import arkuszy i CSV do magazynu SQLite (src/store.py) lub kolumnowego (src/columnar.py)
+  batch      wiele raportów (encje × okresy) równolegle w kolejce zadań
+  serve      serwer raportów (jak run_server.py)
+  bench      czasy etapów pipeline'u raportu na arkuszu
+  sales      podsumowanie sprzedaży z CSV albo magazynu kolumnowego
+
+Wspólne opcje każdego polecenia:
+  --jobs, --cache-dir, --quiet
+  --profile  próbkujący profiler (src/profiler.py)
+  --trace    spany etapów i wykresów do pliku Chrome Trace (src/tracing.py)
+
+Raporty FP idą przez kolejkę zadań (src/jobs.py), a każdy etap trafia do
+metryk (src/metrics.py) - po poleceniu drukowane jest podsumowanie etapów.
 """
 import argparse
+import contextlib
+import io
+import os
 import sys
+import tempfile
+import time
+from functools import partial
 from pathlib import Path
-from sales_reports.src import ingest, analysis, report
+
+from . import analysis, ingest, metrics, report, tracing
+from .app import parse_workbook, run_server
+from .jobs import DONE, FORMATS, JobQueue, generate_artifact
+from .pipeline import DEFAULT_CACHE_BYTES
+from .profiler import DEFAULT_INTERVAL, SamplingProfiler
+from .server import DEFAULT_PORT, DEFAULT_WORKERS
+
+
+def parse_range(value):
+    """'2024-10:2025-03' -> ('2024-10', '2025-03'); pusta strona to brak ograniczenia"""
+    start, sep, end = value.partition(':')
+    if not sep:
+        raise argparse.ArgumentTypeError(f"oczekiwano OD:DO, podano: {value}")
+    return start or None, end or None
+
+
+def _common_options():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Liczba równoległych workerów (zadania, wykresy); domyślnie wg CPU")
+    common.add_argument("--cache-dir", help="Katalog cache wyników - niezmieniony arkusz nie jest liczony ponownie")
+    common.add_argument("--profile", metavar="PLIK",
+                        help="Profil próbkujący polecenia (collapsed stacks dla flamegraph.pl / speedscope)")
+    common.add_argument("--profile-interval", type=float, default=DEFAULT_INTERVAL * 1000, metavar="MS",
+                        help="Co ile ms czasu CPU pobierać próbkę stosów")
+    common.add_argument("--quiet", "-q", action="store_true", help="Tylko błędy (bez komunikatów postępu)")
+    common.add_argument("--trace", metavar="PLIK",
+                        help="Zapisz spany etapów i wykresów w formacie Chrome Trace (chrome://tracing, Perfetto)")
+    common.add_argument("--trace-memory", action="store_true",
+                        help="Dodaj do spanów szczyt pamięci tracemalloc (wolniej)")
+    return common
+
+
+def build_parser():
+    common = _common_options()
+    p = argparse.ArgumentParser(prog="python -m src.cli", description="Generator raportów sprzedażowych i FP HOLDING")
+    commands = p.add_subparsers(dest="command", required=True, metavar="POLECENIE")
+
+    fp = commands.add_parser("fp-report", parents=[common], help="Raport FP HOLDING z arkusza kosztowego")
+    fp.add_argument("--workbook", "-w", help="Arkusz kosztowy (.xlsx)")
+    fp.add_argument("--db", help="Magazyn SQLite z danymi encji (zamiast --workbook, zob. polecenie ingest)")
+    fp.add_argument("--output", "-o", default="reports/fp_holding_raport.html", help="Plik wynikowy")
+    fp.add_argument("--entity", default="fp_holding", help="Nazwa encji")
+    fp.add_argument("--from", dest="start", help="Początek okresu (np. 2024-10)")
+    fp.add_argument("--to", dest="end", help="Koniec okresu (np. 2025-03)")
+    fp.add_argument("--format", "-f", choices=FORMATS, default="html", help="Format wyniku")
+
+    dashboard = commands.add_parser("dashboard", parents=[common], help="Dashboard sprzedaży")
+    dashboard.add_argument("--csv", help="CSV miesięczny (date, customer, revenue)")
+    dashboard.add_argument("--excel", help="Arkusz ze sprzedażą dzienną")
+    dashboard.add_argument("--db", help="Magazyn SQLite (zamiast --csv i --excel, zob. polecenie ingest)")
+    dashboard.add_argument("--columnar", help="Katalog magazynu kolumnowego (zamiast --csv i --excel)")
+    dashboard.add_argument("--entity", default="fp_holding", help="Encja w magazynie (z --db / --columnar)")
+    dashboard.add_argument("--from", dest="start", help="Początek zakresu dat (z magazynem, np. 2025-01)")
+    dashboard.add_argument("--to", dest="end", help="Koniec zakresu dat (z magazynem, np. 2025-03)")
+    dashboard.add_argument("--output", "-o", default="reports/advanced_dashboard.html", help="Plik wynikowy")
+    dashboard.add_argument("--max-points", type=int, help="Limit punktów wykresu dziennego (downsampling)")
+
+    load = commands.add_parser("ingest", parents=[common], help="Import danych do magazynu SQLite")
+    load.add_argument("--db", help="Plik magazynu SQLite (tworzony, gdy nie istnieje)")
+    load.add_argument("--columnar", help="Katalog magazynu kolumnowego (arkusz dzienny i CSV sprzedaży)")
+    load.add_argument("--entity", default="fp_holding", help="Nazwa encji")
+    load.add_argument("--workbook", "-w", action="append", default=[], help="Arkusz kosztowy (.xlsx)")
+    load.add_argument("--daily", action="append", default=[], help="Arkusz ze sprzedażą dzienną")
+    load.add_argument("--sales", action="append", default=[], help="CSV sprzedaży (date, customer, revenue)")
+    load.add_argument("--force", action="store_true", help="Importuj także pliki, które się nie zmieniły (--db)")
+
+    batch = commands.add_parser("batch", parents=[common], help="Wiele raportów równolegle")
+    batch.add_argument("--workbook", "-w", action="append", type=parse_workbook,
+                       metavar="ENCJA=ŚCIEŻKA", help="Arkusz encji (można podać wielokrotnie)")
+    batch.add_argument("--db", help="Magazyn SQLite (zamiast --workbook)")
+    batch.add_argument("--entity", action="append",
+                       help="Encja z magazynu --db (wielokrotnie; domyślnie wszystkie)")
+    batch.add_argument("--period", action="append", type=parse_range, metavar="OD:DO",
+                       help="Okres raportu, np. 2024-10:2025-03 (wielokrotnie; domyślnie całość)")
+    batch.add_argument("--format", "-f", action="append", choices=FORMATS,
+                       help="Format wyniku (wielokrotnie; domyślnie html)")
+    batch.add_argument("--output-dir", default="reports", help="Katalog wyników (reports/<encja>/...)")
+
+    serve = commands.add_parser("serve", parents=[common], help="Serwer raportów")
+    serve.add_argument("--workbook", "-w", action="append", required=True, type=parse_workbook,
+                       metavar="ENCJA=ŚCIEŻKA", help="Arkusz encji dla /report i /api/jobs")
+    serve.add_argument("--port", "-p", type=int, default=DEFAULT_PORT, help="Port serwera")
+    serve.add_argument("--bind", "-b", default="", help="Adres nasłuchiwania")
+    serve.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Wątki obsługi połączeń")
+    serve.add_argument("--cache-mb", type=int, default=DEFAULT_CACHE_BYTES // (1024 * 1024),
+                       help="Limit pamięci cache /report w MB")
+    serve.add_argument("--no-browser", action="store_true", help="Nie otwieraj przeglądarki")
+    serve.add_argument("--no-live-reload", action="store_true", help="Bez powiadomień SSE (/events)")
+
+    bench = commands.add_parser("bench", parents=[common], help="Czasy etapów pipeline'u raportu")
+    bench.add_argument("--workbook", "-w", required=True, help="Arkusz kosztowy (.xlsx)")
+    bench.add_argument("--repeat", "-n", type=int, default=5, help="Liczba powtórzeń")
+    bench.add_argument("--format", "-f", choices=FORMATS, default="html", help="Format wyniku")
+
+    sales = commands.add_parser("sales", parents=[common], help="Podsumowanie sprzedaży z CSV")
+    sales.add_argument("--input", "-i", help="Ścieżka do pliku CSV z danymi sprzedaży")
+    sales.add_argument("--columnar", help="Katalog magazynu kolumnowego (zamiast --input)")
+    sales.add_argument("--entity", default="fp_holding", help="Encja w magazynie (z --columnar)")
+    sales.add_argument("--from", dest="start", help="Początek zakresu dat (z --columnar)")
+    sales.add_argument("--to", dest="end", help="Koniec zakresu dat (z --columnar)")
+    sales.add_argument("--output", "-o", required=True, help="Ścieżka do wygenerowanego raportu HTML")
+    # Opcja dawnego CLI (html / pdf) - raport zawsze był i jest w HTML
+    sales.add_argument("--format", "-f", choices=["html", "pdf"],
+                       help="Przestarzałe, ignorowane - raport jest zawsze w HTML")
+    return p
 
 
 def parse_args(argv=None):
-    p = argparse.ArgumentParser(description="Sales reports generator CLI")
-    p.add_argument("--input", "-i", required=True, help="Ścieżka do pliku CSV z danymi sprzedaży")
-    p.add_argument("--output", "-o", required=True, help="Ścieżka do wygenerowanego raportu HTML")
-    p.add_argument("--format", "-f", choices=["html","pdf"], default="html", help="Format raportu")
-    return p.parse_args(argv)
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # Dawne wywołanie bez polecenia (--input/--output) to podsumowanie sprzedaży
+    if argv and argv[0].startswith('-') and argv[0] not in ('-h', '--help'):
+        argv.insert(0, 'sales')
+    return build_parser().parse_args(argv)
 
 
-def main(argv=None):
-    args = parse_args(argv)
-    input_path = Path(args.input)
-    output_path = Path(args.output)
+def _require_file(path):
+    if not Path(path).exists():
+        raise FileNotFoundError(f"brak pliku wejściowego: {path}")
+
+
+def _run_jobs(queue, submissions):
+    """Zgłasza zadania (argumenty JobQueue.submit), czeka na nie i drukuje wyniki; zwraca liczbę błędów"""
+    jobs = [queue.submit(*args) for args in submissions]
+    failed = 0
+    for job in jobs:
+        job.wait()
+        spec = job.spec
+        period = f"{spec.start or '…'} - {spec.end or '…'}"
+        if job.status == DONE:
+            source = ' (cache)' if job.cached else f' ({job.finished - job.started:.2f} s)'
+            print(f"✅ {spec.entity} {period} [{spec.format}]: {job.artifact}{source}")
+        else:
+            failed += 1
+            print(f"❌ {spec.entity} {period} [{spec.format}]: {job.error}", file=sys.stderr)
+    return failed
+
+
+def _source(args):
+    """Plik źródłowy zadań (arkusz albo magazyn --db) i czy to magazyn"""
+    if bool(args.workbook) == bool(args.db):
+        raise ValueError("podaj --workbook albo --db")
+    return args.db or args.workbook, bool(args.db)
+
+
+def cmd_fp_report(args):
+    source, from_store = _source(args)
+    _require_file(source)
+    queue = JobQueue(Path(args.output).parent, max_workers=1, cache_dir=args.cache_dir,
+                     runner=partial(generate_artifact, max_workers=args.jobs, from_store=from_store))
+    try:
+        failed = _run_jobs(queue, [(source, args.entity, args.start, args.end, args.format, args.output)])
+    finally:
+        queue.shutdown()
+    return 1 if failed else 0
+
 
-    if not input_path.exists():
-        print(f"Błąd: brak pliku wejściowego: {input_path}")
-        sys.exit(2)
+def cmd_batch(args):
+    from .store import AnalyticsStore
 
-    print(f"Wczytuję dane z: {input_path}")
-    df = ingest.read_sales_csv(str(input_path))
-    summary = analysis.summarize_sales(df)
+    _, from_store = _source(args)
+    if from_store:
+        _require_file(args.db)
+        with AnalyticsStore(args.db) as store:
+            # Domyślnie encje z danymi miesięcznymi (same dni / CSV nie dają raportu FP)
+            entities = args.entity or [entity for entity in store.entities() if not store.monthly(entity).empty]
+        sources = [(entity, args.db) for entity in entities]
+    else:
+        sources = args.workbook
+        for _, path in sources:
+            _require_file(path)
+    periods = args.period or [(None, None)]
+    formats = args.format or ['html']
+    submissions = [(path, entity, start, end, fmt)
+                   for entity, path in sources for start, end in periods for fmt in formats]
+    print(f"📦 {len(submissions)} zadań, workerzy: {args.jobs or 'wg CPU'}")
+    queue = JobQueue(args.output_dir, max_workers=args.jobs or os.cpu_count() or 1, cache_dir=args.cache_dir,
+                     runner=partial(generate_artifact, from_store=from_store))
+    try:
+        failed = _run_jobs(queue, submissions)
+    finally:
+        queue.shutdown()
+    return 1 if failed else 0
 
-    print(f"Generuję raport...")
-    out = report.generate_report(summary, str(output_path))
+
+def cmd_dashboard(args):
+    from .advanced_dashboard import AdvancedSalesDashboard
+    from .columnar import ColumnarStore
+    from .store import AnalyticsStore
+
+    options = {'max_workers': args.jobs}
+    if args.max_points is not None:
+        options['max_points'] = args.max_points
+    with contextlib.ExitStack() as stack:
+        if args.db:
+            _require_file(args.db)
+            options.update(store=stack.enter_context(AnalyticsStore(args.db)), entity=args.entity,
+                           start=args.start, end=args.end)
+        elif args.columnar:
+            _require_file(args.columnar)
+            options.update(store=ColumnarStore(args.columnar), entity=args.entity, start=args.start, end=args.end)
+        elif not (args.csv and args.excel):
+            raise ValueError("podaj --csv i --excel albo --db / --columnar")
+        else:
+            _require_file(args.csv)
+            _require_file(args.excel)
+        with metrics.stage('load'):
+            dashboard = AdvancedSalesDashboard(args.csv, args.excel, **options)
+    with metrics.stage('render'):
+        dashboard.generate_dashboard_html(args.output)
+    return 0
+
+
+def cmd_ingest(args):
+    from .columnar import ColumnarStore
+    from .store import AnalyticsStore
+
+    sources = [('workbook', path) for path in args.workbook] + [('daily', path) for path in args.daily] \
+        + [('sales', path) for path in args.sales]
+    if not sources:
+        raise ValueError("podaj co najmniej jeden plik: --workbook, --daily albo --sales")
+    if not (args.db or args.columnar):
+        raise ValueError("podaj magazyn: --db albo --columnar")
+    if args.workbook and not args.db:
+        raise ValueError("arkusz kosztowy trafia tylko do magazynu SQLite (--db)")
+    for _, path in sources:
+        _require_file(path)
+    if args.db:
+        with AnalyticsStore(args.db) as store:
+            ingest_file = {'workbook': store.ingest_cost_workbook, 'daily': store.ingest_daily_sheet,
+                           'sales': store.ingest_sales_csv}
+            for kind, path in sources:
+                count = ingest_file[kind](args.entity, path, force=args.force)
+                if count is None:
+                    print(f"⏭️  {path}: bez zmian od ostatniego importu")
+                else:
+                    print(f"📥 {path}: {count} wierszy → {args.db} [{args.entity}]")
+    if args.columnar:
+        store = ColumnarStore(args.columnar)
+        ingest_file = {'daily': store.ingest_daily_sheet, 'sales': store.ingest_sales_csv}
+        for kind, path in sources:
+            if kind in ingest_file:
+                count = ingest_file[kind](args.entity, path)
+                print(f"📥 {path}: {count} wierszy → {args.columnar} [{args.entity}]")
+    return 0
+
+
+def cmd_serve(args):
+    started = run_server(dict(args.workbook), port=args.port, bind=args.bind, workers=args.workers,
+                         cache_bytes=args.cache_mb * 1024 * 1024, job_workers=args.jobs or 2,
+                         live_reload=not args.no_live_reload, browser=not args.no_browser,
+                         artifact_cache=args.cache_dir)
+    return 0 if started else 1
+
+
+def cmd_bench(args):
+    _require_file(args.workbook)
+    runner = partial(generate_artifact, max_workers=args.jobs)
+    timings = []
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp, f'raport.{args.format}')
+        spec_args = (args.workbook, 'bench', None, None, args.format, output)
+        for _ in range(args.repeat):
+            # Bez cache - każde powtórzenie liczy pełny pipeline
+            queue = JobQueue(tmp, max_workers=1, runner=runner)
+            with contextlib.redirect_stdout(io.StringIO()):
+                job = queue.submit(*spec_args)
+                job.wait()
+            queue.shutdown()
+            if job.status != DONE:
+                raise RuntimeError(job.error)
+            timings.append(job.finished - job.started)
+    timings.sort()
+    print(f"⏱️  {args.repeat} × pipeline ({args.format}): mediana {timings[len(timings) // 2] * 1000:.0f} ms, "
+          f"min {timings[0] * 1000:.0f} ms, max {timings[-1] * 1000:.0f} ms")
+    return 0
+
+
+def cmd_sales(args):
+    from .columnar import ColumnarStore
+
+    output_path = Path(args.output)
+    if args.format is not None:
+        print("⚠️  --format jest przestarzałe i ignorowane - raport jest w HTML", file=sys.stderr)
+    if args.columnar:
+        _require_file(args.columnar)
+        print(f"Wczytuję dane z: {args.columnar} [{args.entity}]")
+        with metrics.stage('load'):
+            # Wycinek memmap - dane nie są wczytywane do DataFrame
+            df = ColumnarStore(args.columnar).sales_slice(args.entity, args.start, args.end)
+    elif args.input:
+        input_path = Path(args.input)
+        _require_file(input_path)
+
+        print(f"Wczytuję dane z: {input_path}")
+        with metrics.stage('load'):
+            df = ingest.read_sales_csv(str(input_path))
+    else:
+        raise ValueError("podaj --input albo --columnar")
+    with metrics.stage('analyze'):
+        summary = analysis.summarize_sales(df)
+
+    print("Generuję raport...")
+    with metrics.stage('render'):
+        out = report.generate_report(summary, str(output_path))
     print(f"Wygenerowano raport: {out}")
+    return 0
+
+
+HANDLERS = {
+    'fp-report': cmd_fp_report,
+    'dashboard': cmd_dashboard,
+    'ingest': cmd_ingest,
+    'batch': cmd_batch,
+    'serve': cmd_serve,
+    'bench': cmd_bench,
+    'sales': cmd_sales,
+}
+
+
+def print_stage_summary(before):
+    """Czas etapów pipeline'u w tym poleceniu (różnica histogramu report_stage_duration_seconds)"""
+    lines = []
+    order = {stage: index for index, stage in enumerate(metrics.STAGES)}
+    totals = sorted(metrics.STAGE_DURATION.totals().items(), key=lambda item: order.get(item[0][0], len(order)))
+    for (stage,), (count, total) in totals:
+        count -= before.get((stage,), (0, 0.0))[0]
+        total -= before.get((stage,), (0, 0.0))[1]
+        if count:
+            lines.append(f"{stage} {total * 1000:.0f} ms" + (f" ({count}×)" if count > 1 else ""))
+    if lines:
+        print(f"⏱️  Etapy: {', '.join(lines)}")
+
+
+def run(args):
+    """Wykonuje polecenie z opcjami wspólnymi; zwraca kod wyjścia"""
+    before = metrics.STAGE_DURATION.totals()
+    profiler = SamplingProfiler(args.profile_interval / 1000) if args.profile else None
+    output = open(os.devnull, 'w') if args.quiet else None
+    tracer = tracing.enable(memory=args.trace_memory) if args.trace else None
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output) if output else contextlib.nullcontext():
+            if profiler is not None:
+                profiler.start()
+            try:
+                code = HANDLERS[args.command](args)
+            finally:
+                if profiler is not None:
+                    profiler.stop()
+            print_stage_summary(before)
+            print(f"⏱️  Razem: {time.perf_counter() - start:.2f} s")
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ Błąd: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if output is not None:
+            output.close()
+        if tracer is not None:
+            tracer.stop().write(args.trace)
+            if not args.quiet:
+                print(f"🧭 Trace: {args.trace} ({len(tracer.spans)} spanów)")
+
+    if profiler is not None:
+        profiler.write(args.profile)
+        if not args.quiet:
+            print(f"🔬 Profil: {args.profile} (flamegraph.pl {args.profile} > profil.svg)")
+            profiler.print_summary(15)
+    return code
+
+
+def main(argv=None):
+    return run(parse_args(argv))
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,448 @@
+"""
+Kolumnowy magazyn na dysku dla wieloletnich danych dziennych i paragonowych.
+
+Tabela to katalog z plikiem .npy na każdą kolumnę i _meta.json; wiersze są
+posortowane po kolumnie 'date', która jest zarazem indeksem. Zapisana raz
+wersja tabeli się nie zmienia: nowa wersja to nowy podkatalog, a plik
+wskaźnika _current (atomic_open) przełącza czytelników w jednym kroku.
+Kolumny otwieramy przez np.load(mmap_mode='r') (np.memmap), więc:
+
+- otwarcie tabeli nie czyta danych - tylko nagłówki plików,
+- zakres dat to dwa wyszukiwania binarne (np.searchsorted) po kolumnie dat
+  i widok [lo:hi] na pozostałych kolumnach - czytane są tylko strony z tego
+  zakresu,
+- kilka procesów (workery kolejki, ProcessPoolExecutor) otwierających te
+  same pliki dzieli jedną kopię w page cache systemu; ColumnarTable
+  serializuje się jako ścieżka, nie jako dane.
+
+Kolumny tekstowe (klient) zapisujemy jako kody int32 ze słownikiem w _meta.json.
+Zbiór magazynu (ColumnarDataset) to segmenty - tabele po jednej na plik
+źródłowy - więc import pliku przepisuje tylko jego segment, a nie całe lata
+danych encji.
+
+    store = ColumnarStore('reports/kolumny')
+    store.ingest_sales_csv('fp_holding', 'sprzedaz.csv')
+    summarize_sales(store.sales_slice('fp_holding', '2024-01', '2024-12'))
+    AdvancedSalesDashboard(None, None, store=store, entity='fp_holding', start='2025-01')
+"""
+import json
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .atomic import atomic_open
+from .ingest import daily_frame, parse_daily_rows, read_sales_csv
+
+META_FILE = '_meta.json'
+# Nazwa podkatalogu aktualnej wersji tabeli
+CURRENT_FILE = '_current'
+# Lista segmentów zbioru magazynu (ColumnarDataset)
+SEGMENTS_FILE = '_segments.json'
+# Kostki agregatów zbiorów (src/rollup.py): <root>/_rollup/<zbiór>/<encja>/<ziarno>
+ROLLUP_DIR = '_rollup'
+DATE_COLUMN = 'date'
+# Rozdzielczość kolumny dat - pozwala trzymać także godziny paragonów
+DATE_DTYPE = 'datetime64[s]'
+
+
+def date_bounds(start=None, end=None):
+    """
+    Granice zakresu dat [od, do) jako np.datetime64; koniec jest włącznie
+    ('2025-03-15' obejmuje cały dzień, '2025-03' cały miesiąc), None to brak granicy.
+    """
+    lower = np.datetime64(pd.Timestamp(start).normalize(), 's') if start else None
+    upper = None
+    if end:
+        stamp = pd.Timestamp(end).normalize()
+        stamp += pd.offsets.MonthBegin(1) if isinstance(end, str) and len(end) == 7 else pd.Timedelta(days=1)
+        upper = np.datetime64(stamp, 's')
+    return lower, upper
+
+
+def table_exists(directory) -> bool:
+    """Czy w katalogu jest tabela (wskaźnik wersji albo sama wersja)"""
+    directory = Path(directory)
+    return (directory / CURRENT_FILE).exists() or (directory / META_FILE).exists()
+
+
+class ColumnarTable:
+    """
+    Tabela kolumnowa tylko do odczytu. `directory` to katalog z wskaźnikiem
+    _current albo sama wersja. Przy otwarciu mapujemy wszystkie kolumny
+    (to czyta tylko nagłówki .npy) - późniejsze usunięcie starej wersji przez
+    zapis nie zabiera danych otwartej tabeli.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        version = self._resolve()
+        while True:
+            try:
+                self._open(version)
+                break
+            except FileNotFoundError:
+                # Zapis przełączył wersję między odczytem wskaźnika a otwarciem plików - otwieramy
+                # nową; błąd tylko wtedy, gdy wskaźnik się nie zmienił (plików naprawdę nie ma)
+                current = self._resolve()
+                if current == version:
+                    raise
+                version = current
+
+    def _resolve(self) -> Path:
+        pointer = self.directory / CURRENT_FILE
+        if pointer.exists():
+            return self.directory / pointer.read_text(encoding='utf-8').strip()
+        return self.directory
+
+    def _open(self, version: Path):
+        meta = json.loads((version / META_FILE).read_text(encoding='utf-8'))
+        self.rows: int = meta['rows']
+        self.columns: List[str] = meta['columns']
+        self.dictionaries: Dict[str, list] = meta.get('dictionaries', {})
+        # Pustej tablicy nie da się zmapować
+        self._arrays: Dict[str, np.ndarray] = {
+            name: np.load(version / f'{name}.npy', mmap_mode='r' if self.rows else None) for name in self.columns}
+
+    def __len__(self):
+        return self.rows
+
+    def __getstate__(self):
+        # Do innego procesu trafia ścieżka - worker mapuje te same pliki (wspólny page cache)
+        return {'directory': str(self.directory)}
+
+    def __setstate__(self, state):
+        self.__init__(state['directory'])
+
+    def column(self, name) -> np.ndarray:
+        """Cała kolumna jako memmap (kody int32 dla kolumn słownikowych)"""
+        return self._arrays[name]
+
+    def locate(self, start=None, end=None) -> slice:
+        """Zakres wierszy [lo:hi) z datami od `start` do `end` (wyszukiwanie binarne w kolumnie dat)"""
+        lower, upper = date_bounds(start, end)
+        dates = self.column(DATE_COLUMN)
+        lo = 0 if lower is None else int(np.searchsorted(dates, lower, 'left'))
+        hi = self.rows if upper is None else int(np.searchsorted(dates, upper, 'left'))
+        return slice(lo, max(lo, hi))
+
+    def slice(self, start=None, end=None) -> 'ColumnarSlice':
+        return ColumnarSlice([(self, self.locate(start, end))])
+
+
+class ColumnarSlice:
+    """
+    Wiersze z zakresu dat jednej albo kilku tabel (segmentów zbioru).
+    slice['kolumna'] z jednej tabeli to widok memmap bez kopiowania; z kilku -
+    złączenie ich wycinków w kolejności dat. Kolumny słownikowe są dekodowane
+    do tablicy obiektów; `empty` i len() jak w DataFrame - wystarcza
+    analysis.summarize_sales.
+    """
+
+    def __init__(self, parts: List[Tuple[ColumnarTable, slice]]):
+        # Puste wycinki pomijamy - jeden niepusty segment daje widok memmap
+        self.parts = [(table, rows) for table, rows in parts if rows.stop > rows.start] or parts[:1]
+        self._order = None
+
+    def __len__(self):
+        return sum(rows.stop - rows.start for _, rows in self.parts)
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.parts[0][0].columns) if self.parts else []
+
+    @staticmethod
+    def _values(table: ColumnarTable, rows: slice, name) -> np.ndarray:
+        values = table.column(name)[rows]
+        dictionary = table.dictionaries.get(name)
+        if dictionary is None:
+            return values
+        decoded = np.asarray(dictionary + [None], dtype=object)
+        return decoded[values]  # kod -1 (brak wartości) to ostatni element - None
+
+    def __getitem__(self, name) -> np.ndarray:
+        arrays = [self._values(table, rows, name) for table, rows in self.parts]
+        if len(arrays) <= 1:
+            return arrays[0] if arrays else np.empty(0)
+        if self._order is None:
+            dates = np.concatenate([table.column(DATE_COLUMN)[rows] for table, rows in self.parts])
+            self._order = np.argsort(dates, kind='stable')
+        return np.concatenate(arrays)[self._order]
+
+    def to_frame(self, columns=None) -> pd.DataFrame:
+        """Kopia wycinka jako DataFrame"""
+        return pd.DataFrame({name: self[name] for name in (columns or self.columns)})
+
+
+def write_version(parent, columns: Dict[str, object]) -> Path:
+    """
+    Zapisuje kolumny (równej długości) jako nową wersję tabeli - podkatalog
+    `parent` o unikalnej nazwie, posortowany po 'date'. Kolumny tekstowe
+    dostają kody int32 i słownik. Zwraca ścieżkę wersji.
+    """
+    dates = pd.to_datetime(pd.Series(columns[DATE_COLUMN]), errors='coerce').to_numpy().astype(DATE_DTYPE)
+    order = np.argsort(dates, kind='stable')  # NaT na końcu
+    Path(parent).mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix='v', dir=parent))
+    meta = {'version': 1, 'rows': len(dates), 'columns': list(columns), 'dictionaries': {}}
+    try:
+        for name, values in columns.items():
+            if name == DATE_COLUMN:
+                array = dates[order]
+            else:
+                array = np.asarray(values)
+                if array.dtype == object or array.dtype.kind in 'US':
+                    codes, uniques = pd.factorize(pd.Series(array, dtype=object))
+                    meta['dictionaries'][name] = [str(value) for value in uniques]
+                    array = codes.astype('int32')
+                array = array[order]
+            np.save(tmp / f'{name}.npy', np.ascontiguousarray(array))
+        with atomic_open(tmp / META_FILE) as f:
+            json.dump(meta, f, ensure_ascii=False)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return tmp
+
+
+def write_table(directory, columns: Dict[str, object]) -> ColumnarTable:
+    """
+    Zapisuje kolumny jako nową wersję tabeli i przełącza na nią wskaźnik
+    _current jednym atomowym zapisem - czytelnik widzi starą albo nową
+    wersję, nigdy brak tabeli. Poprzednie wersje są usuwane; tabele już
+    otwarte dalej czytają swoje (odłączone) pliki.
+    """
+    directory = Path(directory)
+    pointer = directory / CURRENT_FILE
+    previous = pointer.read_text(encoding='utf-8').strip() if pointer.exists() else None
+    version = write_version(directory, columns)
+    with atomic_open(pointer) as f:
+        f.write(version.name)
+    if previous:
+        shutil.rmtree(directory / previous, ignore_errors=True)
+    return ColumnarTable(directory)
+
+
+def read_segments(directory) -> List[dict]:
+    """Segmenty zbioru z _segments.json: dir, source, rows, start, end (daty ISO albo None)"""
+    return json.loads((Path(directory) / SEGMENTS_FILE).read_text(encoding='utf-8'))['segments']
+
+
+def _day_range(dates) -> Tuple[Optional[str], Optional[str]]:
+    dates = pd.to_datetime(pd.Series(dates), errors='coerce').dropna()
+    if dates.empty:
+        return None, None
+    return dates.min().strftime('%Y-%m-%d'), dates.max().strftime('%Y-%m-%d')
+
+
+class ColumnarDataset:
+    """
+    Zbiór magazynu złożony z segmentów - niezmiennych wersji tabel (po jednej
+    na plik źródłowy i na partie importowane bez źródła). Lista segmentów
+    w _segments.json jest podmieniana atomowo, więc czytelnik widzi cały
+    stary albo cały nowy zbiór. Serializuje się jako ścieżka.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        segments = read_segments(self.directory)
+        while True:
+            try:
+                self.tables = [ColumnarTable(self.directory / segment['dir']) for segment in segments]
+                break
+            except FileNotFoundError:
+                # Zapis podmienił segmenty między odczytem listy a otwarciem plików - jak w ColumnarTable
+                current = read_segments(self.directory)
+                if current == segments:
+                    raise
+                segments = current
+        self.segments = segments
+
+    def __len__(self):
+        return sum(len(table) for table in self.tables)
+
+    def __getstate__(self):
+        return {'directory': str(self.directory)}
+
+    def __setstate__(self, state):
+        self.__init__(state['directory'])
+
+    def slice(self, start=None, end=None) -> ColumnarSlice:
+        return ColumnarSlice([(table, table.locate(start, end)) for table in self.tables])
+
+
+class ColumnarStore:
+    """
+    Katalog zbiorów <encja>/<zbiór>: 'daily' (date, amount) z arkusza
+    dziennego i 'sales' (date, customer, revenue) z CSV sprzedaży.
+
+    Każdy plik źródłowy to osobny segment zbioru: ponowny import pliku
+    przepisuje tylko jego segment, a pliki kilku kas z tych samych dni się
+    sumują. Partie bez źródła (ingest_daily / ingest_sales wprost) podmieniają
+    wiersze bez źródła z zakresu swoich dat - przepisywane są tylko segmenty,
+    które na ten zakres zachodzą.
+
+    Interfejs odczytu (daily, sales) jak w AnalyticsStore (src/store.py) -
+    AdvancedSalesDashboard przyjmuje każdy z nich jako `store`. Każdy import
+    aktualizuje też kostkę agregatów zbioru (rollup()).
+    """
+
+    DATASETS = ('daily', 'sales')
+    ROLLUP_MEASURES = {'daily': ('amount',), 'sales': ('revenue',)}
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._tables: Dict[tuple, ColumnarDataset] = {}
+        self._rollups = {}
+        self._lock = threading.Lock()
+        # Zapisy zbiorów po kolei - lista segmentów czytana i podmieniana w jednym kroku
+        self._write_lock = threading.Lock()
+
+    def __getstate__(self):
+        return {'root': str(self.root)}
+
+    def __setstate__(self, state):
+        self.__init__(state['root'])
+
+    def _path(self, entity, dataset) -> Path:
+        return self.root / entity / dataset
+
+    def table(self, entity: str, dataset: str) -> Optional[ColumnarDataset]:
+        """Otwarty zbiór (bez czytania danych); None, gdy encja go nie ma"""
+        key = (entity, dataset)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is None and (self._path(entity, dataset) / SEGMENTS_FILE).exists():
+                table = self._tables[key] = ColumnarDataset(self._path(entity, dataset))
+        return table
+
+    def entities(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted({path.parent.parent.name for path in self.root.glob(f'*/*/{SEGMENTS_FILE}')
+                       if path.parent.name in self.DATASETS})
+
+    def rollup(self, dataset: str):
+        """Kostka agregatów zbioru (dzień → kwartał × encja), wczytana przy pierwszym użyciu"""
+        from .rollup import RollupCube
+
+        with self._lock:
+            cube = self._rollups.get(dataset)
+            if cube is None:
+                cube = self._rollups[dataset] = RollupCube.open(self.root / ROLLUP_DIR / dataset,
+                                                                self.ROLLUP_MEASURES[dataset])
+        return cube
+
+    # --- zapis ---
+
+    def _replace_source(self, entity, dataset, columns: Dict[str, object], source: str = '') -> int:
+        """
+        Zapisuje partię jako segment zbioru (import idempotentny). Partia ze
+        źródłem zastępuje segment tego źródła; partia bez źródła wchłania
+        resztę segmentów bez źródła, które zachodzą na zakres jej dat.
+        Pozostałe segmenty nie są czytane ani przepisywane.
+        """
+        count = len(columns[DATE_COLUMN])
+        columns = dict(columns, **{DATE_COLUMN: pd.to_datetime(pd.Series(columns[DATE_COLUMN]),
+                                                                errors='coerce').to_numpy()})
+        lo, hi = _day_range(columns[DATE_COLUMN])
+        directory = self._path(entity, dataset)
+        with self._write_lock:
+            segments = read_segments(directory) if (directory / SEGMENTS_FILE).exists() else []
+            keep, dropped, touched = [], [], [(lo, hi)] if lo else []
+            for segment in segments:
+                if segment['source'] != source:
+                    keep.append(segment)
+                elif source:
+                    dropped.append(segment)
+                    if segment['start']:
+                        touched.append((segment['start'], segment['end']))
+                elif lo and segment['start'] and segment['start'] <= hi and segment['end'] >= lo:
+                    # Wiersze segmentu spoza zakresu partii przechodzą do nowego segmentu
+                    table = ColumnarTable(directory / segment['dir'])
+                    inside = table.locate(lo, hi)
+                    rest = ColumnarSlice([(table, slice(0, inside.start)), (table, slice(inside.stop, len(table)))])
+                    columns = {name: np.concatenate([values, rest[name]]) for name, values in columns.items()}
+                    dropped.append(segment)
+                else:
+                    keep.append(segment)
+
+            version = write_version(directory, columns)
+            start, end = _day_range(columns[DATE_COLUMN])
+            keep.append({'dir': version.name, 'source': source, 'rows': len(columns[DATE_COLUMN]),
+                         'start': start, 'end': end})
+            with atomic_open(directory / SEGMENTS_FILE) as f:
+                json.dump({'version': 1, 'segments': keep}, f, ensure_ascii=False, indent=1)
+            with self._lock:
+                self._tables.pop((entity, dataset), None)
+            for segment in dropped:
+                shutil.rmtree(directory / segment['dir'], ignore_errors=True)
+
+            # Kostka przelicza dni partii i zastąpionego segmentu ze wszystkich segmentów zbioru
+            if touched:
+                start, end = min(lo for lo, _ in touched), max(hi for _, hi in touched)
+                rows = self.table(entity, dataset).slice(start, end)
+                cube = self.rollup(dataset)
+                cube.replace(entity, rows[DATE_COLUMN], {measure: rows[measure] for measure in cube.measures},
+                             start=start, end=end)
+                cube.save(self.root / ROLLUP_DIR / dataset, [entity])
+        return count
+
+    def ingest_daily(self, entity: str, df_daily: pd.DataFrame, source: str = '') -> int:
+        """Dni w układzie ingest.parse_daily_rows (date, amount); poprzednie wiersze źródła są podmieniane"""
+        if df_daily.empty:
+            return 0
+        return self._replace_source(entity, 'daily', {
+            'date': df_daily['date'].to_numpy(),
+            'amount': df_daily['amount'].to_numpy(dtype='float64'),
+        }, source)
+
+    def ingest_sales(self, entity: str, df: pd.DataFrame, source: str = '') -> int:
+        """Wiersze CSV sprzedaży (date, customer, revenue); poprzednie wiersze źródła są podmieniane"""
+        customers = df['customer'] if 'customer' in df else pd.Series([None] * len(df))
+        return self._replace_source(entity, 'sales', {
+            'date': df['date'].to_numpy(),
+            'customer': customers.to_numpy(dtype=object),
+            'revenue': pd.to_numeric(df['revenue'], errors='coerce').to_numpy(dtype='float64'),
+        }, source)
+
+    def ingest_daily_sheet(self, entity: str, path) -> int:
+        return self.ingest_daily(entity, parse_daily_rows(pd.read_excel(path, sheet_name=0)), str(path))
+
+    def ingest_sales_csv(self, entity: str, path) -> int:
+        return self.ingest_sales(entity, read_sales_csv(path), str(path))
+
+    # --- odczyt ---
+
+    def _slice(self, entity, dataset, start, end) -> Optional[ColumnarSlice]:
+        table = self.table(entity, dataset)
+        return None if table is None else table.slice(start, end)
+
+    def daily(self, entity: str, start=None, end=None) -> pd.DataFrame:
+        """Dni encji w zakresie dat, w układzie ingest.parse_daily_rows"""
+        rows = self._slice(entity, 'daily', start, end)
+        if rows is None:
+            return pd.DataFrame()
+        return daily_frame(rows['date'], rows['amount'])
+
+    def sales_slice(self, entity: str, start=None, end=None) -> ColumnarSlice:
+        """Wycinek sprzedaży bez kopiowania - wejście analysis.summarize_sales"""
+        rows = self._slice(entity, 'sales', start, end)
+        if rows is None:
+            raise ValueError(f"Brak danych sprzedaży encji {entity!r} w {self.root}")
+        return rows
+
+    def sales(self, entity: str, start=None, end=None) -> pd.DataFrame:
+        """Wiersze sprzedaży encji w zakresie dat (kopia; date jako datetime64)"""
+        rows = self._slice(entity, 'sales', start, end)
+        if rows is None:
+            return pd.DataFrame(columns=['date', 'customer', 'revenue'])
+        return rows.to_frame(['date', 'customer', 'revenue'])
@@ -0,0 +1,48 @@
+"""
+Prekompresja wygenerowanych raportów.
+
+Obok raport.html zapisujemy raport.html.gz (i raport.html.br, jeśli jest
+zainstalowany pakiet brotli). Serwer (src/server.py) wysyła gotowy plik
+zamiast kompresować odpowiedź przy każdym żądaniu.
+"""
+import gzip
+from pathlib import Path
+
+from .atomic import atomic_open
+
+try:
+    import brotli
+except ImportError:  # brotli jest opcjonalne - bez niego zapisujemy tylko .gz
+    brotli = None
+
+# (Content-Encoding, rozszerzenie) w kolejności preferencji serwera
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def _write_atomic(path: Path, data: bytes):
+    with atomic_open(path, 'wb') as f:
+        f.write(data)
+
+
+def precompress(path) -> list:
+    """
+    Zapisuje skompresowane warianty pliku `path` i zwraca ich ścieżki.
+
+    gzip z mtime=0, więc ten sam raport daje identyczny plik .gz.
+    Nieaktualny .br z poprzedniego uruchomienia (bez brotli) jest usuwany.
+    """
+    path = Path(path)
+    data = path.read_bytes()
+
+    written = []
+    gz_path = path.with_name(path.name + '.gz')
+    _write_atomic(gz_path, gzip.compress(data, compresslevel=9, mtime=0))
+    written.append(gz_path)
+
+    br_path = path.with_name(path.name + '.br')
+    if brotli is not None:
+        _write_atomic(br_path, brotli.compress(data, mode=brotli.MODE_TEXT))
+        written.append(br_path)
+    elif br_path.exists():
+        br_path.unlink()
+    return written
@@ -0,0 +1,86 @@
+"""
+Downsampling długich szeregów czasowych przed rysowaniem.
+
+Wykres z kilku lat dziennych danych (wiele sklepów) to dziesiątki tysięcy
+punktów - JSON figury rośnie liniowo, a przeglądarka rysuje każdy punkt.
+Obie metody zwracają indeksy wybranych punktów (rosnąco, z pierwszym
+i ostatnim), więc te same indeksy można nałożyć na inne serie tego
+samego wykresu (np. średnią ruchomą).
+
+- 'lttb'    - Largest-Triangle-Three-Buckets: zachowuje kształt linii
+- 'min_max' - minimum i maksimum z każdego kubełka: zachowuje piki
+"""
+import numpy as np
+import pandas as pd
+
+
+def _numeric(values) -> np.ndarray:
+    """Oś X jako float - daty zamieniamy na nanosekundy"""
+    array = np.asarray(values)
+    if array.dtype.kind in 'iufb':
+        return array.astype(float)
+    return pd.to_datetime(pd.Series(array)).to_numpy('datetime64[ns]').astype(np.int64).astype(float)
+
+
+def lttb_indices(x, y, threshold: int) -> np.ndarray:
+    """
+    Indeksy `threshold` punktów wybranych algorytmem LTTB.
+
+    Pierwszy i ostatni punkt zostają zawsze. Pozostałe dzielimy na
+    threshold - 2 kubełki i z każdego bierzemy punkt tworzący największy
+    trójkąt z punktem wybranym poprzednio i średnią następnego kubełka.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = _numeric(x)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+            avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+
+        ax, ay = x[selected], y[selected]
+        area = np.abs((ax - avg_x) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y - ay))
+        selected = start + int(np.argmax(area))
+        indices[bucket + 1] = selected
+    return indices
+
+
+def min_max_indices(y, threshold: int) -> np.ndarray:
+    """Indeksy minimum i maksimum z każdego z threshold // 2 kubełków (+ końce szeregu)"""
+    n = len(y)
+    if threshold >= n or threshold < 4:
+        return np.arange(n)
+
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    buckets = (threshold - 2) // 2
+    edges = np.linspace(1, n - 1, buckets + 1).astype(int)
+
+    picked = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        window = y[start:end]
+        picked.append(start + int(np.argmin(window)))
+        picked.append(start + int(np.argmax(window)))
+    return np.unique(picked)
+
+
+METHODS = ('lttb', 'min_max')
+
+
+def downsample_indices(x, y, max_points: int, method: str = 'lttb') -> np.ndarray:
+    """Indeksy co najwyżej `max_points` punktów szeregu (x, y) wybrane metodą `method`"""
+    if method == 'lttb':
+        return lttb_indices(x, y, max_points)
+    if method == 'min_max':
+        return min_max_indices(y, max_points)
+    raise ValueError(f"Nieznana metoda downsamplingu: {method} (dostępne: {', '.join(METHODS)})")
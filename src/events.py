@@ -0,0 +1,183 @@
+"""
+Server-sent events (SSE) - powiadomienia otwartych kart o nowej wersji raportu.
+
+Przeglądarka trzyma otwarte połączenie /events (EventSource). Po
+przyjęciu żądania serwer HTTP oddaje gniazdo do EventBroadcaster, więc
+bezczynny subskrybent nie zajmuje wątku z puli. Wszystkie subskrypcje
+obsługuje jeden wątek na selektorze: wysyła zdarzenia, co HEARTBEAT_INTERVAL
+sekund komentarz podtrzymujący połączenie i wykrywa zamknięte karty (EOF).
+Klient, który nie odbiera danych (pełny bufor gniazda), jest rozłączany -
+EventSource połączy się ponownie sam.
+"""
+import http
+import json
+import queue
+import selectors
+import socket
+import threading
+import time
+
+# Co tyle sekund komentarz SSE - proxy i przeglądarki nie zamykają bezczynnego połączenia
+HEARTBEAT_INTERVAL = 15.0
+# Po tylu ms EventSource łączy się ponownie po zerwaniu połączenia
+RETRY_MS = 2000
+
+
+def format_event(event: str, data) -> bytes:
+    """Zdarzenie SSE: 'event: nazwa' + dane JSON w jednej linii 'data:'"""
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return f'event: {event}\ndata: {payload}\n\n'.encode('utf-8')
+
+
+class EventBroadcaster:
+    """
+    Rozsyłanie zdarzeń do subskrybentów SSE z jednego wątku.
+
+    add(sock) przejmuje gniazdo po wysłaniu nagłówków odpowiedzi,
+    publish(event, data) wysyła zdarzenie do wszystkich podłączonych.
+    Komendy z innych wątków trafiają do kolejki, a wątek selektora budzi
+    para gniazd (socketpair).
+    """
+
+    def __init__(self, heartbeat: float = HEARTBEAT_INTERVAL):
+        self.heartbeat = heartbeat
+        self.published = 0
+        self._clients = set()
+        self._commands = queue.SimpleQueue()
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        self._selector.register(self._wakeup_recv, selectors.EVENT_READ)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='sse', daemon=True)
+        self._thread.start()
+
+    def __len__(self):
+        return len(self._clients)
+
+    def add(self, sock: socket.socket):
+        """Przejmuje gniazdo subskrybenta (nagłówki odpowiedzi już wysłane)"""
+        self._command('add', sock)
+
+    def publish(self, event: str, data):
+        """Wysyła zdarzenie do wszystkich subskrybentów"""
+        self._command('publish', format_event(event, data))
+
+    def close(self):
+        """Rozłącza subskrybentów i kończy wątek selektora"""
+        if self._closed:
+            return
+        self._command('close', None)
+        self._thread.join()
+        self._closed = True
+
+    def _command(self, name, value):
+        self._commands.put((name, value))
+        try:
+            self._wakeup_send.send(b'\0')
+        except OSError:
+            pass
+
+    def _run(self):
+        next_heartbeat = time.monotonic() + self.heartbeat
+        running = True
+        while running:
+            timeout = max(0.0, next_heartbeat - time.monotonic())
+            for key, _ in self._selector.select(timeout):
+                if key.fileobj is self._wakeup_recv:
+                    self._drain_wakeup()
+                else:
+                    self._read_client(key.fileobj)
+
+            while running:
+                try:
+                    name, value = self._commands.get_nowait()
+                except queue.Empty:
+                    break
+                if name == 'add':
+                    self._add(value)
+                elif name == 'publish':
+                    self.published += 1
+                    self._broadcast(value)
+                else:
+                    running = False
+
+            if time.monotonic() >= next_heartbeat:
+                self._broadcast(b': ping\n\n')
+                next_heartbeat = time.monotonic() + self.heartbeat
+
+        for sock in list(self._clients):
+            self._drop(sock)
+        self._selector.close()
+        self._wakeup_recv.close()
+        self._wakeup_send.close()
+
+    def _drain_wakeup(self):
+        try:
+            while self._wakeup_recv.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _add(self, sock):
+        sock.setblocking(False)
+        self._clients.add(sock)
+        self._selector.register(sock, selectors.EVENT_READ)
+        self._send(sock, f'retry: {RETRY_MS}\n\n'.encode('ascii'))
+
+    def _read_client(self, sock):
+        """Klient SSE nic nie wysyła - dane do odczytu oznaczają zwykle EOF (zamknięta karta)"""
+        try:
+            data = sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self._drop(sock)
+
+    def _broadcast(self, message: bytes):
+        for sock in list(self._clients):
+            self._send(sock, message)
+
+    def _send(self, sock, message: bytes):
+        """Zdarzenie musi zmieścić się w buforze gniazda - inaczej klient nie nadąża i jest rozłączany"""
+        try:
+            sent = sock.send(message)
+        except OSError:
+            sent = 0
+        if sent < len(message):
+            self._drop(sock)
+
+    def _drop(self, sock):
+        if sock not in self._clients:
+            return
+        self._clients.discard(sock)
+        self._selector.unregister(sock)
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+
+
+def events_route(broadcaster: EventBroadcaster):
+    """
+    Endpoint /events - strumień text/event-stream z EventBroadcaster.
+
+    Handler wysyła nagłówki i oddaje gniazdo (server.detach), więc wątek
+    puli wraca do obsługi innych połączeń.
+    """
+    def handle(handler, params):
+        handler.send_response(http.HTTPStatus.OK)
+        handler.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        handler.send_header('Cache-Control', 'no-cache')
+        handler.send_header('Connection', 'close')
+        handler.end_headers()
+        handler.wfile.flush()
+        handler.close_connection = True
+        if handler.command == 'GET':
+            handler.server.detach(handler.connection)
+            broadcaster.add(handler.connection)
+        return False
+    return handle
@@ -0,0 +1,81 @@
+"""
+Szkielety wykresów wielokrotnego użytku dla seryjnego generowania raportów.
+
+Przy raporcie na każdą encję wykresy mają ten sam układ, motyw i style -
+różnią się tylko danymi. Szkielet to słownik figury zbudowany (i zwalidowany
+przez plotly) raz na proces; kolejne raporty podmieniają w nim wyłącznie
+tablice danych i teksty zależne od danych, bez tworzenia go.Figure.
+"""
+import threading
+from typing import Callable, Dict
+
+from plotly.io.json import to_json_plotly
+
+
+def _patched(base, patch):
+    """
+    Zwraca kopię `base` z naniesionymi zmianami z `patch`.
+
+    Kopiowane są tylko węzły na ścieżkach zmian - reszta szkieletu (np. cały
+    motyw plotly_dark) jest współdzielona. Listy indeksujemy kluczami int.
+    Podmieniane klucze zachowują pozycję, więc JSON jest identyczny
+    z wynikiem fig.to_json() dla tych samych danych.
+    """
+    if isinstance(base, list):
+        result = list(base)
+        for index, value in patch.items():
+            result[index] = _patched(result[index], value) if isinstance(value, dict) else value
+        return result
+
+    result = dict(base)
+    for key, value in patch.items():
+        current = result.get(key)
+        if isinstance(value, dict) and isinstance(current, (dict, list)):
+            result[key] = _patched(current, value)
+        else:
+            result[key] = value
+    return result
+
+
+class FigureSkeleton:
+    """Zwalidowany słownik figury, do którego wstawiamy dane kolejnych encji"""
+
+    def __init__(self, figure):
+        spec = figure.to_dict()
+        for trace in spec.get('data', []):
+            trace.pop('uid', None)
+        self.spec = spec
+
+    def spec_for(self, patch: dict) -> dict:
+        """
+        Zwraca słownik figury z podmienionymi danymi.
+
+        patch ma postać {'data': {nr_śladu: {...}}, 'layout': {...}} -
+        tylko właściwości zależne od danych.
+        """
+        return _patched(self.spec, patch)
+
+    def render(self, patch: dict) -> str:
+        """Zwraca JSON figury z podmienionymi danymi (patrz spec_for)"""
+        return to_json_plotly(self.spec_for(patch))
+
+
+_skeletons: Dict[str, FigureSkeleton] = {}
+_lock = threading.Lock()
+
+
+def get_skeleton(name: str, build_figure: Callable) -> FigureSkeleton:
+    """Zwraca szkielet `name`, budując go przy pierwszym użyciu w procesie"""
+    skeleton = _skeletons.get(name)
+    if skeleton is None:
+        with _lock:
+            skeleton = _skeletons.get(name)
+            if skeleton is None:
+                skeleton = _skeletons[name] = FigureSkeleton(build_figure())
+    return skeleton
+
+
+def clear_skeletons():
+    """Usuwa zbudowane szkielety (np. po zmianie stylów wykresów)"""
+    with _lock:
+        _skeletons.clear()
@@ -0,0 +1,219 @@
+"""
+Lekki builder figur plotly bez walidatorów graph_objects.
+
+Udostępnia podzbiór API plotly.graph_objects (Figure, Bar, Scatter, Scattergl,
+Pie, Waterfall, add_trace, update_layout, add_hline) oraz make_subplots,
+ale buduje zwykłe słowniki w schemacie JSON plotly. Nie ma tu walidacji
+właściwości - literówka w nazwie przejdzie bez błędu, dlatego wykresy
+raportów są sprawdzane testem zgodności z wynikiem graph_objects.
+
+Użycie w builderach wykresów: go = figure_spec zamiast plotly.graph_objects.
+"""
+import threading
+
+import pandas as pd
+import plotly.io as pio
+from _plotly_utils.utils import convert_to_base64
+from plotly.io.json import to_json_plotly
+
+
+# Właściwości plotly, które same zawierają podkreślenie - nie są ścieżką
+_UNDERSCORE_PROPS = {'paper_bgcolor', 'plot_bgcolor', 'error_x', 'error_y', 'error_z'}
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def _template_dict(name):
+    """Słownik motywu plotly (np. 'plotly_dark') - pobierany raz na proces"""
+    template = _templates.get(name)
+    if template is None:
+        with _templates_lock:
+            template = _templates.get(name)
+            if template is None:
+                template = _templates[name] = pio.templates[name].to_plotly_json()
+    return template
+
+
+def _split(key):
+    if key in _UNDERSCORE_PROPS or '_' not in key:
+        return [key]
+    for prop in _UNDERSCORE_PROPS:
+        if key.startswith(prop + '_'):
+            return [prop] + _split(key[len(prop) + 1:])
+    head, rest = key.split('_', 1)
+    return [head] + _split(rest)
+
+
+def _coerce(value):
+    """Dane pandas -> numpy (jak walidatory plotly), krotki -> listy"""
+    if isinstance(value, (pd.Series, pd.Index)):
+        return value.to_numpy()
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+def _assign(node, key, value):
+    """Ustawia node[key] z obsługą ścieżek 'xaxis_title_text' i zagnieżdżonych słowników"""
+    *parents, leaf = _split(key)
+    for parent in parents:
+        child = node.get(parent)
+        if isinstance(child, str) and parent == 'title':
+            child = {'text': child}
+        if not isinstance(child, dict):
+            child = {}
+        node[parent] = child
+        node = child
+
+    if isinstance(value, dict):
+        child = node.get(leaf)
+        if not isinstance(child, dict):
+            child = {'text': child} if leaf == 'title' and isinstance(child, str) else {}
+        node[leaf] = child
+        for sub_key, sub_value in value.items():
+            _assign(child, sub_key, sub_value)
+    elif leaf == 'title' and isinstance(value, str):
+        node[leaf] = {'text': value}
+    else:
+        node[leaf] = _coerce(value)
+
+
+def _props(props):
+    result = {}
+    for key, value in props.items():
+        if value is not None:
+            _assign(result, key, value)
+    return result
+
+
+def _trace_type(trace_type):
+    def build(**props):
+        trace = _props(props)
+        trace['type'] = trace_type
+        return trace
+    build.__name__ = trace_type.capitalize()
+    build.__doc__ = f"Ślad '{trace_type}' jako słownik (odpowiednik go.{build.__name__})"
+    return build
+
+
+Bar = _trace_type('bar')
+Scatter = _trace_type('scatter')
+Scattergl = _trace_type('scattergl')
+Pie = _trace_type('pie')
+Waterfall = _trace_type('waterfall')
+
+
+_ANNOTATION_POSITIONS = {
+    'top right': (1, 'right', 'bottom'),
+    'top left': (0, 'left', 'bottom'),
+    'top': (0.5, 'center', 'bottom'),
+    'bottom right': (1, 'right', 'top'),
+    'bottom left': (0, 'left', 'top'),
+    'bottom': (0.5, 'center', 'top'),
+    'right': (1, 'left', 'middle'),
+    'left': (0, 'right', 'middle'),
+}
+
+
+class FigureSpec:
+    """Odpowiednik go.Figure przechowujący słowniki zamiast obiektów z walidatorami"""
+
+    def __init__(self, data=None, layout=None):
+        self.data = []
+        self.layout = {}
+        self._grid = {}
+        for trace in data or []:
+            self.add_trace(trace)
+        if layout:
+            self.update_layout(layout)
+
+    def add_trace(self, trace, row=None, col=None):
+        trace = dict(trace)
+        if row is not None:
+            xaxis, yaxis = self._grid[(row, col or 1)]
+            trace['xaxis'], trace['yaxis'] = xaxis, yaxis
+        self.data.append(trace)
+        return self
+
+    def update_layout(self, dict1=None, **kwargs):
+        for key, value in {**(dict1 or {}), **kwargs}.items():
+            _assign(self.layout, key, value)
+        return self
+
+    def add_hline(self, y, row=None, col=None, annotation_text=None, annotation_position='top right',
+                  annotation_font=None, **shape_props):
+        xref, yref = 'x domain', 'y'
+        if row is not None:
+            xaxis, yaxis = self._grid[(row, col or 1)]
+            xref, yref = f'{xaxis} domain', yaxis
+
+        shape = _props(shape_props)
+        shape.update({'type': 'line', 'x0': 0, 'x1': 1, 'xref': xref, 'y0': y, 'y1': y, 'yref': yref})
+        self.layout.setdefault('shapes', []).append(shape)
+
+        if annotation_text is not None:
+            x, xanchor, yanchor = _ANNOTATION_POSITIONS[annotation_position]
+            annotation = {'showarrow': False, 'text': annotation_text, 'x': x, 'xanchor': xanchor,
+                          'xref': xref, 'y': y, 'yanchor': yanchor, 'yref': yref}
+            if annotation_font is not None:
+                annotation['font'] = _props(annotation_font)
+            self.layout.setdefault('annotations', []).append(annotation)
+        return self
+
+    def to_dict(self):
+        data = [dict(trace) for trace in self.data]
+        layout = {key: value for key, value in self.layout.items() if key != 'template'}
+        convert_to_base64(data)
+        convert_to_base64(layout)
+
+        template = self.layout.get('template', pio.templates.default)
+        layout['template'] = _template_dict(template) if isinstance(template, str) else template
+        return {'data': data, 'layout': layout}
+
+    def to_plotly_json(self):
+        return self.to_dict()
+
+    def to_json(self):
+        return to_json_plotly(self.to_dict())
+
+
+Figure = FigureSpec
+
+
+def make_subplots(rows=1, cols=1, subplot_titles=None, vertical_spacing=None, horizontal_spacing=None):
+    """
+    Siatka osi jak plotly.subplots.make_subplots (start_cell='top-left', bez scalania komórek).
+
+    Domeny i adnotacje tytułów liczone są tym samym wzorem co w plotly.
+    """
+    vertical_spacing = 0.3 / rows if vertical_spacing is None else vertical_spacing
+    horizontal_spacing = 0.2 / cols if horizontal_spacing is None else horizontal_spacing
+    widths = [(1.0 - horizontal_spacing * (cols - 1)) / cols] * cols
+    heights = [(1.0 - vertical_spacing * (rows - 1)) / rows] * rows
+
+    fig = FigureSpec()
+    titles = []
+    for r in range(rows):
+        # Wiersz 1 jest na górze - liczymy od dołu jak plotly (row_dir=-1)
+        grid_row = rows - 1 - r
+        y_start = sum(heights[:grid_row]) + grid_row * vertical_spacing
+        y_end = min(max(y_start + heights[-1 - r], 0.0), 1.0)
+        y_start = min(max(y_start, 0.0), 1.0)
+        for c in range(cols):
+            x_start = sum(widths[:c]) + c * horizontal_spacing
+            x_end = x_start + widths[c]
+            number = r * cols + c + 1
+            suffix = '' if number == 1 else str(number)
+            fig.layout[f'xaxis{suffix}'] = {'anchor': f'y{suffix}', 'domain': [x_start, x_end]}
+            fig.layout[f'yaxis{suffix}'] = {'anchor': f'x{suffix}', 'domain': [y_start, y_end]}
+            fig._grid[(r + 1, c + 1)] = (f'x{suffix}', f'y{suffix}')
+            titles.append(((x_start + x_end) / 2.0, y_end))
+
+    for text, (x, y) in zip(subplot_titles or (), titles):
+        if text:
+            fig.layout.setdefault('annotations', []).append({
+                'font': {'size': 16}, 'showarrow': False, 'text': text, 'x': x, 'xanchor': 'center',
+                'xref': 'paper', 'y': y, 'yanchor': 'bottom', 'yref': 'paper',
+            })
+    return fig
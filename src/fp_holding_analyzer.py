@@ -8,6 +8,8 @@ import numpy as np
 from datetime import datetime
 from typing import Dict, List
 
+from . import metrics
+
 
 class FPHoldingAnalyzer:
     """Analizator finansowy dla FP HOLDING wykorzystujący rzeczywistą strukturę Excela"""
@@ -17,19 +19,26 @@ class FPHoldingAnalyzer:
         self.df = None
         self.analysis = {}
         
-    def load_and_clean(self):
+    @metrics.stage('load')
+    def load_and_clean(self, raw_df: pd.DataFrame = None):
         """
         Ładuje i czyści dane z Excela ZACHOWUJĄC gotową kolumnę ZYSK.
         
+        raw_df - opcjonalnie gotowe wiersze w układzie arkusza (kolumny A-M,
+        z wierszem sierpnia 2024), np. dane syntetyczne; wtedy Excel nie jest czytany.
+        
         Struktura Excela (kolory mają znaczenie!):
         - ZIELONE (przychód): B, C, D (Obrót brutto, Obrót netto, VAT)
         - POMARAŃCZOWE (koszty): E, F, G, H, I, J (Koszta brutto, Kwota netto, VAT, ZUS, PIT, Koszt pracowniczy)
         - ŻÓŁTE (zysk): K (ZYSK/Stra BRUTTO) - gotowa formuła =C-F-H-I-J
         """
-        print(f"📊 Ładuję dane z: {self.excel_path}")
-        
-        # Wczytaj dane od września 2024 (pomijamy sierpień 2024)
-        df = pd.read_excel(self.excel_path, nrows=14)
+        if raw_df is None:
+            print(f"📊 Ładuję dane z: {self.excel_path}")
+            
+            # Wczytaj dane od września 2024 (pomijamy sierpień 2024)
+            df = pd.read_excel(self.excel_path, nrows=14)
+        else:
+            df = raw_df.head(14)
         
         # Usuń pierwszy wiersz (sierpień 2024) - skupiamy się na wrz.2024 - wrz.2025
         df = df.iloc[1:].reset_index(drop=True)
@@ -57,6 +66,25 @@ class FPHoldingAnalyzer:
             'Ilość_rachunków'  # M
         ]
         
+        self._derive_columns()
+        return self
+    
+    @metrics.stage('load')
+    def load_from_store(self, store, entity: str, start=None, end=None):
+        """
+        Ładuje oczyszczone wiersze miesięczne encji z magazynu (src/store.py)
+        zamiast czytać arkusz - zakres okresów filtruje zapytanie po indeksie.
+        """
+        df = store.monthly(entity, start, end)
+        if df.empty:
+            raise ValueError(f"Brak danych encji {entity!r} w okresie {start or '...'} - {end or '...'}")
+        print(f"📊 Ładuję dane z magazynu: {entity} ({len(df)} mies.)")
+        self.df = df
+        self._derive_columns()
+        return self
+    
+    def _derive_columns(self):
+        """Kolumny pochodne oczyszczonych danych (Okres_str, Koszty_total, weryfikacja zysku)"""
         # Konwersja dat - formatuj ładnie z polskimi nazwami miesięcy
         import locale
         try:
@@ -94,9 +122,31 @@ class FPHoldingAnalyzer:
         print(f"  • Przychód netto: {self.df['Obrót_netto'].sum():,.2f} zł")
         print(f"  • Koszty total: {self.df['Koszty_total'].sum():,.2f} zł")
         print(f"  • Zysk (Excel): {self.df['Zysk_Excel'].sum():,.2f} zł")
+    
+    def slice_period(self, start=None, end=None):
+        """
+        Zawęża dane do okresów od `start` do `end` włącznie (np. '2024-10', '2025-03').
         
+        Wywoływać po load_and_clean, przed analyze. Pusty zakres to ValueError.
+        """
+        if start is None and end is None:
+            return self
+        
+        periods = pd.to_datetime(self.df['Okres'])
+        mask = pd.Series(True, index=self.df.index)
+        if start is not None:
+            mask &= periods >= pd.Timestamp(start)
+        if end is not None:
+            mask &= periods <= pd.Timestamp(end)
+        if not mask.any():
+            raise ValueError(f"Brak danych w okresie {start or '...'} - {end or '...'}")
+        
+        self.df = self.df[mask].reset_index(drop=True)
+        print(f"📅 Okres raportu: {self.df['Okres_str'].iloc[0]} - {self.df['Okres_str'].iloc[-1]} "
+              f"({len(self.df)} mies.)")
         return self
         
+    @metrics.stage('validate')
     def validate(self):
         """Walidacja danych"""
         print("\n🔍 Walidacja danych...")
@@ -130,6 +180,7 @@ class FPHoldingAnalyzer:
         
         return self
         
+    @metrics.stage('analyze')
     def analyze(self):
         """Główna analiza finansowa"""
         print("\n📈 Analiza finansowa...")
@@ -363,8 +414,8 @@ class FPHoldingAnalyzer:
         
         return self
         
-    def export_to_csv(self, output_path: str):
-        """Eksportuje oczyszczone dane do CSV"""
+    def export_to_csv(self, output_path):
+        """Eksportuje oczyszczone dane do CSV (ścieżka albo otwarty plik tekstowy)"""
         export_df = self.df[[
             'Okres_str', 
             'Obrót_brutto', 
@@ -394,6 +445,8 @@ class FPHoldingAnalyzer:
         ]
         
         export_df.to_csv(output_path, index=False, encoding='utf-8-sig')
-        print(f"✅ Dane wyeksportowane do: {output_path}")
+        # Otwarty plik (np. atomowy plik tymczasowy zadania) loguje wywołujący
+        if not hasattr(output_path, 'write'):
+            print(f"✅ Dane wyeksportowane do: {output_path}")
         
         return self
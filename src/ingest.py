@@ -1,4 +1,4 @@
-"""Moduł do wczytywania danych sprzedażowych (CSV)"""
+"""Moduł do wczytywania danych sprzedażowych (CSV, arkusz dzienny)"""
 import pandas as pd
 from pathlib import Path
 
@@ -7,3 +7,60 @@ def read_sales_csv(path: str) -> pd.DataFrame:
     path = Path(path)
     df = pd.read_csv(path)
     return df
+
+
+def parse_daily_rows(df_excel: pd.DataFrame) -> pd.DataFrame:
+    """
+    Wiersze dzienne z arkusza 'Zestawienie sprzedaży': kolumna D to zakres
+    'dd.mm.YYYY HH:MM do dd.mm.YYYY HH:MM', kolumna E to kwota (liczba albo
+    tekst z przecinkiem). Zwraca date, amount, day_of_week, week_number
+    posortowane po dacie; pozostałe wiersze są pomijane.
+    """
+    daily_data = []
+    
+    for i in range(len(df_excel)):
+        if pd.notna(df_excel.iloc[i, 3]) and 'do' in str(df_excel.iloc[i, 3]):
+            date_range = str(df_excel.iloc[i, 3])
+            amount = df_excel.iloc[i, 4]
+            
+            if pd.notna(amount) and isinstance(amount, (int, float, str)):
+                try:
+                    # Parsowanie daty początku
+                    if 'do' in date_range:
+                        start_date = date_range.split(' do ')[0]
+                        date_obj = pd.to_datetime(start_date, format='%d.%m.%Y %H:%M')
+                        
+                        # Konwersja kwoty
+                        if isinstance(amount, str):
+                            amount_clean = amount.replace(' ', '').replace(',', '.')
+                            amount_float = float(amount_clean)
+                        else:
+                            amount_float = float(amount)
+                        
+                        daily_data.append({
+                            'date': date_obj.date(),
+                            'amount': amount_float,
+                            'day_of_week': date_obj.strftime('%A'),
+                            'week_number': date_obj.isocalendar()[1]
+                        })
+                except:
+                    continue
+    
+    df_daily = pd.DataFrame(daily_data)
+    if not df_daily.empty:
+        df_daily['date'] = pd.to_datetime(df_daily['date'])
+        df_daily = df_daily.sort_values('date')
+    return df_daily
+
+
+def daily_frame(dates, amounts) -> pd.DataFrame:
+    """Ramka dzienna w układzie parse_daily_rows z gotowych dat i kwot (np. z magazynu danych)"""
+    dates = pd.Series(pd.to_datetime(dates), name='date').reset_index(drop=True)
+    if dates.empty:
+        return pd.DataFrame()
+    return pd.DataFrame({
+        'date': dates,
+        'amount': pd.Series(amounts, dtype='float64').reset_index(drop=True),
+        'day_of_week': dates.dt.strftime('%A'),
+        'week_number': dates.dt.isocalendar().week.astype('int64').to_numpy(),
+    })
@@ -0,0 +1,268 @@
+"""
+Kolejka zadań generowania raportów w tle.
+
+Zadanie (arkusz, encja, okres, format) trafia do puli wątków zamiast
+blokować wątek żądania HTTP. Identyczne zadanie, które czeka albo już
+się wykonuje, nie jest dodawane drugi raz - zgłaszający dostaje istniejące.
+Postęp (etap + ułamek) jest widoczny w statusie zadania (/api/jobs),
+a gotowy plik jest publikowany atomowo w katalogu reports/ serwera.
+
+Z katalogiem cache (cache_dir) wynik jest też zapisywany pod kluczem
+(odcisk arkusza, okres, format, wersja kodu) - powtórzone zadanie na
+niezmienionym arkuszu tylko kopiuje gotowy plik.
+"""
+import hashlib
+import itertools
+import threading
+import time
+from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from . import jsonapi, tracing
+from .atomic import atomic_open
+from .fp_holding_analyzer import FPHoldingAnalyzer
+from .compression import precompress
+from .pipeline import input_fingerprint, parse_period
+from .report_generator import ReportGenerator
+from .store import AnalyticsStore
+
+FORMATS = ('html', 'json', 'csv')
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+
+@lru_cache(maxsize=1)
+def _code_version() -> str:
+    """Odcisk modułów src i szablonów - zmiana kodu raportu unieważnia cache wyników"""
+    root = Path(__file__).parent
+    files = sorted(list(root.glob('*.py')) + list(root.glob('templates/*')))
+    stats = [(path.name, path.stat().st_size, path.stat().st_mtime_ns) for path in files]
+    return hashlib.sha1(repr(stats).encode('utf-8')).hexdigest()[:12]
+
+
+class JobSpec:
+    """Parametry zadania - ten sam spec oznacza ten sam plik wynikowy"""
+
+    def __init__(self, workbook, entity, start=None, end=None, fmt='html', output_path=None):
+        if fmt not in FORMATS:
+            raise ValueError(f"Nieznany format: {fmt!r} (dostępne: {', '.join(FORMATS)})")
+        self.workbook = str(workbook)
+        self.entity = entity
+        self.start = parse_period(start)
+        self.end = parse_period(end)
+        if self.start and self.end and self.start > self.end:
+            raise ValueError(f"Początek okresu {self.start} jest po końcu {self.end}")
+        self.format = fmt
+        self.output_path = str(output_path) if output_path else None
+
+    @property
+    def key(self):
+        return self.workbook, self.entity, self.start, self.end, self.format, self.output_path
+
+    def cache_key(self) -> str:
+        """Klucz cache wyniku - zmienia się z arkuszem (rozmiar, mtime) i z kodem raportu"""
+        parts = (input_fingerprint(self.workbook), self.entity, self.start, self.end, self.format, _code_version())
+        return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+    def artifact_path(self, output_dir) -> Path:
+        """Domyślnie reports/<encja>/raport_<od>_<do>.<format>"""
+        if self.output_path:
+            return Path(self.output_path)
+        name = f"raport_{self.start or 'start'}_{self.end or 'koniec'}.{self.format}"
+        return Path(output_dir, self.entity, name)
+
+
+class Job:
+    """Stan jednego zadania; wait() czeka na zakończenie"""
+
+    def __init__(self, job_id: str, spec: JobSpec, artifact: Path):
+        self.id = job_id
+        self.spec = spec
+        self.artifact = artifact
+        self.status = QUEUED
+        self.stage = None
+        self.progress = 0.0
+        self.error = None
+        self.cached = False
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._done = threading.Event()
+
+    @property
+    def pending(self):
+        return self.status in (QUEUED, RUNNING)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def to_dict(self, url_root: Optional[Path] = None) -> dict:
+        """Status do JSON; artefakt jako ścieżka URL względem `url_root` (katalogu serwera)"""
+        artifact = self.artifact
+        if url_root is not None:
+            try:
+                artifact = '/' + Path(self.artifact).resolve().relative_to(Path(url_root).resolve()).as_posix()
+            except ValueError:
+                pass
+        return {
+            'id': self.id,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': round(self.progress, 3),
+            'entity': self.spec.entity,
+            'from': self.spec.start,
+            'to': self.spec.end,
+            'format': self.spec.format,
+            'artifact': str(artifact) if self.status == DONE else None,
+            'error': self.error,
+            'cached': self.cached,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+        }
+
+
+def generate_artifact(spec: JobSpec, path: Path, progress: Callable[[str, float], None], max_workers=None,
+                      from_store=False):
+    """
+    Analiza arkusza i zapis wyniku w formacie spec.format (atomowo); max_workers - wątki wykresów.
+
+    from_store: spec.workbook to magazyn SQLite (src/store.py) - wiersze
+    miesięczne encji i okresu pochodzą z zapytania zamiast z arkusza.
+    """
+    progress('load', 0.05)
+    if from_store:
+        with AnalyticsStore(spec.workbook) as store:
+            analyzer = FPHoldingAnalyzer(spec.entity).load_from_store(store, spec.entity, spec.start, spec.end)
+    else:
+        analyzer = FPHoldingAnalyzer(spec.workbook)
+        analyzer.load_and_clean().slice_period(spec.start, spec.end)
+    progress('analyze', 0.3)
+    analyzer.validate().analyze().find_savings().create_recovery_plan()
+
+    progress('render', 0.6)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if spec.format == 'html':
+        ReportGenerator(analyzer, max_workers=max_workers, fast_figures=True).generate_html(str(path))
+    elif spec.format == 'json':
+        with atomic_open(path, 'wb') as f:
+            f.write(jsonapi.dumps(analyzer.analysis))
+    else:
+        with atomic_open(path, encoding='utf-8-sig') as f:
+            analyzer.export_to_csv(f)
+        print(f"✅ Dane wyeksportowane do: {path}")
+
+
+def _copy_atomic(source: Path, target: Path):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(source, 'rb') as src, atomic_open(target, 'wb') as dst:
+        while chunk := src.read(1 << 20):
+            dst.write(chunk)
+
+
+class JobQueue:
+    """
+    Pula `max_workers` wątków wykonujących zadania generowania.
+
+    runner(spec, path, progress) wykonuje zadanie (domyślnie generate_artifact);
+    on_update(job) jest wołane po każdej zmianie stanu (np. zdarzenie SSE).
+    Historia trzyma ostatnie `max_history` zadań.
+    """
+
+    def __init__(self, output_dir='reports', max_workers: int = 2, runner: Callable = generate_artifact,
+                 on_update: Optional[Callable] = None, max_history: int = 1000, cache_dir=None):
+        self.output_dir = Path(output_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.runner = runner
+        self.on_update = on_update
+        self.max_history = max_history
+        self._jobs: Dict[str, Job] = OrderedDict()
+        self._pending: Dict[tuple, Job] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+
+    def submit(self, workbook, entity, start=None, end=None, fmt='html', output_path=None) -> Job:
+        """Dodaje zadanie albo zwraca identyczne, które jeszcze czeka lub trwa"""
+        spec = JobSpec(workbook, entity, start, end, fmt, output_path)
+        with self._lock:
+            job = self._pending.get(spec.key)
+            if job is not None:
+                return job
+            job = Job(f'{next(self._ids):06d}', spec, spec.artifact_path(self.output_dir))
+            self._pending[spec.key] = job
+            self._jobs[job.id] = job
+            self._trim_history()
+        self._notify(job)
+        self._pool.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """Zadanie o danym id; nieznane to KeyError"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Nieznane zadanie: {job_id!r}")
+        return job
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _trim_history(self):
+        finished = [job_id for job_id, job in self._jobs.items() if not job.pending]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_history)]:
+            del self._jobs[job_id]
+
+    def _notify(self, job):
+        if self.on_update is not None:
+            self.on_update(job)
+
+    def _progress(self, job, stage, fraction):
+        job.stage = stage
+        job.progress = fraction
+        self._notify(job)
+
+    def _produce(self, job):
+        """Wynik z cache_dir albo z runnera (i wtedy zapisany w cache)"""
+        progress = lambda stage, fraction: self._progress(job, stage, fraction)
+        if self.cache_dir is None:
+            return self.runner(job.spec, job.artifact, progress)
+
+        cached = self.cache_dir / f'{job.spec.cache_key()}.{job.spec.format}'
+        if cached.exists():
+            progress('cache', 0.9)
+            _copy_atomic(cached, job.artifact)
+            if job.spec.format == 'html':
+                precompress(job.artifact)
+            job.cached = True
+            return
+        self.runner(job.spec, job.artifact, progress)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        _copy_atomic(job.artifact, cached)
+
+    def _run(self, job):
+        job.status = RUNNING
+        job.started = time.time()
+        self._notify(job)
+        try:
+            with tracing.span(f'job {job.id}', 'job', entity=job.spec.entity, format=job.spec.format,
+                              start=job.spec.start, end=job.spec.end):
+                self._produce(job)
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e)
+        else:
+            job.status = DONE
+            job.stage = 'published'
+            job.progress = 1.0
+        finally:
+            job.finished = time.time()
+            with self._lock:
+                self._pending.pop(job.spec.key, None)
+            job._done.set()
+            self._notify(job)
@@ -0,0 +1,89 @@
+"""
+Serializacja słownika analizy (FPHoldingAnalyzer.analysis) do JSON dla /api/analysis.
+
+Analiza zawiera skalary numpy (int64 z .sum(), float64) - obsługuje je
+orjson (jeśli zainstalowany, OPT_SERIALIZE_NUMPY) albo konwersja do typów
+Pythona przed json.dumps. NaN i nieskończoności stają się null.
+"""
+import json
+import math
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # orjson jest opcjonalny - wolniejszy fallback na json ze standardowej biblioteki
+    orjson = None
+
+
+def _default(obj):
+    """Typy spoza JSON: numpy, pandas, daty"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (pd.Timestamp, pd.Period)):
+        return str(obj)
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f'Obiekt typu {type(obj).__name__} nie jest serializowalny do JSON')
+
+
+def _plain(obj):
+    """Rekurencyjna konwersja do typów json - numpy na Python, NaN na None"""
+    if isinstance(obj, dict):
+        return {str(key): _plain(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_plain(value) for value in obj]
+    if isinstance(obj, (np.generic, np.ndarray, pd.Timestamp, pd.Period)) or hasattr(obj, 'isoformat'):
+        obj = _default(obj)
+        if isinstance(obj, list):
+            return _plain(obj)
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+
+def dumps(obj) -> bytes:
+    """JSON (UTF-8) - orjson, jeśli dostępny"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(_plain(obj), ensure_ascii=False, separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+
+def loads(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def parse_fields(value: Optional[str]) -> Optional[tuple]:
+    """'summary.margin, savings' -> ('savings', 'summary.margin'); puste -> None (wszystko)"""
+    if not value:
+        return None
+    fields = {field.strip() for field in value.split(',') if field.strip()}
+    return tuple(sorted(fields)) or None
+
+
+def project(data: dict, fields: Optional[Iterable[str]]) -> dict:
+    """
+    Wybiera z `data` tylko pola z `fields` (ścieżki z kropkami, np. 'summary.margin').
+
+    Nieznane pole to ValueError z nazwą ścieżki.
+    """
+    if not fields:
+        return data
+
+    result = {}
+    for field in fields:
+        source, target = data, result
+        parts = field.split('.')
+        for depth, part in enumerate(parts):
+            if not isinstance(source, dict) or part not in source:
+                raise ValueError(f"Nieznane pole: {'.'.join(parts[:depth + 1])}")
+            source = source[part]
+            if depth < len(parts) - 1:
+                target = target.setdefault(part, {})
+        target[parts[-1]] = source
+    return result
@@ -0,0 +1,281 @@
+"""
+Metryki procesu w formacie tekstowym Prometheusa (endpoint /metrics).
+
+Liczniki i histogramy są zwykłymi obiektami w pamięci - zapis to jedna
+blokada i dodawanie (histogram: bisect po granicach kubełków), więc można
+je wywoływać na gorącej ścieżce serwera i pipeline'u. Wartości liczone
+gdzie indziej (np. trafienia cache) dostarcza CallbackMetric przy odczycie.
+
+Metryki rejestrowane w module (REGISTRY):
+- http_requests_total, http_request_duration_seconds, http_response_bytes_total
+  - ruch serwera (src/server.py),
+- report_stage_duration_seconds{stage} - etapy load, validate, analyze,
+  charts, render (FPHoldingAnalyzer, ReportGenerator),
+- cache_lookups_total{cache,result}, cache_hit_ratio{cache} - cache
+  zgłoszone przez register_cache().
+"""
+import bisect
+import contextlib
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from . import tracing
+
+# Etapy pipeline'u raportu w kolejności wykonania
+STAGES = ('load', 'validate', 'analyze', 'charts', 'render')
+# Granice kubełków czasu (sekundy) - od pojedynczych ms (304, pliki) do sekund (render raportu)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: Tuple = ()) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{value}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    """Wspólne dla metryk z etykietami: potomek na każdą kombinację wartości etykiet"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values, **labels):
+        """Potomek dla wartości etykiet (pozycyjnie albo po nazwie)"""
+        if labels:
+            values = tuple(labels[name] for name in self.labelnames)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name}: oczekiwano etykiet {self.labelnames}, podano {values}")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self):
+        """(sufiks nazwy, wartości etykiet, dodatkowe etykiety, wartość) wszystkich potomków"""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for suffix, values, extra, value in self.samples():
+            lines.append(f'{self.name}{suffix}{_labels(self.labelnames, values, extra)} {_format_value(value)}')
+        return '\n'.join(lines)
+
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Licznik rosnący: requests.labels(method='GET').inc()"""
+
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        """Licznik bez etykiet"""
+        self.labels().inc(amount)
+
+    def samples(self):
+        for values, child in sorted(self._children.items()):
+            yield '', values, (), child.value
+
+
+class _HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum', '_lock')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextlib.contextmanager
+    def time(self):
+        """Mierzy czas bloku with (działa też jako dekorator)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+
+class Histogram(_Metric):
+    """Histogram z kubełkami skumulowanymi (le) oraz _sum i _count"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        """Histogram bez etykiet"""
+        self.labels().observe(value)
+
+    def totals(self) -> Dict[tuple, Tuple[int, float]]:
+        """{wartości etykiet: (liczba obserwacji, suma)}"""
+        totals = {}
+        for values, child in list(self._children.items()):
+            with child._lock:
+                totals[values] = (sum(child.counts), child.sum)
+        return totals
+
+    def samples(self):
+        for values, child in sorted(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield '_bucket', values, (('le', _format_value(float(bound))),), cumulative
+            yield '_sum', values, (), total
+            yield '_count', values, (), cumulative
+
+
+class CallbackMetric(_Metric):
+    """
+    Wartości odczytywane przy każdym scrape: callback() -> {wartości etykiet: liczba}.
+
+    Dla liczników prowadzonych gdzie indziej (kind='counter') i bieżących stanów (gauge).
+    """
+
+    def __init__(self, name, documentation, callback: Callable[[], Dict[tuple, float]], labelnames=(),
+                 kind='gauge'):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self.kind = kind
+
+    def samples(self):
+        for values, value in sorted(self.callback().items()):
+            yield '', values, (), value
+
+
+class Registry:
+    """Zbiór metryk renderowany razem do formatu tekstowego Prometheusa"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Rejestruje metrykę; ponowna rejestracja tej samej nazwy zastępuje poprzednią"""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str):
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    'http_requests_total', 'Obsłużone żądania HTTP', ('method', 'handler', 'status')))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    'http_request_duration_seconds', 'Czas obsługi żądania HTTP (od linii żądania do końca odpowiedzi)',
+    ('handler',)))
+HTTP_BYTES = REGISTRY.register(Counter(
+    'http_response_bytes_total', 'Bajty treści odpowiedzi HTTP (bez nagłówków)', ('handler',)))
+STAGE_DURATION = REGISTRY.register(Histogram(
+    'report_stage_duration_seconds', 'Czas etapów pipeline raportu (load, validate, analyze, charts, render)',
+    ('stage',), buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)))
+
+
+# Cache zgłoszone przez register_cache: {nazwa: funkcja zwracająca (hits, misses)}
+_CACHES: Dict[str, Callable[[], Tuple[int, int]]] = {}
+
+
+def _cache_lookups():
+    samples = {}
+    for name, stats in list(_CACHES.items()):
+        hits, misses = stats()
+        samples[(name, 'hit')] = hits
+        samples[(name, 'miss')] = misses
+    return samples
+
+
+def _cache_hit_ratio():
+    samples = {}
+    for name, stats in list(_CACHES.items()):
+        hits, misses = stats()
+        samples[(name,)] = hits / (hits + misses) if hits + misses else 0.0
+    return samples
+
+
+REGISTRY.register(CallbackMetric(
+    'cache_lookups_total', 'Odczyty cache według wyniku (hit/miss)', _cache_lookups, ('cache', 'result'),
+    kind='counter'))
+REGISTRY.register(CallbackMetric(
+    'cache_hit_ratio', 'Udział trafień w odczytach cache', _cache_hit_ratio, ('cache',)))
+
+
+@contextlib.contextmanager
+def stage(name: str):
+    """Mierzy etap pipeline raportu: with metrics.stage('analyze'): ... albo @metrics.stage('analyze')
+
+    Etap jest też spanem tracera (src/tracing.py), gdy śledzenie jest włączone.
+    """
+    with tracing.span(name, 'stage'), STAGE_DURATION.labels(name).time():
+        yield
+
+
+def register_cache(name: str, stats: Callable[[], Tuple[int, int]]):
+    """Dołącza cache `name` do cache_lookups_total i cache_hit_ratio; stats() -> (hits, misses)"""
+    _CACHES[name] = stats
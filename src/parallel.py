@@ -0,0 +1,81 @@
+"""
+Równoległe budowanie wykresów w puli wątków lub procesów
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+from . import tracing
+
+
+def _timed_call(builder: Callable, name: str = None):
+    """Wywołuje builder (span 'chart' tracera) i zwraca (wynik, czas w sekundach)"""
+    with tracing.span(name or getattr(builder, '__name__', 'builder'), 'chart'):
+        start = time.perf_counter()
+        result = builder()
+        return result, time.perf_counter() - start
+
+
+class DeferredResult:
+    """
+    Wynik buildera, na który czekamy dopiero przy pierwszym użyciu.
+
+    str() zwraca wynik, więc obiekt można przekazać wprost do szablonu
+    Jinja2 - renderowanie strumieniowe zatrzyma się na nim tylko wtedy,
+    gdy wykres nie jest jeszcze gotowy.
+    """
+
+    def __init__(self, builder: Callable = None, future=None, name: str = None):
+        self._builder = builder
+        self._name = name
+        self._future = future
+        self._value = None
+        self.elapsed = None
+
+    def result(self):
+        if self.elapsed is None:
+            if self._future is not None:
+                self._value, self.elapsed = self._future.result()
+            else:
+                self._value, self.elapsed = _timed_call(self._builder, self._name)
+            self._builder = self._future = None
+        return self._value
+
+    def __str__(self):
+        return str(self.result())
+
+
+@contextmanager
+def deferred_builders(builders: Dict[str, Callable], max_workers: Optional[int] = None,
+                      use_processes: bool = False):
+    """
+    Zleca buildery do puli i zwraca słownik DeferredResult (w kolejności kluczy).
+
+    max_workers=1 nie tworzy puli - każdy builder wykonuje się leniwie
+    w bieżącym wątku przy pierwszym odczycie wyniku.
+    """
+    if max_workers == 1 or len(builders) <= 1:
+        yield {name: DeferredResult(builder, name=name) for name, builder in builders.items()}
+        return
+
+    executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_cls(max_workers=max_workers) as pool:
+        yield {name: DeferredResult(future=pool.submit(_timed_call, builder, name))
+               for name, builder in builders.items()}
+
+
+def run_builders(builders: Dict[str, Callable], max_workers: Optional[int] = None,
+                 use_processes: bool = False) -> Tuple[Dict[str, object], Dict[str, float]]:
+    """
+    Uruchamia buildery wykresów współbieżnie.
+
+    Zwraca (wyniki, czasy) - oba słowniki w kolejności kluczy z `builders`,
+    więc wynik jest identyczny niezależnie od liczby workerów.
+    max_workers=1 wykonuje wszystko sekwencyjnie w bieżącym wątku.
+    Przy use_processes=True buildery muszą dać się zserializować (pickle).
+    """
+    with deferred_builders(builders, max_workers, use_processes) as deferred:
+        results = {name: item.result() for name, item in deferred.items()}
+    timings = {name: item.elapsed for name, item in deferred.items()}
+    return results, timings
@@ -0,0 +1,203 @@
+"""
+Renderowanie raportu FP HOLDING na żądanie (endpoint /report serwera).
+
+Raport dla encji i zakresu okresów jest liczony przy pierwszym żądaniu
+(FPHoldingAnalyzer -> ReportGenerator) i trzymany w pamięci w cache LRU
+ograniczonym rozmiarem w bajtach. Klucz zawiera odcisk pliku wejściowego
+(rozmiar, mtime), więc nowa wersja arkusza unieważnia stare wpisy.
+Równoczesne identyczne żądania czekają na jeden render (single-flight).
+
+Ta sama usługa udostępnia słownik analizy jako JSON (/api/analysis) -
+odpowiedzi, także z projekcją pól i gzip, są w tym samym cache.
+"""
+import gzip
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+from . import jsonapi
+from .fp_holding_analyzer import FPHoldingAnalyzer
+from .report_generator import ReportGenerator
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def input_fingerprint(path) -> str:
+    """Odcisk pliku wejściowego - zmienia się przy każdym zapisie arkusza"""
+    stat = os.stat(path)
+    return f'{stat.st_size:x}-{stat.st_mtime_ns:x}'
+
+
+def parse_period(value: Optional[str]) -> Optional[str]:
+    """'2024-10' / '2024-10-01' -> '2024-10-01'; None i '' -> None; zły format to ValueError"""
+    if not value:
+        return None
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+def run_analysis(excel_path, start=None, end=None) -> FPHoldingAnalyzer:
+    """Analiza arkusza dla zakresu okresów (bez wykresów)"""
+    analyzer = FPHoldingAnalyzer(str(excel_path))
+    analyzer.load_and_clean().slice_period(start, end)
+    return analyzer.validate().analyze().find_savings().create_recovery_plan()
+
+
+def render_report(excel_path, start=None, end=None, max_workers=None) -> str:
+    """Pełny pipeline raportu dla zakresu okresów: analiza + HTML (jako str)"""
+    analyzer = run_analysis(excel_path, start, end)
+
+    html = io.StringIO()
+    ReportGenerator(analyzer, max_workers=max_workers, fast_figures=True).stream_html(html)
+    return html.getvalue()
+
+
+class LRUCache:
+    """Cache LRU ograniczony sumą rozmiarów wartości (bytes) - bezpieczny dla wątków"""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, record: bool = True):
+        """Wartość dla klucza albo None; record=False nie liczy trafienia/chybienia"""
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += record
+                return None
+            self._items.move_to_end(key)
+            self.hits += record
+            return value
+
+    def put(self, key, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._items[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class SingleFlight:
+    """Jedno wykonanie funkcji na klucz naraz - pozostali wywołujący dostają ten sam wynik"""
+
+    def __init__(self):
+        self._calls: Dict[object, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn: Callable):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+
+class ReportService:
+    """
+    Raporty na żądanie dla zarejestrowanych encji.
+
+    sources: {encja: ścieżka do arkusza kosztowego}. Przy jednej encji
+    parametr entity można pominąć.
+    """
+
+    def __init__(self, sources: Dict[str, str], cache_bytes: int = DEFAULT_CACHE_BYTES,
+                 renderer: Callable = render_report, analyzer: Callable = run_analysis):
+        self.sources = dict(sources)
+        self.cache = LRUCache(cache_bytes)
+        self.renders = 0
+        self._renders_lock = threading.Lock()
+        self._renderer = renderer
+        self._analyzer = analyzer
+        self._flight = SingleFlight()
+
+    def resolve_entity(self, entity: Optional[str]) -> str:
+        if not entity and len(self.sources) == 1:
+            return next(iter(self.sources))
+        if entity not in self.sources:
+            raise KeyError(f"Nieznana encja: {entity!r} (dostępne: {', '.join(sorted(self.sources))})")
+        return entity
+
+    def _request(self, entity, start, end):
+        """Znormalizowane (encja, ścieżka, odcisk, start, end) żądania"""
+        entity = self.resolve_entity(entity)
+        start, end = parse_period(start), parse_period(end)
+        if start and end and start > end:
+            raise ValueError(f"Początek okresu {start} jest po końcu {end}")
+        path = self.sources[entity]
+        return entity, path, input_fingerprint(path), start, end
+
+    def _cached(self, key, build: Callable) -> bytes:
+        """Wartość z cache albo jeden build() na klucz (single-flight), zapisany w cache"""
+        value = self.cache.get(key)
+        if value is None:
+            value = self._flight.do(key, lambda: self._build(key, build))
+        return value
+
+    def _build(self, key, build):
+        # Ktoś mógł zbudować wartość między sprawdzeniem cache a wejściem tutaj
+        value = self.cache.get(key, record=False)
+        if value is None:
+            value = build()
+            self.cache.put(key, value)
+        return value
+
+    def report(self, entity: Optional[str] = None, start: Optional[str] = None,
+               end: Optional[str] = None) -> bytes:
+        """HTML raportu (UTF-8) - z cache albo świeżo wyrenderowany"""
+        entity, path, fingerprint, start, end = self._request(entity, start, end)
+
+        def render():
+            with self._renders_lock:
+                self.renders += 1
+            return self._renderer(path, start, end).encode('utf-8')
+        return self._cached(('report', entity, fingerprint, start, end), render)
+
+    def analysis_json(self, entity: Optional[str] = None, start: Optional[str] = None,
+                      end: Optional[str] = None, fields: Optional[tuple] = None,
+                      compress: bool = False) -> bytes:
+        """
+        Słownik analizy jako JSON (opcjonalnie tylko `fields` i/lub gzip).
+        
+        Pełny JSON analizy i każda odpowiedź (pola, kodowanie) są w cache
+        do zmiany arkusza - nowy odcisk pliku daje nowe klucze.
+        """
+        entity, path, fingerprint, start, end = self._request(entity, start, end)
+        base_key = ('analysis', entity, fingerprint, start, end)
+        full = self._cached(base_key, lambda: jsonapi.dumps(self._analyzer(path, start, end).analysis))
+        if not fields and not compress:
+            return full
+
+        def encode():
+            body = jsonapi.dumps(jsonapi.project(jsonapi.loads(full), fields)) if fields else full
+            return gzip.compress(body, compresslevel=6, mtime=0) if compress else body
+        return self._cached(base_key + (fields, compress), encode)
@@ -0,0 +1,217 @@
+"""
+Próbkujący profiler stosów wywołań z wyjściem w formacie collapsed stacks.
+
+Wątek tła co `interval` sekund odczytuje stosy wszystkich wątków
+(sys._current_frames) i dopisuje każdemu stosowi czas CPU, który jego wątek zużył od
+poprzedniej próbki - czekające workery puli i wątek główny śpiący
+w job.wait() nie zaśmiecają profilu.
+
+Próbkowanie sygnałem (SIGPROF) nie nadaje się tutaj: handler sygnału
+Pythona wykonuje się tylko w wątku głównym, a ten podczas raportu czeka
+na zadanie z kolejki (src/jobs.py) - próbki przychodziłyby dopiero po nim.
+
+Narzut to jeden odczyt stosów na próbkę (domyślnie co 5 ms), więc profil
+obejmuje pełny przebieg - w przeciwieństwie do cProfile nie spowalnia
+drobnych wywołań (walidatory Plotly, serializacja JSON).
+
+Wynik to linie 'wątek;ramka;ramka;... µs CPU' - wejście flamegraph.pl,
+speedscope (https://www.speedscope.app) czy inferno:
+
+    profiler = SamplingProfiler().start()
+    ...
+    profiler.stop().write('profil.folded')
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from .atomic import atomic_open
+
+DEFAULT_INTERVAL = 0.005
+# Funkcje, które na szczycie stosu oznaczają czekanie (wątek zablokowany w wywołaniu C) -
+# CPU zużyte przed zablokowaniem nie jest im przypisywane
+IDLE_FRAMES = frozenset({
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('thread.py', '_worker'),
+    ('queue.py', 'get'),
+    ('selectors.py', 'select'),
+    ('socket.py', 'accept'),
+    ('socketserver.py', 'serve_forever'),
+})
+_THIS_FILE = os.path.normcase(os.path.abspath(__file__))
+
+
+def _path_roots():
+    """Katalogi sys.path od najdłuższego - ścieżki plików skracamy do nazw modułów"""
+    roots = {os.path.normcase(os.path.abspath(entry)) for entry in sys.path if entry}
+    return sorted(roots, key=len, reverse=True)
+
+
+def _cpu_clock(ident):
+    """Zegar CPU wątku (Linux, macOS); None, gdy niedostępny"""
+    try:
+        return time.pthread_getcpuclockid(ident)
+    except (AttributeError, OSError, OverflowError):
+        return None
+
+
+class SamplingProfiler:
+    """
+    Zbiera próbki stosów wszystkich wątków; stacks to Counter krotek ramek
+    z łącznym czasem CPU w mikrosekundach. idle=True zostawia też stosy
+    wątków czekających (IDLE_FRAMES na szczycie).
+
+    Ramka to 'funkcja (moduł/plik.py:linia def)' - wywołania tej samej
+    funkcji z różnych linii sklejają się w jedną ramkę płomienia.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, thread_names: bool = True, idle: bool = False):
+        self.interval = interval
+        self.thread_names = thread_names
+        self.idle = idle
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._last_sample = None
+        self.started = None
+        self.elapsed = 0.0
+        self._labels: Dict[object, str] = {}
+        self._roots = _path_roots()
+        self._cpu: Dict[int, Tuple[Optional[int], Optional[float]]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Zaczyna próbkowanie w wątku tła"""
+        self.started = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run_sampler, name='profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.elapsed = time.perf_counter() - self.started
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _run_sampler(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(skip=me)
+
+    def _label(self, code) -> str:
+        """Nazwa ramki; pusta dla ramek samego profilera"""
+        label = self._labels.get(code)
+        if label is None:
+            filename = os.path.normcase(os.path.abspath(code.co_filename))
+            if filename == _THIS_FILE:
+                self._labels[code] = ''
+                return ''
+            for root in self._roots:
+                if filename.startswith(root + os.sep):
+                    filename = filename[len(root) + 1:]
+                    break
+            label = f"{code.co_name} ({filename.replace(os.sep, '/')}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    @staticmethod
+    def _is_idle(code) -> bool:
+        return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+
+    def _cpu_delta(self, ident, wall_delta) -> float:
+        """
+        Czas CPU wątku (s) od poprzedniej próbki - waga próbki.
+
+        Nowy wątek dostaje wagę dopiero od drugiego odczytu; bez zegara CPU
+        wątku (np. Windows) wagą jest czas ścienny między próbkami.
+        """
+        clock, last = self._cpu.get(ident) or (_cpu_clock(ident), None)
+        if clock is None:
+            self._cpu[ident] = (None, None)
+            return wall_delta
+        try:
+            now = time.clock_gettime(clock)
+        except OSError:
+            return wall_delta
+        self._cpu[ident] = (clock, now)
+        return 0.0 if last is None else now - last
+
+    def sample(self, skip=None):
+        """Jedna próbka stosów wszystkich wątków (poza `skip`), ważona czasem CPU w µs"""
+        now = time.perf_counter()
+        wall_delta, self._last_sample = now - (self._last_sample or now), now
+        names = {thread.ident: thread.name for thread in threading.enumerate()} if self.thread_names else {}
+        for ident, frame in sys._current_frames().items():
+            if ident == skip:
+                continue
+            weight = round(self._cpu_delta(ident, wall_delta) * 1e6)
+            if weight <= 0 or (not self.idle and self._is_idle(frame.f_code)):
+                continue
+            stack: List[str] = []
+            while frame is not None:
+                label = self._label(frame.f_code)
+                if label:
+                    stack.append(label)
+                frame = frame.f_back
+            if not stack:
+                continue
+            if self.thread_names:
+                stack.append(f"thread {names.get(ident, ident)}")
+            stack.reverse()
+            self.stacks[tuple(stack)] += weight
+        self.samples += 1
+
+    def collapsed(self) -> List[str]:
+        """Linie collapsed stacks ('a;b;c µs'), posortowane dla stabilnego diffu"""
+        return [f"{';'.join(frame.replace(';', ':') for frame in stack)} {count}"
+                for stack, count in sorted(self.stacks.items())]
+
+    def write(self, path):
+        """Zapisuje collapsed stacks (atomowo)"""
+        with atomic_open(path) as f:
+            for line in self.collapsed():
+                f.write(line + '\n')
+        return path
+
+    def top(self, limit: int = 15, inclusive: bool = False) -> List[Tuple[str, int, float]]:
+        """
+        Funkcje z największym czasem CPU: (ramka, µs, udział).
+
+        inclusive=False liczy stosy, na których szczycie jest funkcja (czas własny),
+        inclusive=True - stosy, w których jest gdziekolwiek.
+        """
+        counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = [frame for frame in stack if not frame.startswith('thread ')]
+            if not frames:
+                continue
+            if inclusive:
+                for frame in set(frames):
+                    counts[frame] += count
+            else:
+                counts[frames[-1]] += count
+        total = sum(self.stacks.values()) or 1
+        return [(frame, count, count / total) for frame, count in counts.most_common(limit)]
+
+    def print_summary(self, limit: int = 15, file=None):
+        cpu = sum(self.stacks.values()) / 1e6
+        print(f"🔬 Próbki: {self.samples} co {self.interval * 1000:g} ms, CPU {cpu:.2f} s w {self.elapsed:.2f} s",
+              file=file)
+        for title, inclusive in (('czas własny', False), ('razem z wywołanymi', True)):
+            print(f"  {title}:", file=file)
+            for frame, micros, share in self.top(limit, inclusive):
+                print(f"  {share * 100:6.1f}% {micros / 1000:>9.1f} ms  {frame}", file=file)
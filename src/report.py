@@ -1,19 +1,21 @@
 """Generowanie raportu HTML przy użyciu Jinja2"""
-from jinja2 import Environment, FileSystemLoader, select_autoescape
 from pathlib import Path
 
+from .atomic import atomic_open
+from .compression import precompress
+from .templating import get_environment
+
 
 def generate_report(summary: dict, output_path: str, template_dir: str = None):
     output_path = Path(output_path)
-    template_dir = Path(template_dir) if template_dir else Path(__file__).resolve().parents[1] / 'reports' / 'templates'
 
-    env = Environment(
-        loader=FileSystemLoader(str(template_dir)),
-        autoescape=select_autoescape(['html', 'xml'])
-    )
+    # Środowisko (z cache szablonów) jest współdzielone w obrębie procesu
+    env = get_environment(template_dir)
     template = env.get_template('report.html.j2')
     rendered = template.render(summary=summary)
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(rendered, encoding='utf-8')
+    with atomic_open(output_path) as f:
+        f.write(rendered)
+    precompress(output_path)
     return str(output_path)
@@ -0,0 +1,62 @@
+"""
+Wspólny, kolumnowy zbiór danych raportu.
+
+Te same kolumny (okresy, przychody, koszty, wynik, ZUS) trafiały dotąd do
+JSON-a każdego wykresu osobno. Raport osadza je teraz raz, w bloku
+<script type="application/json" id="report-data">, a specyfikacje wykresów
+odwołują się do kolumn przez {"$col": "nazwa"} - rozwija je skrypt
+w przeglądarce tuż przed Plotly.newPlot.
+"""
+import json
+import math
+from typing import Dict, Iterable
+
+
+def _json_safe(values):
+    # NaN nie jest poprawnym JSON-em - w przeglądarce ma być null (jak w to_json plotly)
+    return [None if isinstance(value, float) and math.isnan(value) else value for value in values]
+
+
+def build_dataset(df, columns: Iterable[str], kpi: dict = None) -> dict:
+    """Zbiór danych raportu: {'columns': {nazwa: lista}, 'kpi': {...}}"""
+    return {
+        'columns': {name: _json_safe(df[name].tolist()) for name in columns},
+        'kpi': kpi or {},
+    }
+
+
+def column_refs(dataset: dict) -> Dict[tuple, dict]:
+    """Słownik wartości kolumny -> odwołanie {'$col': nazwa} do podmiany w wykresach"""
+    return {tuple(values): {'$col': name} for name, values in dataset['columns'].items()}
+
+
+def _replace(node, refs, length):
+    if isinstance(node, list):
+        if len(node) == length:
+            try:
+                ref = refs.get(tuple(node))
+            except TypeError:
+                ref = None
+            if ref is not None:
+                return ref
+        return [_replace(item, refs, length) for item in node]
+    if isinstance(node, dict):
+        return {key: _replace(value, refs, length) for key, value in node.items()}
+    return node
+
+
+def with_column_refs(figure: dict, refs: Dict[tuple, dict]) -> dict:
+    """
+    Kopia słownika figury, w której tablice śladów równe kolumnie zbioru
+    danych są zastąpione odwołaniem {'$col': nazwa}. Układ (layout) zostaje
+    bez zmian.
+    """
+    if not refs:
+        return figure
+    length = len(next(iter(refs)))
+    return dict(figure, data=[_replace(trace, refs, length) for trace in figure.get('data', [])])
+
+
+def dataset_json(dataset: dict) -> str:
+    """JSON zbioru danych bezpieczny do osadzenia w <script> (bez '</')"""
+    return json.dumps(dataset, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
@@ -0,0 +1,240 @@
+"""
+Kostka agregatów (dzień → tydzień ISO → miesiąc → kwartał) × encja.
+
+Dla każdej miary i komórki (encja, ziarno, okres) trzymamy sumę, liczbę
+wierszy, minimum i maksimum - wszystkie cztery składają się dalej, więc
+tydzień, miesiąc i kwartał liczymy z komórek dziennych, a nie z surowych
+wierszy. Nowe dni (add) albo podmieniony zakres dni (replace) przeliczają
+tylko kubełki, których dotyczą.
+
+query(encja, ziarno, od, do) czyta komórki ziarna, o które pyta wykres:
+szereg miesięczny to komórki miesięcy, pięć lat dni to ~1800 komórek
+zamiast milionów wierszy. Zapis (save) przepisuje tylko tabele encji,
+których dane się zmieniły.
+
+    cube = RollupCube(['amount'])
+    cube.add('k1', df_daily['date'], df_daily[['amount']])
+    cube.query('k1', 'month', '2021-01', '2025-12')['amount_mean']
+    cube.save('reports/kolumny/_rollup/daily', ['k1'])
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .columnar import ColumnarTable, date_bounds, table_exists, write_table
+
+GRAINS = ('day', 'week', 'month', 'quarter')
+STATS = ('sum', 'count', 'min', 'max')
+# Jak składać statystykę komórek drobniejszego ziarna
+_COMBINE = {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+
+
+def bucket_start(dates, grain: str) -> pd.DatetimeIndex:
+    """Początek kubełka każdej daty: dzień, poniedziałek tygodnia ISO, 1. dzień miesiąca lub kwartału"""
+    days = pd.DatetimeIndex(dates).normalize()
+    if grain == 'day':
+        return days
+    if grain == 'week':
+        return days - pd.to_timedelta(days.dayofweek, unit='D')
+    if grain == 'month':
+        return days.to_period('M').to_timestamp()
+    if grain == 'quarter':
+        return days.to_period('Q').to_timestamp()
+    raise ValueError(f"Nieznane ziarno: {grain!r} (dostępne: {', '.join(GRAINS)})")
+
+
+def bucket_of(date, grain: str) -> pd.Timestamp:
+    """bucket_start dla jednej daty (granice zapytań - bez tworzenia indeksów)"""
+    day = pd.Timestamp(date).normalize()
+    if grain == 'day':
+        return day
+    if grain == 'week':
+        return day - pd.Timedelta(days=day.dayofweek)
+    if grain == 'month':
+        return day.replace(day=1)
+    if grain == 'quarter':
+        return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+    raise ValueError(f"Nieznane ziarno: {grain!r} (dostępne: {', '.join(GRAINS)})")
+
+
+def next_bucket(start: pd.Timestamp, grain: str) -> pd.Timestamp:
+    """Początek kubełka następnego po kubełku zaczynającym się w `start`"""
+    step = {'day': pd.Timedelta(days=1), 'week': pd.Timedelta(days=7),
+            'month': pd.offsets.MonthBegin(1), 'quarter': pd.offsets.QuarterBegin(1, startingMonth=1)}[grain]
+    return start + step
+
+
+def period_label(period: pd.Timestamp, grain: str) -> str:
+    """'2025-09-15', '2025-W38', '2025-09', '2025-Q3'"""
+    if grain == 'week':
+        year, week, _ = period.isocalendar()
+        return f'{year}-W{week:02d}'
+    if grain == 'month':
+        return period.strftime('%Y-%m')
+    if grain == 'quarter':
+        return f'{period.year}-Q{period.quarter}'
+    return period.strftime('%Y-%m-%d')
+
+
+def _combine(cells: pd.DataFrame, keys) -> pd.DataFrame:
+    """Składa komórki w kubełki `keys` (suma sum i liczności, min minimów, max maksimów)"""
+    ops = {column: _COMBINE[column.rsplit('_', 1)[1]] for column in cells.columns}
+    return cells.groupby(keys, sort=True).agg(ops)
+
+
+class RollupCube:
+    """
+    Kostka agregatów miar `measures` dla wielu encji; komórki ziarna to
+    DataFrame indeksowany początkiem kubełka, kolumny '<miara>_<statystyka>'.
+    """
+
+    def __init__(self, measures: Sequence[str]):
+        self.measures = tuple(measures)
+        self.columns = [f'{measure}_{stat}' for measure in self.measures for stat in STATS]
+        self._cells: Dict[Tuple[str, str], pd.DataFrame] = {}
+
+    @classmethod
+    def from_frame(cls, entity: str, df: pd.DataFrame, date_column: str, measures: Sequence[str]):
+        cube = cls(measures)
+        cube.add(entity, df[date_column], df[list(measures)])
+        return cube
+
+    def entities(self) -> List[str]:
+        return sorted({entity for entity, grain in self._cells if grain == 'day'})
+
+    def cells(self, entity: str, grain: str) -> pd.DataFrame:
+        """Komórki ziarna (kopia nie jest robiona - nie modyfikować)"""
+        if grain not in GRAINS:
+            raise ValueError(f"Nieznane ziarno: {grain!r} (dostępne: {', '.join(GRAINS)})")
+        cells = self._cells.get((entity, grain))
+        if cells is None:
+            return pd.DataFrame(columns=self.columns, index=pd.DatetimeIndex([], name='period'))
+        return cells
+
+    # --- aktualizacja ---
+
+    def add(self, entity: str, dates, values) -> int:
+        """Dopisuje wiersze (np. nowe dni albo paragony) - agregaty dotkniętych kubełków rosną"""
+        return self._update(entity, dates, values, replace=False)
+
+    def replace(self, entity: str, dates, values, start=None, end=None) -> int:
+        """
+        Podmienia dni z zakresu dat partii (ponowny import) i przelicza dotknięte
+        kubełki; start/end poszerzają podmieniany zakres - dni bez nowych wierszy znikają.
+        """
+        return self._update(entity, dates, values, replace=True, bounds=(start, end))
+
+    def _update(self, entity, dates, values, replace, bounds=(None, None)) -> int:
+        frame = pd.DataFrame(values).reset_index(drop=True)[list(self.measures)].astype('float64')
+        dates = pd.to_datetime(pd.Series(dates).reset_index(drop=True), errors='coerce')
+        frame = frame[dates.notna().to_numpy()]
+        dates = dates.dropna()
+        edges = [pd.Timestamp(bound).normalize() for bound in bounds if bound is not None]
+        if frame.empty and not edges:
+            return 0
+
+        delta = frame.groupby(bucket_start(dates, 'day').rename('period'), sort=True).agg(list(STATS))
+        delta.columns = [f'{measure}_{stat}' for measure, stat in delta.columns]
+        delta = delta[self.columns]
+        lo, hi = min([*delta.index[:1], *edges]), max([*delta.index[-1:], *edges])
+
+        day = self._cells.get((entity, 'day'))
+        if day is not None:
+            if replace:
+                day = day[(day.index < lo) | (day.index > hi)]
+            merged = pd.concat([day, delta])
+            delta = _combine(merged, merged.index)
+        delta.index.name = 'period'
+        self._cells[(entity, 'day')] = delta
+        for grain in GRAINS[1:]:
+            self._rollup(entity, grain, lo, hi)
+        return len(frame)
+
+    def _rollup(self, entity, grain, lo, hi):
+        """Przelicza z komórek dziennych kubełki ziarna pokrywające dni lo..hi"""
+        first = bucket_of(lo, grain)
+        stop = next_bucket(bucket_of(hi, grain), grain)
+        day = self._cells[(entity, 'day')]
+        touched = day[(day.index >= first) & (day.index < stop)]
+        rolled = _combine(touched, bucket_start(touched.index, grain).rename('period'))
+        cells = self._cells.get((entity, grain))
+        if cells is not None:
+            rolled = pd.concat([cells[(cells.index < first) | (cells.index >= stop)], rolled]).sort_index()
+        self._cells[(entity, grain)] = rolled
+
+    # --- zapytania ---
+
+    def query(self, entity: str, grain: str, start=None, end=None, clip: bool = False) -> pd.DataFrame:
+        """
+        Komórki ziarna, których kubełek zachodzi na zakres dat, z kolumną
+        period, label i '<miara>_mean'. Brzegowe kubełki są całe, chyba że
+        clip=True - wtedy liczymy je z komórek dziennych samego zakresu.
+        """
+        cells = self.cells(entity, grain)
+        lower, upper = date_bounds(start, end)
+        if lower is not None:
+            cells = cells[cells.index >= bucket_of(lower, grain)]
+        if upper is not None:
+            cells = cells[cells.index < upper]
+        if clip and grain != 'day' and len(cells):
+            cells = self._clip(entity, grain, cells, lower, upper)
+        result = cells.reset_index()
+        result.insert(1, 'label', [period_label(period, grain) for period in result['period']])
+        for measure in self.measures:
+            count = result[f'{measure}_count']
+            result[f'{measure}_mean'] = result[f'{measure}_sum'] / count.where(count > 0)
+        return result
+
+    def _clip(self, entity, grain, cells, lower, upper) -> pd.DataFrame:
+        """Pierwszy i ostatni kubełek wystający poza [lower, upper) przeliczone z dni zakresu"""
+        lower = None if lower is None else pd.Timestamp(lower)
+        upper = None if upper is None else pd.Timestamp(upper)
+        partial = [period for period in cells.index[[0, -1]].unique()
+                   if (lower is not None and period < lower)
+                   or (upper is not None and next_bucket(period, grain) > upper)]
+        if not partial:
+            return cells
+        day = self.cells(entity, 'day')
+        day = day[bucket_start(day.index, grain).isin(partial)]
+        if lower is not None:
+            day = day[day.index >= lower]
+        if upper is not None:
+            day = day[day.index < upper]
+        rolled = _combine(day, bucket_start(day.index, grain).rename('period'))
+        return pd.concat([cells.drop(partial), rolled]).sort_index()
+
+    # --- zapis ---
+
+    def save(self, directory, entities: Optional[Sequence[str]] = None):
+        """
+        Ziarna encji jako tabele kolumnowe (src/columnar.py) <katalog>/<encja>/<ziarno>:
+        date = początek kubełka i statystyki. entities - tylko te encje (zmienione
+        importem), domyślnie wszystkie; tabel pozostałych encji zapis nie dotyka.
+        """
+        directory = Path(directory)
+        for entity in self.entities() if entities is None else entities:
+            for grain in GRAINS:
+                cells = self.cells(entity, grain)
+                columns = {'date': cells.index.to_numpy()}
+                columns.update({column: cells[column].to_numpy(dtype='int64' if column.endswith('_count')
+                                                               else 'float64') for column in self.columns})
+                write_table(directory / entity / grain, columns)
+        return directory
+
+    @classmethod
+    def open(cls, directory, measures: Sequence[str]):
+        """Kostka zapisana przez save(); pusta, gdy katalog nie istnieje"""
+        cube = cls(measures)
+        directory = Path(directory)
+        entities = sorted(path for path in directory.iterdir() if path.is_dir()) if directory.exists() else []
+        for path in entities:
+            for grain in GRAINS:
+                if not table_exists(path / grain):
+                    continue
+                frame = ColumnarTable(path / grain).slice().to_frame()
+                if frame.empty:
+                    continue
+                frame = frame.set_index(pd.DatetimeIndex(frame.pop('date'), name='period'))
+                cube._cells[(path.name, grain)] = frame[cube.columns]
+        return cube
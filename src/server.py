@@ -0,0 +1,654 @@
+"""
+Wielowątkowy serwer HTTP/1.1 dla raportów HTML.
+
+Zastępuje socketserver.TCPServer + SimpleHTTPRequestHandler (jedno
+połączenie naraz, HTTP/1.0). Żądania obsługuje pula wątków o zadanym
+rozmiarze, a klient może wysłać wiele żądań jednym połączeniem (keep-alive).
+Bezczynne połączenia (nowe przed pierwszym żądaniem i keep-alive między
+żądaniami) czekają w selektorze jednego wątku, nie w wątkach puli - worker
+dostaje gniazdo dopiero, gdy są na nim dane. Kilka kart przeglądarki
+(~6 połączeń każda) nie zajmuje więc puli; bezczynne połączenie jest
+zamykane po KEEP_ALIVE_TIMEOUT. Zamknięcie serwera czeka na żądania w toku
+i zamyka bezczynne połączenia.
+
+Pliki dostają silny ETag (skrót treści), Last-Modified i Cache-Control;
+żądania warunkowe kończą się 304. Jeśli obok pliku leży aktualny wariant
+.br/.gz (src/compression.py), a klient go akceptuje, wysyłamy wariant.
+Treść idzie do gniazda przez socket.sendfile (bez kopiowania w Pythonie).
+Każde żądanie trafia do liczników src/metrics.py (endpoint /metrics).
+"""
+import email.utils
+import hashlib
+import http.server
+import os
+import selectors
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from urllib.parse import parse_qs
+
+from . import metrics
+from .compression import ENCODINGS
+from .jsonapi import dumps, parse_fields
+
+DEFAULT_PORT = 8000
+DEFAULT_WORKERS = 16
+# Po tylu sekundach bezczynności (w selektorze, bez workera) połączenie keep-alive jest zamykane
+KEEP_ALIVE_TIMEOUT = 15
+# Limit czekania workera na resztę rozpoczętego żądania (wolny klient)
+REQUEST_TIMEOUT = 5
+# Kolejka listen() - domyślne 5 z socketserver gubi SYN przy wielu kartach łączących się naraz
+LISTEN_BACKLOG = 128
+
+
+@lru_cache(maxsize=1024)
+def _file_etag(path, size, mtime_ns):
+    """Silny ETag z treści pliku - liczony raz na wersję pliku (rozmiar, mtime)"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return f'"{digest.hexdigest()}"'
+
+
+metrics.register_cache('file_etag', lambda: _file_etag.cache_info()[:2])
+
+
+def _accepted_encodings(header):
+    """Kodowania z Accept-Encoding z q > 0"""
+    accepted = set()
+    for item in (header or '').split(','):
+        coding, _, params = item.strip().partition(';')
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+
+class HTTPError(Exception):
+    """Błąd zwracany klientowi przez endpoint (status + komunikat)"""
+
+    def __init__(self, status, message=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Response:
+    """Odpowiedź endpointu generowanego dynamicznie (nie pliku z dysku)"""
+
+    def __init__(self, body: bytes, status=http.HTTPStatus.OK, content_type='text/html; charset=utf-8',
+                 headers=None):
+        self.body = body
+        self.status = status
+        self.content_type = content_type
+        self.headers = headers or {}
+
+
+class ReportRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """
+    Pliki statyczne z katalogu serwera, HTTP/1.1 z keep-alive.
+
+    Ścieżki z server.routes ({'/report': funkcja(handler, params)}) obsługują
+    endpointy zwracające Response; params to parametry zapytania
+    (ostatnia wartość każdego klucza), przy POST także pola formularza.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    timeout = REQUEST_TIMEOUT
+    # Połączenie czeka na kolejne żądanie w selektorze serwera - finish() nie zamyka strumieni
+    parked = False
+    # Nagłówki i treść idą osobnymi zapisami - z algorytmem Nagle'a i opóźnionym ACK
+    # klienta mała odpowiedź keep-alive czekała ~40 ms (TCP_NODELAY)
+    disable_nagle_algorithm = True
+    # Raporty są regenerowane - przeglądarka zawsze pyta o ważność (zwykle kończy się 304)
+    cache_control = 'no-cache'
+
+    def parse_request(self):
+        # Linia żądania już przeczytana - od tej chwili połączenie jest zajęte
+        self._started = time.perf_counter()
+        self._status = None
+        self._body_bytes = 0
+        self.server.connection_busy(self.connection, True)
+        return super().parse_request()
+
+    def handle(self):
+        """Żądania połączenia po kolei; na kolejne żądanie keep-alive czeka w selektorze serwera, nie w workerze"""
+        self.parked = False
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            if not self._pending() and self.server.can_park():
+                self.parked = True
+                return
+            self.handle_one_request()
+
+    def resume(self):
+        """Kolejne żądania połączenia, które czekało w selektorze (wołane w workerze puli)"""
+        try:
+            self.handle()
+        finally:
+            self.finish()
+        return self
+
+    def finish(self):
+        if not self.parked:
+            super().finish()
+
+    def _pending(self) -> bool:
+        """Czy następne żądanie (pipelining) jest już w buforze albo w gnieździe - bez czekania"""
+        self.connection.setblocking(False)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def handle_one_request(self):
+        self._started = None
+        try:
+            super().handle_one_request()
+        finally:
+            self.server.connection_busy(self.connection, False)
+            if self._started is not None and self._status is not None:
+                self._record_metrics()
+
+    def send_response(self, code, message=None):
+        self._status = int(code)
+        super().send_response(code, message)
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == 'content-length' and self.command != 'HEAD':
+            self._body_bytes = int(value)
+        super().send_header(keyword, value)
+
+    def _record_metrics(self):
+        """Liczniki żądania dla /metrics - etykieta handler to endpoint albo 'static' (pliki)"""
+        path = getattr(self, 'path', '').partition('?')[0]
+        handler = path if path in self.server.routes else 'static'
+        metrics.HTTP_REQUESTS.labels(self.command or '-', handler, self._status).inc()
+        metrics.HTTP_LATENCY.labels(handler).observe(time.perf_counter() - self._started)
+        if self._body_bytes:
+            metrics.HTTP_BYTES.labels(handler).inc(self._body_bytes)
+
+    def _route(self):
+        path, _, query = self.path.partition('?')
+        route = self.server.routes.get(path)
+        if route is None:
+            return None
+        params = {key: values[-1] for key, values in parse_qs(query).items()}
+        if self.command == 'POST':
+            params.update(self._form_params())
+        try:
+            return route(self, params)
+        except HTTPError as e:
+            # Komunikat w treści strony błędu - linia statusu musi być w latin-1
+            self.send_error(e.status, explain=e.message)
+            return False
+        except Exception:
+            # Np. błąd renderowania - klient dostaje 500 zamiast zerwanego połączenia
+            self.server.handle_error(self.request, self.client_address)
+            self.send_error(http.HTTPStatus.INTERNAL_SERVER_ERROR)
+            return False
+
+    def _form_params(self):
+        """Parametry z treści POST (application/x-www-form-urlencoded); inna treść jest pomijana"""
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if self.headers.get_content_type() != 'application/x-www-form-urlencoded':
+            return {}
+        return {key: values[-1] for key, values in parse_qs(body.decode('utf-8')).items()}
+
+    def _send_route_response(self, response, head_only=False):
+        self.send_response(response.status)
+        if response.status != http.HTTPStatus.NOT_MODIFIED:
+            self.send_header('Content-Type', response.content_type)
+            self.send_header('Content-Length', str(len(response.body)))
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(response.body)
+
+    def do_GET(self):
+        response = self._route()
+        if response is None:
+            return super().do_GET()
+        if response:
+            self._send_route_response(response)
+
+    def do_HEAD(self):
+        response = self._route()
+        if response is None:
+            return super().do_HEAD()
+        if response:
+            self._send_route_response(response, head_only=True)
+
+    def do_POST(self):
+        """POST tylko do endpointów (np. /api/jobs); pliki statyczne to 405"""
+        response = self._route()
+        if response is None:
+            # Treść żądania nie została przeczytana - połączenia nie da się użyć ponownie
+            self.close_connection = True
+            self.send_error(http.HTTPStatus.METHOD_NOT_ALLOWED)
+        elif response:
+            self._send_route_response(response)
+
+    def _open_variant(self, path, stat):
+        """Najlepszy akceptowany wariant .br/.gz nie starszy niż oryginał: (kodowanie, plik) lub None"""
+        accepted = _accepted_encodings(self.headers.get('Accept-Encoding'))
+        for coding, suffix in ENCODINGS:
+            if coding not in accepted:
+                continue
+            try:
+                f = open(path + suffix, 'rb')
+            except OSError:
+                continue
+            if os.fstat(f.fileno()).st_mtime_ns >= stat.st_mtime_ns:
+                return coding, f
+            f.close()
+        return None
+
+    def _not_modified(self, etag, mtime):
+        """Czy żądanie warunkowe pasuje do aktualnej wersji (If-None-Match ma pierwszeństwo)"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or etag in tags
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+            return since is not None and int(mtime) <= since.timestamp()
+        return False
+
+    def send_head(self):
+        """Nagłówki pliku z walidatorami i negocjacją kodowania; katalogi obsługuje klasa bazowa"""
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) or self.path.split('?', 1)[0].endswith('/'):
+            return super().send_head()
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            self.send_error(http.HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        try:
+            stat = os.fstat(f.fileno())
+            content_type = self.guess_type(path)
+            encoding = None
+            variant = self._open_variant(path, stat)
+            if variant is not None:
+                f.close()
+                encoding, f = variant
+            body_stat = os.fstat(f.fileno())
+            etag = _file_etag(f.name, body_stat.st_size, body_stat.st_mtime_ns)
+
+            if self._not_modified(etag, stat.st_mtime):
+                f.close()
+                self.send_response(http.HTTPStatus.NOT_MODIFIED)
+                self._send_validators(etag, stat.st_mtime)
+                self.end_headers()
+                return None
+
+            self.send_response(http.HTTPStatus.OK)
+            self.send_header('Content-Type', content_type)
+            if encoding is not None:
+                self.send_header('Content-Encoding', encoding)
+            self.send_header('Content-Length', str(body_stat.st_size))
+            self._send_validators(etag, stat.st_mtime)
+            self.end_headers()
+            return f
+        except Exception:
+            f.close()
+            raise
+
+    def _send_validators(self, etag, mtime):
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.date_time_string(mtime))
+        self.send_header('Cache-Control', self.cache_control)
+        self.send_header('Vary', 'Accept-Encoding')
+
+    def copyfile(self, source, outputfile):
+        """Treść pliku wprost do gniazda (sendfile), bez kopiowania przez bufory Pythona"""
+        try:
+            source.fileno()
+        except (AttributeError, OSError):
+            # Np. BytesIO z listingiem katalogu
+            return super().copyfile(source, outputfile)
+        self.connection.sendfile(source)
+
+
+class PooledHTTPServer(http.server.HTTPServer):
+    """
+    HTTPServer obsługujący żądania w puli `max_workers` wątków.
+
+    Bezczynne połączenia czekają w selektorze wątku 'http-idle' i trafiają
+    do puli, gdy przyjdą dane; żądania ponad limit czekają w kolejce puli
+    (nie są odrzucane). Długie strumienie (SSE) są odłączane przez detach().
+    """
+
+    request_queue_size = LISTEN_BACKLOG
+
+    def __init__(self, server_address, handler_class, max_workers=DEFAULT_WORKERS, routes=None):
+        self.max_workers = max_workers
+        self.routes = dict(routes or {})
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='http')
+        self._connections = {}
+        self._detached = set()
+        self._connections_lock = threading.Lock()
+        self._stopping = False
+        super().__init__(server_address, handler_class)
+        # Bezczynne gniazda: {gniazdo: (termin, resume, close)}; rejestrują je workery,
+        # wątek selektora oddaje je do puli, gdy są dane (epoll pozwala rejestrować w trakcie select)
+        self._selector = selectors.DefaultSelector()
+        self._watched = {}
+        self._wakeup, self._wakeup_signal = socket.socketpair()
+        self._selector.register(self._wakeup, selectors.EVENT_READ)
+        self._idle_thread = threading.Thread(target=self._idle_loop, name='http-idle', daemon=True)
+        self._idle_thread.start()
+
+    def process_request(self, request, client_address):
+        with self._connections_lock:
+            self._connections[request] = False
+        # Przeglądarki otwierają połączenia na zapas - worker dostaje je dopiero z żądaniem
+        self._watch(request, partial(self._process_request_worker, request, client_address),
+                    partial(self._release, request))
+
+    def _process_request_worker(self, request, client_address):
+        self._serve(request, client_address, lambda: self.RequestHandlerClass(request, client_address, self))
+
+    def _resume_worker(self, handler):
+        self._serve(handler.connection, handler.client_address, handler.resume)
+
+    def _serve(self, request, client_address, run):
+        handler = None
+        try:
+            if not self._stopping:
+                handler = run()
+        except Exception:
+            self.handle_error(request, client_address)
+        if handler is not None and handler.parked:
+            if not self._stopping:
+                self._watch(request, partial(self._resume_worker, handler), partial(self._close_parked, handler))
+                return
+            handler.parked = False
+            handler.finish()
+        self._release(request)
+
+    def _release(self, request):
+        with self._connections_lock:
+            self._connections.pop(request, None)
+            detached = request in self._detached
+            self._detached.discard(request)
+        if not detached:
+            self.shutdown_request(request)
+
+    def _close_parked(self, handler):
+        handler.parked = False
+        try:
+            handler.finish()
+        except OSError:
+            pass
+        self._release(handler.connection)
+
+    def can_park(self):
+        """Czy handler może oddać bezczynne połączenie do selektora (nie w trakcie zamykania)"""
+        return not self._stopping
+
+    def _watch(self, request, resume, close):
+        """Gniazdo czeka w selektorze: resume() idzie do puli, gdy są dane, close() po KEEP_ALIVE_TIMEOUT"""
+        with self._connections_lock:
+            try:
+                self._selector.register(request, selectors.EVENT_READ)
+            except (ValueError, OSError):
+                # Gniazdo zamknięte w międzyczasie
+                registered = False
+            else:
+                registered = True
+                self._watched[request] = (time.monotonic() + KEEP_ALIVE_TIMEOUT, resume, close)
+        if not registered:
+            close()
+
+    def _unwatch(self, request):
+        """Zdejmuje gniazdo z selektora; (resume, close) albo None, gdy już zdjęte"""
+        with self._connections_lock:
+            entry = self._watched.pop(request, None)
+            if entry is not None:
+                self._selector.unregister(request)
+        return None if entry is None else entry[1:]
+
+    def _idle_loop(self):
+        """Wątek selektora bezczynnych połączeń"""
+        while not self._stopping:
+            for key, _ in self._selector.select(timeout=1.0):
+                if key.fileobj is self._wakeup:
+                    self._wakeup.recv(4096)
+                    continue
+                entry = self._unwatch(key.fileobj)
+                if entry is None:
+                    continue
+                resume, close = entry
+                try:
+                    self._pool.submit(resume)
+                except RuntimeError:
+                    # Pula już zamknięta
+                    close()
+            now = time.monotonic()
+            with self._connections_lock:
+                expired = [request for request, (deadline, _, _) in self._watched.items() if deadline <= now]
+            for request in expired:
+                entry = self._unwatch(request)
+                if entry is not None:
+                    entry[1]()
+
+    def _close_watched(self):
+        with self._connections_lock:
+            watched = list(self._watched)
+        for request in watched:
+            entry = self._unwatch(request)
+            if entry is not None:
+                entry[1]()
+
+    def detach(self, request):
+        """Gniazdo przejmuje ktoś inny (np. src/events.py) - worker go nie zamknie"""
+        with self._connections_lock:
+            self._detached.add(request)
+
+    def connection_busy(self, request, busy):
+        """Handler zgłasza, czy połączenie obsługuje teraz żądanie, czy czeka na kolejne"""
+        with self._connections_lock:
+            if request in self._connections:
+                self._connections[request] = busy
+        if not busy and self._stopping:
+            # Po odpowiedzi w trakcie zamykania nie czekamy na kolejne żądanie
+            self._close_idle(request)
+
+    @staticmethod
+    def _close_idle(request):
+        try:
+            request.shutdown(socket.SHUT_RD)
+        except OSError:
+            pass
+
+    def server_close(self):
+        """Zamyka gniazdo nasłuchujące, bezczynne połączenia i czeka na żądania w toku"""
+        self._stopping = True
+        super().server_close()
+        self._wakeup_signal.send(b'\0')
+        self._idle_thread.join()
+        self._close_watched()
+        with self._connections_lock:
+            idle = [request for request, busy in self._connections.items() if not busy]
+        for request in idle:
+            self._close_idle(request)
+        self._pool.shutdown(wait=True)
+        # Gniazda oddane do selektora przez kończące się żądania
+        self._close_watched()
+        self._selector.close()
+        self._wakeup.close()
+        self._wakeup_signal.close()
+
+
+def make_server(directory='.', host='', port=DEFAULT_PORT, workers=DEFAULT_WORKERS,
+                handler_class=ReportRequestHandler, routes=None):
+    """Tworzy serwer plików z `directory` na (host, port); port=0 wybiera wolny port"""
+    handler = partial(handler_class, directory=str(directory))
+    return PooledHTTPServer((host, port), handler, max_workers=workers, routes=routes)
+
+
+def _service_call(call, *args):
+    """Wywołanie pipeline.ReportService z mapowaniem błędów na statusy HTTP"""
+    try:
+        return call(*args)
+    except KeyError as e:
+        raise HTTPError(http.HTTPStatus.NOT_FOUND, e.args[0])
+    except ValueError as e:
+        raise HTTPError(http.HTTPStatus.BAD_REQUEST, str(e))
+    except FileNotFoundError as e:
+        # Arkusz encji usunięty lub przeniesiony po starcie serwera
+        raise HTTPError(http.HTTPStatus.NOT_FOUND, f"Brak pliku źródłowego: {e.filename}")
+    except OSError as e:
+        raise HTTPError(http.HTTPStatus.SERVICE_UNAVAILABLE, f"Plik źródłowy niedostępny: {e.filename}")
+
+
+def _validated_response(handler, body, content_type, headers=None):
+    """Response z ETag z treści; pasujący If-None-Match daje 304"""
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    headers = dict(headers or {}, ETag=etag)
+    headers['Cache-Control'] = 'no-cache'
+    if etag in [tag.strip() for tag in handler.headers.get('If-None-Match', '').split(',')]:
+        return Response(b'', http.HTTPStatus.NOT_MODIFIED, headers=headers)
+    return Response(body, content_type=content_type, headers=headers)
+
+
+def report_route(service):
+    """
+    Endpoint /report?entity=...&from=...&to=... dla pipeline.ReportService.
+
+    Raport ma ETag z treści, więc ponowne otwarcie tej samej wersji kończy się 304.
+    """
+    def handle(handler, params):
+        html = _service_call(service.report, params.get('entity'), params.get('from'), params.get('to'))
+        return _validated_response(handler, html, 'text/html; charset=utf-8')
+    return handle
+
+
+def analysis_route(service):
+    """
+    Endpoint /api/analysis?entity=...&from=...&to=...&fields=summary,savings
+
+    JSON słownika analizy; gzip, gdy klient go akceptuje.
+    """
+    def handle(handler, params):
+        fields = parse_fields(params.get('fields'))
+        compress = 'gzip' in _accepted_encodings(handler.headers.get('Accept-Encoding'))
+        body = _service_call(service.analysis_json, params.get('entity'), params.get('from'),
+                             params.get('to'), fields, compress)
+        headers = {'Vary': 'Accept-Encoding'}
+        if compress:
+            headers['Content-Encoding'] = 'gzip'
+        return _validated_response(handler, body, 'application/json', headers)
+    return handle
+
+
+def metrics_route(registry=metrics.REGISTRY):
+    """Endpoint /metrics - metryki w formacie tekstowym Prometheusa (src/metrics.py)"""
+    def handle(handler, params):
+        return Response(registry.render().encode('utf-8'),
+                        content_type='text/plain; version=0.0.4; charset=utf-8',
+                        headers={'Cache-Control': 'no-store'})
+    return handle
+
+
+def jobs_route(queue, sources, url_root='.'):
+    """
+    Endpoint /api/jobs kolejki jobs.JobQueue.
+
+    GET /api/jobs - lista zadań, GET /api/jobs?id=... - status i postęp zadania,
+    POST /api/jobs (entity, from, to, format) - nowe zadanie (202; identyczne
+    oczekujące zadanie jest zwracane zamiast nowego). sources: {encja: arkusz}.
+    """
+    def handle(handler, params):
+        if handler.command == 'POST':
+            entity = params.get('entity')
+            if not entity and len(sources) == 1:
+                entity = next(iter(sources))
+            if entity not in sources:
+                raise HTTPError(http.HTTPStatus.NOT_FOUND, f"Nieznana encja: {entity!r}")
+            job = _service_call(queue.submit, sources[entity], entity, params.get('from'), params.get('to'),
+                                params.get('format', 'html'))
+            return Response(dumps(job.to_dict(url_root)), http.HTTPStatus.ACCEPTED, 'application/json',
+                            {'Location': f'/api/jobs?id={job.id}', 'Cache-Control': 'no-store'})
+        if 'id' in params:
+            body = _service_call(queue.get, params['id']).to_dict(url_root)
+        else:
+            body = {'jobs': [job.to_dict(url_root) for job in queue.jobs()]}
+        return Response(dumps(body), content_type='application/json', headers={'Cache-Control': 'no-store'})
+    return handle
+
+
+def report_routes(service):
+    """Endpointy raportów dla pipeline.ReportService: /report, /api/analysis i /metrics"""
+    return {'/report': report_route(service), '/api/analysis': analysis_route(service),
+            '/metrics': metrics_route()}
+
+
+def serve(server, install_signal_handlers=True):
+    """
+    Obsługuje żądania do Ctrl+C / SIGTERM, potem zamyka serwer łagodnie.
+
+    serve_forever działa w osobnym wątku, bo server.shutdown() wywołany
+    z wątku serve_forever (np. z handlera sygnału) zakleszczyłby się.
+    """
+    stopped = threading.Event()
+    thread = threading.Thread(target=server.serve_forever, name='http-accept', daemon=True)
+    thread.start()
+
+    if install_signal_handlers and threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda signum, frame: stopped.set())
+
+    try:
+        while not stopped.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+
+class ServerThread:
+    """Serwer działający w tle (testy, benchmarki): with ServerThread(server) as url: ..."""
+
+    def __init__(self, server):
+        self.server = server
+        self._thread = threading.Thread(target=server.serve_forever, name='http-accept', daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def __enter__(self):
+        self._thread.start()
+        return self.url
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self._thread.join()
+        self.server.server_close()
@@ -0,0 +1,256 @@
+"""
+Wbudowany magazyn analityczny (SQLite) dla danych miesięcznych i dziennych.
+
+Zamiast przy każdym raporcie czytać arkusze i CSV od nowa, oczyszczone
+wiersze trafiają raz do bazy, a FPHoldingAnalyzer, AdvancedSalesDashboard
+i podsumowanie sprzedaży pobierają wycinki encji i zakresu dat zapytaniami
+po indeksach:
+
+- monthly_costs  (entity, period)  - wiersze kosztowe po load_and_clean,
+- daily_sales    (entity, date)    - dni z arkusza 'Zestawienie sprzedaży',
+- sales          (entity, date)    - wiersze CSV sprzedaży (date, customer, revenue).
+
+Daty to tekst ISO ('2025-09-01'), więc zakres dat to zakres klucza indeksu.
+Wiersze dzienne i sprzedaży pamiętają źródło (ścieżkę pliku): ponowny import
+pliku podmienia tylko jego wiersze w jednej transakcji (import jest
+idempotentny), a pliki kilku kas z tych samych dni sumują się. Niezmieniony
+plik (rozmiar, mtime) nie jest parsowany drugi raz.
+
+    store = AnalyticsStore('reports/dane.db')
+    store.ingest_cost_workbook('fp_holding', 'koszty.xlsx')
+    analyzer = FPHoldingAnalyzer('fp_holding').load_from_store(store, 'fp_holding', '2024-10', '2025-03')
+"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+from .ingest import daily_frame, parse_daily_rows, read_sales_csv
+from .pipeline import input_fingerprint, parse_period
+
+# Kolumny oczyszczonego arkusza kosztowego (FPHoldingAnalyzer.df) -> kolumny tabeli monthly_costs
+MONTHLY_COLUMNS = (
+    ('Obrót_brutto', 'revenue_gross'),
+    ('Obrót_netto', 'revenue_net'),
+    ('VAT_przychód', 'vat_revenue'),
+    ('Koszta_brutto', 'costs_gross'),
+    ('Kwota_netto', 'costs_net'),
+    ('VAT_koszt', 'vat_costs'),
+    ('ZUS', 'zus'),
+    ('PIT', 'pit'),
+    ('Koszt_pracowniczy', 'employee_costs'),
+    ('Zysk_Excel', 'profit'),
+    ('Średni_rachunek', 'avg_receipt'),
+    ('Ilość_rachunków', 'receipts'),
+)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS monthly_costs (
+    entity TEXT NOT NULL,
+    period TEXT NOT NULL,
+    {', '.join(f'{column} REAL' for _, column in MONTHLY_COLUMNS)},
+    PRIMARY KEY (entity, period)
+);
+CREATE TABLE IF NOT EXISTS daily_sales (
+    entity TEXT NOT NULL,
+    date TEXT NOT NULL,
+    amount REAL NOT NULL,
+    source TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS daily_sales_entity_date ON daily_sales (entity, date);
+CREATE INDEX IF NOT EXISTS daily_sales_entity_source ON daily_sales (entity, source);
+CREATE TABLE IF NOT EXISTS sales (
+    entity TEXT NOT NULL,
+    date TEXT,
+    customer TEXT,
+    revenue REAL,
+    source TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS sales_entity_date ON sales (entity, date);
+CREATE INDEX IF NOT EXISTS sales_entity_source ON sales (entity, source);
+CREATE TABLE IF NOT EXISTS sources (
+    entity TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    ingested_at REAL NOT NULL,
+    PRIMARY KEY (entity, kind, path)
+);
+"""
+
+
+def _range_clause(column, start, end):
+    """
+    ' AND column >= ? AND column <= ?' dla podanych granic. Sam miesiąc jako
+    koniec zakresu dni ('2025-09') obejmuje cały miesiąc; okresy miesięczne
+    są zapisane pierwszym dniem, więc dla nich to bez różnicy.
+    """
+    clauses, params = [], []
+    if isinstance(end, str) and len(end) == 7:
+        end = (pd.Timestamp(end) + pd.offsets.MonthEnd(0)).strftime('%Y-%m-%d')
+    start, end = parse_period(start), parse_period(end)
+    if start is not None:
+        clauses.append(f'{column} >= ?')
+        params.append(start)
+    if end is not None:
+        clauses.append(f'{column} <= ?')
+        params.append(end)
+    return ''.join(f' AND {clause}' for clause in clauses), params
+
+
+class AnalyticsStore:
+    """
+    Magazyn SQLite jednego pliku (albo ':memory:').
+
+    Jedno połączenie współdzielone przez wątki (serwer, kolejka zadań)
+    pod blokadą; plik w trybie WAL - odczyty z innych procesów nie czekają
+    na zapis.
+    """
+
+    def __init__(self, path=':memory:'):
+        self.path = str(path)
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            if self.path != ':memory:':
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _query(self, sql, params=()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # --- zapis ---
+
+    def ingest_monthly(self, entity: str, df: pd.DataFrame) -> int:
+        """
+        Wiersze oczyszczonego arkusza kosztowego (kolumny FPHoldingAnalyzer.df).
+        Arkusz to cała tabela kosztowa encji: jej poprzednie wiersze są usuwane
+        w tej samej transakcji, więc okresy spoza nowego arkusza nie zostają.
+        """
+        periods = pd.to_datetime(df['Okres']).dt.strftime('%Y-%m-%d')
+        values = df[[name for name, _ in MONTHLY_COLUMNS]].astype('float64')
+        rows = [(entity, period, *row) for period, row in zip(periods, values.itertuples(index=False, name=None))]
+        columns = ', '.join(column for _, column in MONTHLY_COLUMNS)
+        placeholders = ', '.join('?' * (len(MONTHLY_COLUMNS) + 2))
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM monthly_costs WHERE entity = ?', (entity,))
+            self._conn.executemany(f'INSERT OR REPLACE INTO monthly_costs (entity, period, {columns}) '
+                                   f'VALUES ({placeholders})', rows)
+        return len(rows)
+
+    def _replace_source(self, table, entity, source, dates: pd.Series, rows, sql):
+        """
+        Podmienia wiersze źródła encji - jedna transakcja. Plik (source to
+        ścieżka) zastępuje wszystkie swoje wiersze; partia bez źródła
+        zastępuje wiersze bez źródła z zakresu swoich dat. Wiersze innych
+        źródeł z tych samych dni zostają.
+        """
+        with self._lock, self._conn:
+            if source:
+                self._conn.execute(f'DELETE FROM {table} WHERE entity = ? AND source = ?', (entity, source))
+            elif len(dates):
+                self._conn.execute(f"DELETE FROM {table} WHERE entity = ? AND source = '' AND date BETWEEN ? AND ?",
+                                   (entity, dates.min(), dates.max()))
+            self._conn.executemany(sql, rows)
+        return len(rows)
+
+    def ingest_daily(self, entity: str, df_daily: pd.DataFrame, source: str = '') -> int:
+        """Dni w układzie ingest.parse_daily_rows (date, amount); poprzednie wiersze źródła są podmieniane"""
+        if df_daily.empty:
+            return 0
+        dates = pd.to_datetime(df_daily['date']).dt.strftime('%Y-%m-%d')
+        rows = list(zip([entity] * len(dates), dates, df_daily['amount'].astype('float64'), [source] * len(dates)))
+        return self._replace_source('daily_sales', entity, source, dates, rows,
+                                    'INSERT INTO daily_sales (entity, date, amount, source) VALUES (?, ?, ?, ?)')
+
+    def ingest_sales(self, entity: str, df: pd.DataFrame, source: str = '') -> int:
+        """Wiersze CSV sprzedaży (date, customer, revenue); poprzednie wiersze źródła są podmieniane"""
+        dates = pd.to_datetime(df['date'], errors='coerce').dt.strftime('%Y-%m-%d')
+        customers = df['customer'] if 'customer' in df else pd.Series([None] * len(df))
+        rows = [(entity, None if pd.isna(date) else date, None if pd.isna(customer) else str(customer),
+                 None if pd.isna(revenue) else float(revenue), source)
+                for date, customer, revenue in zip(dates, customers, df['revenue'])]
+        return self._replace_source('sales', entity, source, dates.dropna(), rows,
+                                    'INSERT INTO sales (entity, date, customer, revenue, source) '
+                                    'VALUES (?, ?, ?, ?, ?)')
+
+    def _ingest_file(self, entity, kind, path, parse, ingest, force=False):
+        """
+        Import pliku, chyba że ten sam plik (rozmiar, mtime) jest już w bazie;
+        zwraca liczbę wierszy albo None. ingest dostaje ścieżkę jako źródło wierszy.
+        """
+        path = str(path)
+        fingerprint = input_fingerprint(path)
+        known = self._query('SELECT fingerprint FROM sources WHERE entity = ? AND kind = ? AND path = ?',
+                            (entity, kind, path))
+        if known and known[0][0] == fingerprint and not force:
+            return None
+        count = ingest(entity, parse(path), path)
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?, ?)',
+                               (entity, kind, path, fingerprint, count, time.time()))
+        return count
+
+    def ingest_cost_workbook(self, entity: str, path, force: bool = False) -> Optional[int]:
+        """Arkusz kosztowy przez FPHoldingAnalyzer.load_and_clean; None, gdy plik się nie zmienił"""
+        from .fp_holding_analyzer import FPHoldingAnalyzer
+
+        return self._ingest_file(entity, 'monthly', path, lambda p: FPHoldingAnalyzer(p).load_and_clean().df,
+                                 lambda entity, df, source: self.ingest_monthly(entity, df), force)
+
+    def ingest_daily_sheet(self, entity: str, path, force: bool = False) -> Optional[int]:
+        """Arkusz dzienny (pierwszy arkusz pliku, jak w AdvancedSalesDashboard)"""
+        return self._ingest_file(entity, 'daily', path,
+                                 lambda p: parse_daily_rows(pd.read_excel(p, sheet_name=0)), self.ingest_daily, force)
+
+    def ingest_sales_csv(self, entity: str, path, force: bool = False) -> Optional[int]:
+        return self._ingest_file(entity, 'sales', path, read_sales_csv, self.ingest_sales, force)
+
+    # --- odczyt ---
+
+    def entities(self) -> List[str]:
+        rows = self._query('SELECT entity FROM monthly_costs UNION SELECT entity FROM daily_sales '
+                           'UNION SELECT entity FROM sales ORDER BY entity')
+        return [entity for entity, in rows]
+
+    def monthly(self, entity: str, start=None, end=None) -> pd.DataFrame:
+        """Wiersze kosztowe encji w zakresie okresów, z kolumnami jak FPHoldingAnalyzer.df po load_and_clean"""
+        where, params = _range_clause('period', start, end)
+        columns = ', '.join(column for _, column in MONTHLY_COLUMNS)
+        rows = self._query(f'SELECT period, {columns} FROM monthly_costs WHERE entity = ?{where} ORDER BY period',
+                           [entity, *params])
+        df = pd.DataFrame(rows, columns=['Okres'] + [name for name, _ in MONTHLY_COLUMNS])
+        df['Okres'] = pd.to_datetime(df['Okres'])
+        return df
+
+    def daily(self, entity: str, start=None, end=None) -> pd.DataFrame:
+        """Dni encji w zakresie dat, w układzie ingest.parse_daily_rows"""
+        where, params = _range_clause('date', start, end)
+        rows = self._query(f'SELECT date, amount FROM daily_sales WHERE entity = ?{where} ORDER BY date, rowid',
+                           [entity, *params])
+        return daily_frame([date for date, _ in rows], [amount for _, amount in rows])
+
+    def sales(self, entity: str, start=None, end=None) -> pd.DataFrame:
+        """Wiersze sprzedaży encji w zakresie dat, w układzie read_sales_csv (date jako tekst)"""
+        where, params = _range_clause('date', start, end)
+        rows = self._query(f'SELECT date, customer, revenue FROM sales WHERE entity = ?{where} ORDER BY date, rowid',
+                           [entity, *params])
+        return pd.DataFrame(rows, columns=['date', 'customer', 'revenue'])
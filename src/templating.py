@@ -0,0 +1,132 @@
+"""
+Wspólne środowisko Jinja2 dla raportów HTML.
+
+Szablony leżą w src/templates. Środowisko jest tworzone raz na proces
+(i katalog szablonów), korzysta z cache bajtkodu oraz z szablonów
+prekompilowanych do modułów Pythona, więc seryjne generowanie raportów
+nie parsuje ani nie kompiluje szablonów przy każdym wywołaniu.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+from jinja2 import (ChoiceLoader, Environment, FileSystemBytecodeCache, FileSystemLoader,
+                    ModuleLoader, select_autoescape)
+
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / 'templates'
+
+_environments = {}
+_lock = threading.Lock()
+
+
+def default_cache_dir() -> Path:
+    """Katalog cache szablonów (FP_HOLDING_CACHE_DIR lub katalog tymczasowy)"""
+    env_dir = os.environ.get('FP_HOLDING_CACHE_DIR')
+    if env_dir:
+        return Path(env_dir) / 'jinja'
+    return Path(tempfile.gettempdir()) / f'fp-holding-jinja-{os.getuid() if hasattr(os, "getuid") else "user"}'
+
+
+def fmt(value, spec=''):
+    """Filtr formatowania zgodny z f-stringami: {{ x|fmt(',.0f') }} == f'{x:,.0f}'"""
+    return format(value, spec)
+
+
+def _templates_fingerprint(template_dir: Path) -> str:
+    """Skrót nazw, rozmiarów i dat modyfikacji szablonów - zmienia się po edycji"""
+    digest = hashlib.sha1(str(template_dir).encode('utf-8'))
+    for path in sorted(template_dir.rglob('*.j2')):
+        stat = path.stat()
+        digest.update(f'{path.relative_to(template_dir)}:{stat.st_size}:{stat.st_mtime_ns}'.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def precompile_templates(template_dir: Path, cache_dir: Path) -> Path:
+    """
+    Kompiluje szablony do modułów Pythona (raz na wersję szablonów).
+
+    Zwraca katalog z modułami dla ModuleLoader. Kompilacja odbywa się
+    w katalogu tymczasowym, który jest potem atomowo przemianowany,
+    więc równoległe procesy nie widzą niepełnego wyniku.
+    """
+    target = cache_dir / f'compiled-{_templates_fingerprint(template_dir)}'
+    if target.is_dir():
+        return target
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix='compiling-', dir=cache_dir))
+    env = _make_environment(FileSystemLoader(str(template_dir)))
+    try:
+        env.compile_templates(str(staging), zip=None, ignore_errors=False)
+    except BaseException:
+        # Błąd składni szablonu - bez porzuconego katalogu w cache
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    try:
+        staging.rename(target)
+    except OSError:
+        # Inny proces zdążył skompilować tę samą wersję szablonów
+        shutil.rmtree(staging, ignore_errors=True)
+    return target
+
+
+def _make_environment(loader, bytecode_cache=None) -> Environment:
+    env = Environment(
+        loader=loader,
+        bytecode_cache=bytecode_cache,
+        autoescape=select_autoescape(['html', 'xml']),
+        keep_trailing_newline=True,
+    )
+    env.filters['fmt'] = fmt
+    return env
+
+
+def get_environment(template_dir: Optional[str] = None, cache_dir: Optional[str] = None) -> Environment:
+    """Zwraca współdzielone (na proces) środowisko Jinja2 dla katalogu szablonów"""
+    template_dir = Path(template_dir).resolve() if template_dir else TEMPLATE_DIR
+    cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+    key = (template_dir, cache_dir)
+
+    env = _environments.get(key)
+    if env is not None:
+        return env
+
+    with _lock:
+        env = _environments.get(key)
+        if env is None:
+            compiled_dir = precompile_templates(template_dir, cache_dir)
+            bytecode_dir = cache_dir / 'bytecode'
+            bytecode_dir.mkdir(parents=True, exist_ok=True)
+            env = _make_environment(
+                ChoiceLoader([
+                    ModuleLoader(str(compiled_dir)),
+                    FileSystemLoader(str(template_dir)),
+                ]),
+                bytecode_cache=FileSystemBytecodeCache(str(bytecode_dir)),
+            )
+            _environments[key] = env
+    return env
+
+
+def render_template(name: str, **context) -> str:
+    """Renderuje szablon z domyślnego katalogu src/templates"""
+    return get_environment().get_template(name).render(**context)
+
+
+def stream_template(name: str, fp, **context) -> int:
+    """
+    Zapisuje szablon do strumienia tekstowego (plik, gniazdo) fragment po fragmencie.
+
+    Dokument nie jest składany w pamięci w całości - fragmenty trafiają do
+    `fp.write` w miarę renderowania. Zwraca liczbę zapisanych znaków.
+    """
+    written = 0
+    for chunk in get_environment().get_template(name).generate(**context):
+        fp.write(chunk)
+        written += len(chunk)
+    return written
@@ -0,0 +1,232 @@
+"""
+Śledzenie etapów pipeline'u raportu (spany) z eksportem do Chrome Trace.
+
+Span to nazwany odcinek pracy z czasem ściennym, czasem CPU wątku
+i - opcjonalnie - szczytem pamięci z tracemalloc. Etapy pipeline'u
+(metrics.stage) i buildery wykresów (src/parallel.py) otwierają spany
+same; wyłączony tracer (domyślnie) kosztuje jedno sprawdzenie flagi.
+
+Zapisany plik JSON (Trace Event Format) otwiera chrome://tracing albo
+https://ui.perfetto.dev - każdy wątek (zadania kolejki, workery wykresów)
+ma własny pas, spany zagnieżdżone są pod swoimi rodzicami.
+
+    tracer = tracing.enable(memory=True)
+    ...
+    tracer.write('trace.json')
+
+Szczyt pamięci tracemalloc dotyczy całego procesu: przy równoległych
+wykresach span pokazuje największy przyrost pamięci w czasie jego trwania,
+razem z alokacjami innych wątków. Spany z puli procesów (use_processes)
+nie są zbierane.
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import List, Optional
+
+from .atomic import atomic_open
+
+
+class Span:
+    """Zakończony (albo trwający) odcinek pracy jednego wątku"""
+
+    __slots__ = ('name', 'category', 'args', 'thread_id', 'thread_name', 'start_ns', 'duration_ns',
+                 'cpu_ns', 'memory_peak', '_cpu_start', '_memory_start', '_memory_max')
+
+    def __init__(self, name: str, category: str, args: dict):
+        thread = threading.current_thread()
+        self.name = name
+        self.category = category
+        self.args = args
+        self.thread_id = thread.ident
+        self.thread_name = thread.name
+        self.start_ns = None
+        self.duration_ns = None
+        self.cpu_ns = None
+        self.memory_peak = None
+
+    @property
+    def wall(self) -> float:
+        """Czas ścienny w sekundach"""
+        return self.duration_ns / 1e9
+
+    @property
+    def cpu(self) -> float:
+        """Czas CPU wątku w sekundach"""
+        return self.cpu_ns / 1e9
+
+    def to_event(self, pid: int, origin_ns: int) -> dict:
+        """Zdarzenie 'X' (complete) Trace Event Format; czasy w mikrosekundach"""
+        args = dict(self.args)
+        args['cpu_ms'] = round(self.cpu_ns / 1e6, 3)
+        if self.memory_peak is not None:
+            args['memory_peak_kb'] = round(self.memory_peak / 1024, 1)
+        return {
+            'name': self.name,
+            'cat': self.category,
+            'ph': 'X',
+            'ts': (self.start_ns - origin_ns) / 1000,
+            'dur': self.duration_ns / 1000,
+            'pid': pid,
+            'tid': self.thread_id,
+            'args': args,
+        }
+
+
+class _SpanContext:
+    """with tracer.span(...) / @tracer.span(...) - jeden obiekt na wywołanie"""
+
+    __slots__ = ('_tracer', '_name', '_category', '_args', '_span')
+
+    def __init__(self, tracer, name, category, args):
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._args = args
+        self._span = None
+
+    def __enter__(self):
+        if self._tracer.enabled:
+            self._span = self._tracer._start(self._name, self._category, self._args)
+        return self._span
+
+    def __exit__(self, *exc):
+        if self._span is not None:
+            self._tracer._finish(self._span)
+            self._span = None
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _SpanContext(self._tracer, self._name, self._category, self._args):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class Tracer:
+    """
+    Zbiera spany ze wszystkich wątków procesu.
+
+    memory=True włącza tracemalloc (jeśli jeszcze nie działa) - pomiar
+    pamięci spowalnia kod Pythona kilkukrotnie, więc czasy spanów są wtedy
+    zawyżone; do samych czasów lepiej memory=False.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.spans: List[Span] = []
+        self.origin_ns = time.perf_counter_ns()
+        self._open: List[Span] = []
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+
+    def start(self, memory: bool = False):
+        """Czyści zebrane spany i zaczyna zbieranie"""
+        with self._lock:
+            self.spans = []
+            self._open = []
+            self.origin_ns = time.perf_counter_ns()
+            self.memory = memory
+            if memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self.enabled = True
+        return self
+
+    def stop(self):
+        """Kończy zbieranie (zebrane spany zostają do eksportu)"""
+        with self._lock:
+            self.enabled = False
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+        return self
+
+    def span(self, name: str, category: str = 'stage', **args) -> _SpanContext:
+        """Span jako context manager albo dekorator; args trafiają do zdarzenia w trace"""
+        return _SpanContext(self, name, category, args)
+
+    def _memory_checkpoint(self) -> int:
+        """
+        Przenosi szczyt tracemalloc od poprzedniego punktu na otwarte spany i zeruje szczyt.
+
+        tracemalloc ma jeden globalny szczyt - bez tego zagnieżdżony span
+        zerujący go (reset_peak) gubiłby szczyt rodzica.
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        for span in self._open:
+            span._memory_max = max(span._memory_max, peak)
+        tracemalloc.reset_peak()
+        return current
+
+    def _start(self, name, category, args) -> Span:
+        span = Span(name, category, args)
+        if self.memory and tracemalloc.is_tracing():
+            with self._lock:
+                span._memory_start = span._memory_max = self._memory_checkpoint()
+                self._open.append(span)
+        span._cpu_start = time.thread_time_ns()
+        span.start_ns = time.perf_counter_ns()
+        return span
+
+    def _finish(self, span: Span):
+        span.duration_ns = time.perf_counter_ns() - span.start_ns
+        span.cpu_ns = time.thread_time_ns() - span._cpu_start
+        with self._lock:
+            if span in self._open:
+                if tracemalloc.is_tracing():
+                    self._memory_checkpoint()
+                self._open.remove(span)
+                span.memory_peak = max(0, span._memory_max - span._memory_start)
+            self.spans.append(span)
+
+    def to_chrome_trace(self) -> dict:
+        """Słownik Trace Event Format (JSON Object Format) z nazwami wątków"""
+        pid = os.getpid()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start_ns)
+        threads = {span.thread_id: span.thread_name for span in spans}
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                  for tid, name in threads.items()]
+        events.extend(span.to_event(pid, self.origin_ns) for span in spans)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, path):
+        """Zapisuje trace do pliku JSON (atomowo)"""
+        with atomic_open(path) as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+        return path
+
+    def summary(self, category: Optional[str] = None) -> List[dict]:
+        """Spany (opcjonalnie jednej kategorii) jako słowniki: name, wall_ms, cpu_ms, memory_peak_kb"""
+        with self._lock:
+            spans = [span for span in self.spans if category is None or span.category == category]
+        return [{
+            'name': span.name,
+            'category': span.category,
+            'wall_ms': round(span.wall * 1000, 3),
+            'cpu_ms': round(span.cpu * 1000, 3),
+            'memory_peak_kb': None if span.memory_peak is None else round(span.memory_peak / 1024, 1),
+        } for span in sorted(spans, key=lambda span: span.start_ns)]
+
+
+TRACER = Tracer()
+
+
+def span(name: str, category: str = 'stage', **args) -> _SpanContext:
+    """Span globalnego tracera (no-op, gdy tracer jest wyłączony)"""
+    return TRACER.span(name, category, **args)
+
+
+def enable(memory: bool = False) -> Tracer:
+    """Włącza globalny tracer od nowa i go zwraca"""
+    return TRACER.start(memory)
+
+
+def disable() -> Tracer:
+    return TRACER.stop()
@@ -0,0 +1,207 @@
+"""
+Obserwowanie arkuszy źródłowych i automatyczna regeneracja raportów.
+
+Watcher co `interval` sekund sprawdza (os.stat) pliki źródłowe celów.
+Seria zapisów (Excel zapisuje plik kilka razy) jest sklejana: cel jest
+przebudowywany dopiero, gdy przez `debounce` sekund nie było kolejnej
+zmiany. Przebudowywane są tylko cele, których źródła się zmieniły, a cel
+raportu FP pomija analizę i render, jeśli wczytane dane są identyczne.
+Raporty są zapisywane atomowo (src/atomic.py).
+"""
+import contextlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .advanced_dashboard import AdvancedSalesDashboard
+from .fp_holding_analyzer import FPHoldingAnalyzer
+from .jobs import DONE
+from .report_generator import ReportGenerator
+
+
+def _signature(path):
+    """(rozmiar, mtime) pliku albo None, gdy go nie ma"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class StageTimer:
+    """Czasy kolejnych etapów regeneracji: with timer.stage('analyze'): ..."""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def summary(self):
+        stages = ', '.join(f"{name} {elapsed * 1000:.0f} ms" for name, elapsed in self.timings.items())
+        return f"{stages} (razem {sum(self.timings.values()) * 1000:.0f} ms)"
+
+
+class FPReportTarget:
+    """
+    Raport FP HOLDING z arkusza kosztowego: load -> analyze -> render.
+
+    Z kolejką zadań (jobs.JobQueue) analiza i render idą przez nią, pod tym
+    samym kluczem co inne zadania tego pliku (np. raport budowany przy
+    starcie) - dwa zapisy tego samego raportu nigdy nie biegną równolegle.
+    """
+
+    def __init__(self, workbook, output_path='reports/fp_holding_raport.html', jobs=None, entity='fp_holding',
+                 **generator_options):
+        self.name = f'raport FP ({Path(workbook).name})'
+        self.workbook = str(workbook)
+        self.sources = [self.workbook]
+        self.output_path = output_path
+        self.jobs = jobs
+        self.entity = entity
+        self.generator_options = generator_options
+        self._data_hash = None
+
+    def run(self, timer: StageTimer) -> bool:
+        """Regeneruje raport; False, gdy dane się nie zmieniły (analiza i render pominięte)"""
+        loaded_at = time.time()
+        with timer.stage('load'):
+            raw_df = pd.read_excel(self.workbook, nrows=14)
+            data_hash = int(pd.util.hash_pandas_object(raw_df, index=True).sum())
+        if data_hash == self._data_hash:
+            return False
+
+        if self.jobs is not None:
+            with timer.stage('job'):
+                self._run_job(loaded_at)
+        else:
+            analyzer = FPHoldingAnalyzer(self.workbook)
+            with timer.stage('analyze'):
+                analyzer.load_and_clean(raw_df).validate().analyze().find_savings().create_recovery_plan()
+            with timer.stage('render'):
+                ReportGenerator(analyzer, **self.generator_options).generate_html(self.output_path)
+        self._data_hash = data_hash
+        return True
+
+    def _run_job(self, loaded_at):
+        job = self.jobs.submit(self.workbook, self.entity, output_path=self.output_path)
+        job.wait()
+        if job.started < loaded_at:
+            # Identyczne zadanie trwało już przed zmianą arkusza - mogło wczytać poprzednią wersję
+            job = self.jobs.submit(self.workbook, self.entity, output_path=self.output_path)
+            job.wait()
+        if job.status != DONE:
+            raise RuntimeError(job.error)
+
+
+class DashboardTarget:
+    """Dashboard sprzedaży (CSV miesięczny + arkusz dzienny)"""
+
+    def __init__(self, csv_path, excel_path, output_path='reports/advanced_dashboard.html', **dashboard_options):
+        self.name = f'dashboard ({Path(csv_path).name}, {Path(excel_path).name})'
+        self.sources = [str(csv_path), str(excel_path)]
+        self.output_path = output_path
+        self.dashboard_options = dashboard_options
+
+    def run(self, timer: StageTimer) -> bool:
+        with timer.stage('load'):
+            dashboard = AdvancedSalesDashboard(*self.sources, **self.dashboard_options)
+        with timer.stage('render'):
+            dashboard.generate_dashboard_html(self.output_path)
+        return True
+
+
+class NotifyTarget:
+    """
+    Powiadomienie otwartych kart (src/events.py) o zmianie plików.
+
+    Nic nie regeneruje - publikuje zdarzenie report-updated ze ścieżką URL,
+    pod którą przeglądarka pobierze nową wersję raportu.
+    """
+
+    def __init__(self, sources, url_path, broadcaster, event='report-updated'):
+        self.name = f'powiadomienie {url_path}'
+        self.sources = [str(source) for source in sources]
+        self.url_path = url_path
+        self.broadcaster = broadcaster
+        self.event = event
+
+    def run(self, timer: StageTimer) -> bool:
+        with timer.stage('notify'):
+            self.broadcaster.publish(self.event, {'path': self.url_path})
+        return True
+
+
+class Watcher:
+    """
+    Polling plików źródłowych z debounce.
+
+    poll() wykonuje jeden krok (przydatne w testach z własnym zegarem),
+    start()/stop() uruchamiają pętlę w wątku w tle.
+    """
+
+    def __init__(self, targets: Iterable, interval: float = 1.0, debounce: float = 2.0, clock=time.monotonic):
+        self.targets = list(targets)
+        self.interval = interval
+        self.debounce = debounce
+        self.clock = clock
+        self.regenerations = 0
+        self._signatures = {path: _signature(path) for target in self.targets for path in target.sources}
+        self._pending: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll(self) -> List:
+        """Sprawdza pliki; zwraca cele przebudowane w tym kroku"""
+        now = self.clock()
+        for path, previous in self._signatures.items():
+            current = _signature(path)
+            if current != previous:
+                self._signatures[path] = current
+                self._pending[path] = now
+
+        if not self._pending or now - max(self._pending.values()) < self.debounce:
+            return []
+
+        changed = set(self._pending)
+        self._pending.clear()
+        affected = [target for target in self.targets if changed & set(target.sources)]
+        for target in affected:
+            self._regenerate(target)
+        return affected
+
+    def _regenerate(self, target):
+        timer = StageTimer()
+        try:
+            rebuilt = target.run(timer)
+        except Exception as e:
+            print(f"❌ {target.name}: błąd regeneracji: {e}")
+            return
+        if rebuilt:
+            self.regenerations += 1
+            print(f"♻️  {target.name}: {timer.summary()}")
+        else:
+            print(f"⏭️  {target.name}: dane bez zmian, pominięto analizę i render ({timer.summary()})")
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name='watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
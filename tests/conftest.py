@@ -0,0 +1,16 @@
+import pytest
+
+from sales_reports.benchmarks.synthetic import write_cost_workbook
+from sales_reports.src.fp_holding_analyzer import FPHoldingAnalyzer
+
+
+@pytest.fixture
+def cost_workbook(tmp_path):
+    return write_cost_workbook(tmp_path / 'koszty.xlsx')
+
+
+@pytest.fixture
+def fp_analyzer(cost_workbook):
+    analyzer = FPHoldingAnalyzer(str(cost_workbook))
+    analyzer.load_and_clean().validate().analyze().find_savings().create_recovery_plan()
+    return analyzer
@@ -0,0 +1,80 @@
+import json
+
+from sales_reports.benchmarks.synthetic import monthly_sales
+from sales_reports.src import cli
+
+
+def test_fp_report_reuses_cached_artifact(cost_workbook, tmp_path, capsys):
+    output = tmp_path / 'out' / 'raport.html'
+    args = ['fp-report', '-w', str(cost_workbook), '-o', str(output), '--cache-dir', str(tmp_path / 'cache')]
+    assert cli.main(args) == 0
+    first = capsys.readouterr().out
+    assert '⏱️  Etapy: load' in first
+    assert output.with_name('raport.html.gz').exists()
+
+    output.unlink()
+    assert cli.main(args) == 0
+    assert '(cache)' in capsys.readouterr().out
+    assert output.read_text(encoding='utf-8').startswith('<!DOCTYPE html>')
+
+
+def test_batch_writes_every_entity_period_and_format(cost_workbook, tmp_path, capsys):
+    args = ['batch', '-w', f'a={cost_workbook}', '-w', f'b={cost_workbook}', '--period', '2024-10:2025-03',
+            '-f', 'json', '-f', 'csv', '--output-dir', str(tmp_path), '-j', '2', '--quiet']
+    assert cli.main(args) == 0
+    assert capsys.readouterr().out == ''
+    for entity in ('a', 'b'):
+        data = json.loads((tmp_path / entity / 'raport_2024-10-01_2025-03-01.json').read_text(encoding='utf-8'))
+        assert 'summary' in data
+        assert (tmp_path / entity / 'raport_2024-10-01_2025-03-01.csv').exists()
+
+
+def test_fp_report_and_batch_from_store(cost_workbook, tmp_path, capsys):
+    db = tmp_path / 'dane.db'
+    assert cli.main(['ingest', '--db', str(db), '--entity', 'fp', '-w', str(cost_workbook), '-q']) == 0
+    output = tmp_path / 'raport.html'
+    args = ['fp-report', '--db', str(db), '--entity', 'fp', '--from', '2024-10', '--to', '2025-03', '-o', str(output)]
+    assert cli.main(args) == 0
+    from_workbook = tmp_path / 'z_arkusza.html'
+    assert cli.main(['fp-report', '-w', str(cost_workbook), '--entity', 'fp', '--from', '2024-10', '--to', '2025-03',
+                     '-o', str(from_workbook)]) == 0
+    assert output.read_bytes() == from_workbook.read_bytes()
+
+    assert cli.main(['batch', '--db', str(db), '-f', 'json', '--output-dir', str(tmp_path / 'batch'), '-q']) == 0
+    data = json.loads((tmp_path / 'batch' / 'fp' / 'raport_start_koniec.json').read_text(encoding='utf-8'))
+    assert 'summary' in data
+
+    assert cli.main(['fp-report', '--db', str(db), '-w', str(cost_workbook)]) == 2
+    assert 'podaj --workbook albo --db' in capsys.readouterr().err
+
+
+def test_legacy_sales_invocation_and_missing_input(tmp_path, capsys):
+    csv_path = tmp_path / 'sprzedaz.csv'
+    monthly_sales().to_csv(csv_path, index=False)
+    assert cli.main(['--input', str(csv_path), '--output', str(tmp_path / 'raport.html')]) == 0
+    assert (tmp_path / 'raport.html').exists()
+    # Dawna opcja --format jest akceptowana i ignorowana
+    assert cli.main(['-i', str(csv_path), '-o', str(tmp_path / 'stary.html'), '-f', 'html']) == 0
+    assert (tmp_path / 'stary.html').exists()
+    assert '--format jest przestarzałe' in capsys.readouterr().err
+
+    assert cli.main(['fp-report', '-w', str(tmp_path / 'brak.xlsx')]) == 2
+    assert 'brak pliku wejściowego' in capsys.readouterr().err
+
+
+def test_trace_option_writes_stage_and_chart_spans(cost_workbook, tmp_path):
+    trace_path = tmp_path / 'trace.json'
+    args = ['fp-report', '-w', str(cost_workbook), '-o', str(tmp_path / 'raport.html'), '-q', '--trace', str(trace_path)]
+    assert cli.main(args) == 0
+    events = json.loads(trace_path.read_text(encoding='utf-8'))['traceEvents']
+    spans = {(event['cat'], event['name']) for event in events if event['ph'] == 'X'}
+    assert {('stage', 'load'), ('stage', 'analyze'), ('stage', 'render'), ('chart', 'revenue_chart')} <= spans
+
+
+def test_profile_option_writes_collapsed_stacks(cost_workbook, tmp_path):
+    profile = tmp_path / 'profil.folded'
+    args = ['bench', '-w', str(cost_workbook), '-n', '3', '-q', '--profile', str(profile), '--profile-interval', '1']
+    assert cli.main(args) == 0
+    lines = profile.read_text(encoding='utf-8').splitlines()
+    assert lines and all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+    assert any('generate_artifact (' in line for line in lines)
@@ -0,0 +1,158 @@
+import pickle
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from sales_reports.benchmarks.synthetic import daily_sheet, sales_orders, write_dashboard_sources
+from sales_reports.src import cli
+from sales_reports.src.advanced_dashboard import AdvancedSalesDashboard
+from sales_reports.src.analysis import summarize_sales
+from sales_reports.src.columnar import (CURRENT_FILE, ColumnarDataset, ColumnarStore, ColumnarTable, read_segments,
+                                        write_table, write_version)
+from sales_reports.src.ingest import parse_daily_rows
+
+
+def test_range_summary_matches_dataframe(tmp_path):
+    orders = sales_orders(5_000, seed=3)
+    store = ColumnarStore(tmp_path)
+    store.ingest_sales('a', orders.sample(frac=1, random_state=0))  # kolejność wejścia bez znaczenia
+
+    rows = store.sales_slice('a', '2021-03', '2021-06-15')
+    assert isinstance(rows['revenue'], np.memmap)
+    expected = orders[(orders['date'] >= '2021-03-01') & (orders['date'] <= '2021-06-15')]
+    summary = summarize_sales(rows)
+    assert summary['orders_count'] == len(expected)
+    assert np.isclose(summary['total_revenue'], expected['revenue'].sum())
+    assert summarize_sales(store.sales_slice('a', '2030-01')) == summarize_sales(pd.DataFrame())
+
+    # Do innego procesu trafia ścieżka, nie dane
+    assert len(pickle.dumps(store.table('a', 'sales'))) < 500
+    assert store.entities() == ['a']
+
+
+def test_daily_reingest_replaces_range(tmp_path):
+    store = ColumnarStore(tmp_path)
+    sheet = parse_daily_rows(daily_sheet(30))
+    store.ingest_daily('k1', sheet)
+    store.ingest_daily('k1', sheet.iloc[:10])
+    pdt.assert_frame_equal(store.daily('k1'), sheet.reset_index(drop=True), check_dtype=False)
+    assert len(store.daily('k1', '2025-09-10', '2025-09')) == 21
+    assert store.daily('inna').empty
+
+
+def test_sources_are_separate_segments(tmp_path):
+    first, second = tmp_path / 'k1.xlsx', tmp_path / 'k2.xlsx'
+    daily_sheet(30, seed=1).to_excel(first, index=False)
+    daily_sheet(30, seed=2).to_excel(second, index=False)
+    store = ColumnarStore(tmp_path / 'kolumny')
+    store.ingest_daily_sheet('k1', first)
+    store.ingest_daily_sheet('k1', second)
+    assert len(store.daily('k1')) == 60
+
+    # Poprawiony pierwszy plik przepisuje tylko swój segment; dni, których już nie ma, znikają z kostki
+    untouched = {segment['dir'] for segment in read_segments(tmp_path / 'kolumny' / 'k1' / 'daily')
+                 if segment['source'] == str(second)}
+    daily_sheet(20, seed=3).to_excel(first, index=False)
+    store.ingest_daily_sheet('k1', first)
+    segments = read_segments(tmp_path / 'kolumny' / 'k1' / 'daily')
+    assert len(segments) == 2 and untouched <= {segment['dir'] for segment in segments}
+    daily = store.daily('k1')
+    assert len(daily) == 50 and daily['date'].is_monotonic_increasing
+    expected = daily_sheet(20, seed=3)['Kwota'].sum() + daily_sheet(30, seed=2)['Kwota'].sum()
+    assert np.isclose(daily['amount'].sum(), expected)
+    days = ColumnarStore(tmp_path / 'kolumny').rollup('daily').cells('k1', 'day')
+    assert np.isclose(days['amount_sum'].sum(), expected)
+    assert days['amount_count'].sum() == 50
+
+
+def test_rewrite_never_hides_the_table(tmp_path):
+    directory = tmp_path / 'tabela'
+    write_table(directory, {'date': pd.date_range('2025-01-01', periods=10), 'amount': np.zeros(10)})
+    opened = ColumnarTable(directory)
+    done, errors = threading.Event(), []
+
+    def read():
+        while not done.is_set():
+            try:
+                assert len(ColumnarTable(directory)) == 10
+            except Exception as error:
+                errors.append(error)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for value in range(1, 30):
+        write_table(directory, {'date': pd.date_range('2025-01-01', periods=10), 'amount': np.full(10, value)})
+    done.set()
+    reader.join()
+    assert errors == []
+    # Otwarta wcześniej tabela czyta swoją (usuniętą już) wersję
+    assert opened.column('amount').sum() == 0
+    assert ColumnarTable(directory).column('amount')[0] == 29
+    assert len(list(directory.iterdir())) == 2  # _current i jedna wersja
+
+
+def test_open_follows_the_pointer_through_repeated_switches(tmp_path, monkeypatch):
+    directory = tmp_path / 'tabela'
+    columns = {'date': pd.date_range('2025-01-01', periods=3), 'amount': np.zeros(3)}
+    write_table(directory, columns)
+    open_version, switches = ColumnarTable._open, []
+
+    def racing_open(table, version):
+        # Zapis przełącza wskaźnik i usuwa wersję tuż przed każdym z pięciu pierwszych otwarć
+        if len(switches) < 5:
+            switches.append(write_version(directory, dict(columns, amount=np.full(3, len(switches) + 1))))
+            (directory / CURRENT_FILE).write_text(switches[-1].name, encoding='utf-8')
+            shutil.rmtree(version)
+        open_version(table, version)
+
+    monkeypatch.setattr(ColumnarTable, '_open', racing_open)
+    assert ColumnarTable(directory).column('amount')[0] == 5
+    assert len(switches) == 5
+
+
+def test_reimport_never_hides_the_dataset(tmp_path):
+    store = ColumnarStore(tmp_path / 'kolumny')
+    days = pd.DataFrame({'date': pd.date_range('2025-01-01', periods=10), 'amount': np.ones(10)})
+    store.ingest_daily('k1', days, source='kasa1.xlsx')
+    done, errors = threading.Event(), []
+
+    def read():
+        while not done.is_set():
+            try:
+                assert len(ColumnarDataset(tmp_path / 'kolumny' / 'k1' / 'daily')) == 10
+            except Exception as error:
+                errors.append(error)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for value in range(2, 20):
+        store.ingest_daily('k1', days.assign(amount=float(value)), source='kasa1.xlsx')
+    done.set()
+    reader.join()
+    assert errors == []
+
+
+def test_dashboard_and_sales_from_columnar(tmp_path, capsys):
+    csv_path, excel_path = write_dashboard_sources(tmp_path)
+    root = tmp_path / 'kolumny'
+    assert cli.main(['ingest', '--columnar', str(root), '--entity', 'k1', '--daily', excel_path,
+                     '--sales', csv_path]) == 0
+
+    from_store = AdvancedSalesDashboard(None, None, store=ColumnarStore(root), entity='k1')
+    from_files = AdvancedSalesDashboard(csv_path, excel_path)
+    pdt.assert_frame_equal(from_store.df_daily, from_files.df_daily.reset_index(drop=True), check_dtype=False)
+    assert from_store.calculate_trends() == from_files.calculate_trends()
+    # use_processes: do workerów trafia ścieżka magazynu, nie ramki - worker czyta wycinek z memmap
+    payload = pickle.dumps(from_store)
+    assert len(payload) < len(pickle.dumps(from_store.df_daily))
+    copy = pickle.loads(payload)
+    assert isinstance(copy.store, ColumnarStore)
+    assert copy.create_daily_chart().to_json() == from_store.create_daily_chart().to_json()
+
+    output = tmp_path / 'sprzedaz.html'
+    assert cli.main(['sales', '--columnar', str(root), '--entity', 'k1', '-o', str(output)]) == 0
+    assert output.exists()
+    assert f'Wczytuję dane z: {root} [k1]' in capsys.readouterr().out
@@ -0,0 +1,52 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sales_reports.benchmarks.synthetic import write_dashboard_sources
+from sales_reports.src.advanced_dashboard import AdvancedSalesDashboard
+from sales_reports.src.downsample import downsample_indices, lttb_indices, min_max_indices
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    x = pd.date_range('2020-01-01', periods=5000, freq='D')
+    y = rng.normal(10_000, 500, len(x))
+    y[1234] = 50_000
+    y[4321] = -5_000
+    return x, y
+
+
+def test_lttb_keeps_endpoints_and_spikes(series):
+    x, y = series
+    keep = lttb_indices(x, y, 500)
+    assert len(keep) == 500
+    assert keep[0] == 0 and keep[-1] == len(y) - 1
+    assert np.all(np.diff(keep) > 0)
+    assert {1234, 4321} <= set(keep.tolist())
+
+
+def test_min_max_keeps_bucket_extremes(series):
+    x, y = series
+    keep = min_max_indices(y, 500)
+    assert len(keep) <= 500
+    assert keep[0] == 0 and keep[-1] == len(y) - 1
+    assert {int(np.argmax(y)), int(np.argmin(y))} <= set(keep.tolist())
+
+
+def test_short_series_is_untouched(series):
+    x, y = series
+    assert np.array_equal(downsample_indices(x[:100], y[:100], 500), np.arange(100))
+    with pytest.raises(ValueError):
+        downsample_indices(x, y, 500, method='avg')
+
+
+def test_long_daily_chart_is_downsampled_to_scattergl(tmp_path):
+    csv_path, excel_path = write_dashboard_sources(tmp_path, days=3000)
+    dashboard = AdvancedSalesDashboard(csv_path, excel_path, max_workers=1, max_points=1500)
+    chart = json.loads(dashboard.create_daily_chart().to_json())
+    daily, moving_avg = chart['data'][:2]
+    assert daily['type'] == moving_avg['type'] == 'scattergl'
+    assert len(daily['x']) == len(moving_avg['x']) == 1500
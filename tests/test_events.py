@@ -0,0 +1,76 @@
+import http.client
+import socket
+import time
+
+from sales_reports.src.events import EventBroadcaster, events_route
+from sales_reports.src.server import ServerThread, make_server
+
+
+def _subscribe(url):
+    host, port = url.split('//')[1].split(':')
+    sock = socket.create_connection((host, int(port)), timeout=5)
+    sock.sendall(b'GET /events HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n')
+    return sock
+
+
+def _read_until(sock, marker):
+    data = b''
+    while marker not in data:
+        chunk = sock.recv(4096)
+        assert chunk, 'połączenie zamknięte przed otrzymaniem danych'
+        data += chunk
+    return data
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_published_event_reaches_subscriber(tmp_path):
+    broadcaster = EventBroadcaster()
+    server = make_server(tmp_path, '127.0.0.1', 0, workers=2, routes={'/events': events_route(broadcaster)})
+    try:
+        with ServerThread(server) as url:
+            sock = _subscribe(url)
+            head = _read_until(sock, b'retry:')
+            assert b'200 OK' in head
+            assert b'Content-Type: text/event-stream' in head
+
+            broadcaster.publish('report-updated', {'path': '/reports/raport.html'})
+            event = _read_until(sock, b'}\n\n')
+            assert b'event: report-updated\ndata: {"path":"/reports/raport.html"}\n\n' in event
+
+            # Zamknięta karta znika z listy subskrybentów
+            sock.close()
+            _wait_for(lambda: len(broadcaster) == 0)
+    finally:
+        broadcaster.close()
+
+
+def test_idle_subscribers_do_not_hold_workers(tmp_path):
+    (tmp_path / 'a.html').write_text('a', encoding='utf-8')
+    broadcaster = EventBroadcaster()
+    server = make_server(tmp_path, '127.0.0.1', 0, workers=2, routes={'/events': events_route(broadcaster)})
+    try:
+        with ServerThread(server) as url:
+            subscribers = [_subscribe(url) for _ in range(50)]
+            _wait_for(lambda: len(broadcaster) == 50)
+
+            conn = http.client.HTTPConnection(url.split('//')[1], timeout=5)
+            conn.request('GET', '/a.html')
+            assert conn.getresponse().read() == b'a'
+            conn.close()
+
+            broadcaster.publish('report-updated', {'path': '/a.html'})
+            for sock in subscribers:
+                assert b'event: report-updated' in _read_until(sock, b'report-updated')
+    finally:
+        broadcaster.close()
+    # Po close() subskrybenci dostają EOF
+    assert len(broadcaster) == 0
+    assert subscribers[0].recv(4096) == b''
+    for sock in subscribers:
+        sock.close()
@@ -0,0 +1,23 @@
+import pytest
+
+from sales_reports.benchmarks.synthetic import cost_table
+from sales_reports.src.figure_cache import clear_skeletons
+from sales_reports.src.fp_holding_analyzer import FPHoldingAnalyzer
+from sales_reports.src.report_generator import ReportGenerator
+
+
+def _analyzer(seed):
+    analyzer = FPHoldingAnalyzer(excel_path=f'<synthetic:{seed}>')
+    return analyzer.load_and_clean(cost_table(seed)).analyze()
+
+
+@pytest.mark.parametrize('name, method', ReportGenerator.CHART_BUILDERS)
+def test_skeleton_matches_fresh_figure(name, method):
+    clear_skeletons()
+    # Szkielet budowany z danych pierwszej encji, używany dla drugiej
+    getattr(ReportGenerator(_analyzer(1), reuse_figures=True), method)()
+
+    other = _analyzer(2)
+    reused = getattr(ReportGenerator(other, reuse_figures=True), method)()
+    fresh = getattr(ReportGenerator(other), method)()
+    assert reused == fresh
@@ -0,0 +1,22 @@
+import json
+
+import pytest
+
+from sales_reports.benchmarks.synthetic import write_dashboard_sources
+from sales_reports.src.advanced_dashboard import AdvancedSalesDashboard
+from sales_reports.src.report_generator import ReportGenerator
+
+
+@pytest.mark.parametrize('name, method', ReportGenerator.CHART_BUILDERS)
+def test_report_charts_match_graph_objects(fp_analyzer, name, method):
+    fast = getattr(ReportGenerator(fp_analyzer, fast_figures=True), method)()
+    plotly = getattr(ReportGenerator(fp_analyzer), method)()
+    assert json.loads(fast) == json.loads(plotly)
+
+
+def test_dashboard_charts_match_graph_objects(tmp_path):
+    csv_path, excel_path = write_dashboard_sources(tmp_path)
+    fast = AdvancedSalesDashboard(csv_path, excel_path, max_workers=1, fast_figures=True).build_charts()
+    plotly = AdvancedSalesDashboard(csv_path, excel_path, max_workers=1).build_charts()
+    for name in plotly:
+        assert json.loads(fast[name]) == json.loads(plotly[name]), name
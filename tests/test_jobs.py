@@ -0,0 +1,89 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from sales_reports.src.jobs import DONE, FAILED, JobQueue, JobSpec, generate_artifact
+from sales_reports.src.server import ServerThread, jobs_route, make_server
+
+
+def test_identical_pending_jobs_are_deduplicated(tmp_path):
+    release = threading.Event()
+    runs = []
+
+    def runner(spec, path, progress):
+        progress('render', 0.5)
+        release.wait(5)
+        runs.append(spec.key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('ok', encoding='utf-8')
+
+    queue = JobQueue(tmp_path, max_workers=2, runner=runner)
+    first = queue.submit('koszty.xlsx', 'fp', '2024-10', '2025-03')
+    same = queue.submit('koszty.xlsx', 'fp', '2024-10-01', '2025-03-01')
+    other = queue.submit('koszty.xlsx', 'fp', '2024-10', '2025-03', fmt='json')
+    assert same is first
+    assert other is not first
+
+    release.set()
+    assert first.wait(5) and other.wait(5)
+    queue.shutdown()
+    assert len(runs) == 2
+    assert first.status == DONE and first.progress == 1.0
+    assert first.artifact == tmp_path / 'fp' / 'raport_2024-10-01_2025-03-01.html'
+    # Zakończone zadanie nie blokuje nowego z tymi samymi parametrami
+    queue = JobQueue(tmp_path, runner=runner)
+    assert queue.submit('koszty.xlsx', 'fp', '2024-10', '2025-03') is not first
+    queue.shutdown()
+
+
+def test_failed_job_reports_error(tmp_path):
+    queue = JobQueue(tmp_path)
+    job = queue.submit(tmp_path / 'brak.xlsx', 'fp', fmt='json')
+    assert job.wait(30)
+    queue.shutdown()
+    assert job.status == FAILED
+    assert job.error
+
+
+def test_invalid_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        JobQueue(tmp_path).submit('koszty.xlsx', 'fp', fmt='pdf')
+
+
+def test_csv_artifact_logs_final_path(tmp_path, cost_workbook, capsys):
+    path = tmp_path / 'fp' / 'raport.csv'
+    generate_artifact(JobSpec(cost_workbook, 'fp', fmt='csv'), path, lambda stage, fraction: None)
+    assert path.read_text(encoding='utf-8-sig').startswith('Okres,')
+    out = capsys.readouterr().out
+    assert f'Dane wyeksportowane do: {path}' in out and '.tmp' not in out
+
+
+def test_jobs_endpoint_publishes_artifact(tmp_path, cost_workbook):
+    queue = JobQueue(tmp_path / 'reports')
+    routes = {'/api/jobs': jobs_route(queue, {'fp_holding': str(cost_workbook)}, url_root=tmp_path)}
+    with ServerThread(make_server(tmp_path, '127.0.0.1', 0, workers=2, routes=routes)) as url:
+        conn = http.client.HTTPConnection(url.split('//')[1])
+        conn.request('POST', '/api/jobs', body='from=2024-10&to=2025-03&format=html',
+                     headers={'Content-Type': 'application/x-www-form-urlencoded'})
+        response = conn.getresponse()
+        submitted = json.loads(response.read())
+        assert response.status == 202
+        assert response.getheader('Location') == f"/api/jobs?id={submitted['id']}"
+
+        assert queue.get(submitted['id']).wait(60)
+        conn.request('GET', f"/api/jobs?id={submitted['id']}")
+        status = json.loads(conn.getresponse().read())
+        assert status['status'] == DONE
+        assert status['artifact'] == '/reports/fp_holding/raport_2024-10-01_2025-03-01.html'
+
+        conn.request('GET', status['artifact'])
+        assert b'<!DOCTYPE html>' in conn.getresponse().read()
+
+        conn.request('GET', '/api/jobs?id=nieznane')
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 404
+        conn.close()
+    queue.shutdown()
@@ -0,0 +1,25 @@
+from sales_reports.benchmarks.loadgen import percentile, run_load
+from sales_reports.src.server import ServerThread, make_server
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([7.0], 95) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def test_run_load_reports_each_target(tmp_path):
+    (tmp_path / 'a.html').write_text('a' * 100, encoding='utf-8')
+    targets = {'static': '/a.html', 'missing': '/brak.html'}
+    with ServerThread(make_server(tmp_path, '127.0.0.1', 0, workers=4)) as url:
+        result = run_load(url, targets, clients=4, requests=10)
+
+    assert result['total']['requests'] == 40
+    assert result['targets']['static']['requests'] == 20
+    assert result['targets']['static']['errors'] == 0
+    assert result['targets']['static']['bytes'] == 2000
+    assert result['targets']['missing']['errors'] == 20
+    stats = result['targets']['static']
+    assert 0 < stats['p50_ms'] <= stats['p95_ms'] <= stats['p99_ms'] <= stats['max_ms']
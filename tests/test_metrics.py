@@ -0,0 +1,72 @@
+import http.client
+import time
+
+from sales_reports.src import metrics
+from sales_reports.src.server import ServerThread, make_server, metrics_route
+
+
+def _sample(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0.0
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = metrics.Registry()
+    latency = registry.register(metrics.Histogram('latency_seconds', 'Czas', ('handler',), buckets=(0.1, 1.0)))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.labels(handler='/report').observe(value)
+    hits = registry.register(metrics.Counter('hits_total', 'Trafienia'))
+    hits.inc(3)
+
+    text = registry.render()
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{handler="/report",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{handler="/report",le="1"} 3' in text
+    assert 'latency_seconds_bucket{handler="/report",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{handler="/report"} 4' in text
+    assert 'latency_seconds_sum{handler="/report"} 4.25' in text
+    assert 'hits_total 3' in text
+
+
+def test_pipeline_stages_are_recorded(fp_analyzer):
+    before = {stage: metrics.STAGE_DURATION.labels(stage).count for stage in ('validate', 'analyze')}
+    fp_analyzer.validate().analyze()
+    for stage, count in before.items():
+        assert metrics.STAGE_DURATION.labels(stage).count == count + 1
+
+
+def test_metrics_endpoint_counts_requests_and_bytes(tmp_path):
+    (tmp_path / 'raport.html').write_bytes(b'x' * 1000)
+    routes = {'/metrics': metrics_route()}
+    with ServerThread(make_server(tmp_path, '127.0.0.1', 0, workers=2, routes=routes)) as url:
+        conn = http.client.HTTPConnection(url.split('//')[1])
+
+        def scrape():
+            conn.request('GET', '/metrics')
+            response = conn.getresponse()
+            assert response.getheader('Content-Type').startswith('text/plain; version=0.0.4')
+            return response.read().decode('utf-8')
+
+        ok = 'http_requests_total{method="GET",handler="static",status="200"}'
+        missing = 'http_requests_total{method="GET",handler="static",status="404"}'
+        before = scrape()
+        for path in ('/raport.html', '/raport.html', '/brak.html'):
+            conn.request('GET', path)
+            conn.getresponse().read()
+        # Błąd 404 zamyka połączenie (Connection: close) - klient łączy się od nowa,
+        # zanim worker poprzedniego połączenia zapisze metryki żądania
+        deadline = time.monotonic() + 5
+        after = scrape()
+        while _sample(after, missing) == _sample(before, missing) and time.monotonic() < deadline:
+            time.sleep(0.01)
+            after = scrape()
+        conn.close()
+
+    assert _sample(after, ok) - _sample(before, ok) == 2
+    assert _sample(after, missing) - _sample(before, missing) == 1
+    served = 'http_response_bytes_total{handler="static"}'
+    assert _sample(after, served) - _sample(before, served) >= 2000
+    assert 'http_request_duration_seconds_bucket{handler="/metrics",le="+Inf"}' in after
+    assert 'cache_hit_ratio{cache="file_etag"}' in after
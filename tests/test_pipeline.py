@@ -0,0 +1,150 @@
+import gzip
+import http.client
+import json
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from sales_reports.src import jsonapi
+from sales_reports.src.pipeline import LRUCache, ReportService, SingleFlight
+from sales_reports.src.server import ServerThread, analysis_route, make_server, report_route
+
+
+def test_lru_cache_evicts_least_recently_used_by_size():
+    cache = LRUCache(max_bytes=10)
+    cache.put('a', b'xxxx')
+    cache.put('b', b'yyyy')
+    assert cache.get('a') == b'xxxx'
+    cache.put('c', b'zzzz')
+    assert cache.get('b') is None
+    assert cache.get('a') == b'xxxx' and cache.get('c') == b'zzzz'
+    assert cache.size == 8
+
+
+def test_single_flight_runs_identical_calls_once():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'html'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('k', slow)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do('k', slow))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+    assert results == ['html'] * 4
+    assert len(calls) == 1
+
+
+def test_report_service_caches_by_period_and_input(cost_workbook):
+    service = ReportService({'fp': str(cost_workbook)})
+    full = service.report()
+    assert service.report('fp') is full
+    sliced = service.report('fp', '2024-10', '2025-01')
+    assert sliced != full
+    assert service.renders == 2
+
+    with pytest.raises(KeyError):
+        service.report('inna')
+    with pytest.raises(ValueError):
+        service.report('fp', '2025-05', '2024-10')
+
+
+def test_report_endpoint(cost_workbook):
+    service = ReportService({'fp': str(cost_workbook)})
+    server = make_server(cost_workbook.parent, '127.0.0.1', 0, routes={'/report': report_route(service)})
+    with ServerThread(server) as url:
+        conn = http.client.HTTPConnection(url.split('//')[1])
+        conn.request('GET', '/report?entity=fp&from=2024-10&to=2025-03')
+        response = conn.getresponse()
+        body = response.read()
+        assert response.status == 200
+        assert b'id="report-data"' in body
+
+        conn.request('GET', '/report?entity=fp&from=2024-10&to=2025-03',
+                     headers={'If-None-Match': response.getheader('ETag')})
+        again = conn.getresponse()
+        again.read()
+        assert again.status == 304
+
+        conn.request('GET', '/report?entity=brak')
+        missing = conn.getresponse()
+        missing.read()
+        assert missing.status == 404
+        conn.close()
+    assert service.renders == 1
+
+
+def test_report_endpoint_maps_missing_workbook_and_render_errors(tmp_path, cost_workbook):
+    def broken(*args, **kwargs):
+        raise RuntimeError('błąd renderowania')
+
+    service = ReportService({'brak': str(tmp_path / 'brak.xlsx'), 'fp': str(cost_workbook)}, renderer=broken)
+    server = make_server(tmp_path, '127.0.0.1', 0, routes={'/report': report_route(service)})
+    with ServerThread(server) as url:
+        conn = http.client.HTTPConnection(url.split('//')[1])
+        conn.request('GET', '/report?entity=brak')
+        missing = conn.getresponse()
+        assert missing.status == 404
+        assert 'brak.xlsx' in missing.read().decode('utf-8')
+
+        conn.request('GET', '/report?entity=fp')
+        failed = conn.getresponse()
+        failed.read()
+        assert failed.status == 500
+        conn.close()
+
+
+def test_analysis_api_projects_fields_and_gzips(cost_workbook):
+    service = ReportService({'fp': str(cost_workbook)})
+    server = make_server(cost_workbook.parent, '127.0.0.1', 0, routes={'/api/analysis': analysis_route(service)})
+    with ServerThread(server) as url:
+        conn = http.client.HTTPConnection(url.split('//')[1])
+        conn.request('GET', '/api/analysis')
+        response = conn.getresponse()
+        full = json.loads(response.read())
+        assert response.getheader('Content-Type') == 'application/json'
+        assert set(full) >= {'summary', 'best_month', 'worst_month', 'costs_breakdown', 'savings', 'recovery_plan'}
+        assert isinstance(full['summary']['profitable_months'], int)
+
+        conn.request('GET', '/api/analysis?fields=summary.margin,savings', headers={'Accept-Encoding': 'gzip'})
+        response = conn.getresponse()
+        assert response.getheader('Content-Encoding') == 'gzip'
+        projected = json.loads(gzip.decompress(response.read()))
+        assert projected == {'summary': {'margin': full['summary']['margin']}, 'savings': full['savings']}
+
+        conn.request('GET', '/api/analysis?fields=summary.brak')
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 400
+        conn.close()
+
+    # Kolejne żądania to trafienia w cache, dopóki arkusz się nie zmieni
+    hits = service.cache.hits
+    service.analysis_json('fp')
+    assert service.cache.hits == hits + 1
+    os.utime(cost_workbook, ns=(1, 1))
+    service.analysis_json('fp')
+    assert service.cache.hits == hits + 1
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_jsonapi_handles_numpy_and_nan(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(jsonapi, 'orjson', None)
+    elif jsonapi.orjson is None:
+        pytest.skip('orjson nie jest zainstalowany')
+    data = {'n': np.int64(3), 'x': np.float64('nan'), 'a': np.arange(2)}
+    assert json.loads(jsonapi.dumps(data)) == {'n': 3, 'x': None, 'a': [0, 1]}
@@ -0,0 +1,33 @@
+import threading
+
+from sales_reports.src.profiler import SamplingProfiler
+
+
+def _spin(stop):
+    total = 0
+    while not stop.is_set():
+        total += sum(range(1000))
+    return total
+
+
+def test_samples_busy_threads_and_skips_waiting_ones(tmp_path):
+    stop = threading.Event()
+    with SamplingProfiler(interval=0.002) as profiler:
+        worker = threading.Thread(target=_spin, args=(stop,), name='spinner')
+        worker.start()
+        # Wątek główny tylko czeka - nie powinien trafić do profilu
+        stop.wait(0.3)
+        stop.set()
+        worker.join()
+
+    assert profiler.samples > 10
+    lines = profiler.write(tmp_path / 'profil.folded').read_text(encoding='utf-8').splitlines()
+    assert lines == profiler.collapsed()
+    stacks = [line.rsplit(' ', 1) for line in lines]
+    assert all(int(weight) > 0 for _, weight in stacks)
+    assert any(stack.startswith('thread spinner;') and '_spin (' in stack for stack, _ in stacks)
+    assert not any(stack.startswith('thread MainThread;') for stack, _ in stacks)
+
+    frame, micros, share = profiler.top(limit=1, inclusive=True)[0]
+    assert share > 0.9 and micros > 0
+    assert 'test_profiler.py' in frame or 'threading.py' in frame
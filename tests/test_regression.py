@@ -0,0 +1,51 @@
+import json
+
+from sales_reports.benchmarks import regression
+from sales_reports.benchmarks.measure import mad
+
+
+def _result(times_ms, peak_bytes=100_000, name='analyze', scale='14'):
+    times = [t / 1000 for t in times_ms]
+    ordered = sorted(times)
+    return {'commit': 'abc', 'python': '3.11.0', 'platform': 'linux', 'results': [{
+        'name': name, 'group': 'analysis', 'scale': scale, 'rows': 14, 'times_s': times,
+        'median_s': ordered[len(ordered) // 2], 'mad_s': mad(times), 'peak_bytes': peak_bytes,
+    }]}
+
+
+def test_noise_within_mad_is_not_a_regression():
+    baseline = regression.baseline_from_results(_result([10, 10.4, 9.6, 10.2, 9.8]))
+    rows = regression.compare(baseline, _result([10.5, 10.9, 10.1, 10.7, 10.3]))
+    assert [row['status'] for row in rows] == [regression.OK]
+
+
+def test_slowdown_and_memory_growth_are_flagged(tmp_path):
+    path = regression.write_baseline(regression.baseline_from_results(_result([10, 10.1, 9.9, 10, 10])),
+                                     tmp_path / 'baseline.json')
+    baseline = regression.load_baseline(path)
+    assert list(json.loads(path.read_text(encoding='utf-8'))['benchmarks']) == ['analyze@14']
+
+    slower = regression.compare(baseline, _result([13, 13.1, 12.9, 13, 13]))
+    assert regression.regressions(slower)[0]['key'] == 'analyze@14'
+    assert '❌ Regresja: analyze@14' in regression.format_report(slower)
+
+    faster = regression.compare(baseline, _result([7, 7.1, 6.9, 7, 7]))
+    assert faster[0]['status'] == regression.IMPROVED
+
+    heavier = regression.compare(baseline, _result([10, 10, 10, 10, 10], peak_bytes=400_000))
+    assert heavier[0]['status'] == regression.REGRESSION and heavier[0]['memory'] == regression.REGRESSION
+
+
+def test_update_keeps_benchmarks_outside_the_run_and_reports_new_ones(tmp_path):
+    old = regression.baseline_from_results(_result([5, 5, 5], name='render'))
+    merged = regression.baseline_from_results(_result([10, 10, 10]), previous=old)
+    assert set(merged['benchmarks']) == {'render@14', 'analyze@14'}
+
+    rows = regression.compare(old, _result([10, 10, 10], scale='1k'))
+    assert rows[0]['status'] == regression.NEW
+
+    results = tmp_path / 'bench.json'
+    results.write_text(json.dumps(_result([20, 20, 20], name='render')), encoding='utf-8')
+    baseline_path = tmp_path / 'baseline.json'
+    regression.write_baseline(old, baseline_path)
+    assert regression.main(['--results', str(results), '--baseline', str(baseline_path)]) == 1
@@ -0,0 +1,35 @@
+import io
+import json
+
+from sales_reports.benchmarks.lazy_charts import extract_chart_specs, extract_dataset
+from sales_reports.src.report_generator import ReportGenerator
+
+
+def resolve(node, columns):
+    if isinstance(node, list):
+        return [resolve(item, columns) for item in node]
+    if isinstance(node, dict):
+        if set(node) == {'$col'}:
+            return columns[node['$col']]
+        return {key: resolve(value, columns) for key, value in node.items()}
+    return node
+
+
+def test_chart_specs_reference_shared_columns(fp_analyzer):
+    generator = ReportGenerator(fp_analyzer, max_workers=1)
+    stream = io.StringIO()
+    generator.stream_html(stream)
+    dataset = json.loads(extract_dataset(stream.getvalue()))
+    assert list(dataset['columns']) == list(ReportGenerator.DATASET_COLUMNS)
+    assert set(dataset['kpi']) == {'avg_revenue', 'avg_costs', 'avg_profit', 'margin'}
+
+    html = stream.getvalue()
+    specs = extract_chart_specs(html)
+    for name, method in ReportGenerator.CHART_BUILDERS:
+        full = json.loads(getattr(generator, method)())
+        compact = json.loads(specs[name.replace('_', '-')])
+        assert resolve(compact, dataset['columns']) == full
+
+    # Okresy są w raporcie raz - w zbiorze danych, nie w każdym wykresie
+    first_period = json.dumps(dataset['columns']['Okres_str'][:2], ensure_ascii=False, separators=(',', ':'))[1:-1]
+    assert html.count(first_period) == 1
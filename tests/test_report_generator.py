@@ -0,0 +1,112 @@
+import json
+import shutil
+import warnings
+
+import pytest
+
+from sales_reports.benchmarks.lazy_charts import (chart_layout, extract_chart_specs, extract_dataset,
+                                                  extract_kpi_cards, extract_loader, run_harness)
+from sales_reports.src.pipeline import run_analysis
+from sales_reports.src.report_generator import ReportGenerator
+
+
+def test_parallel_charts_match_sequential(fp_analyzer):
+    sequential = ReportGenerator(fp_analyzer, max_workers=1).build_charts()
+    parallel = ReportGenerator(fp_analyzer, max_workers=4).build_charts()
+    assert list(parallel) == [name for name, _ in ReportGenerator.CHART_BUILDERS]
+    assert parallel == sequential
+
+
+@pytest.mark.parametrize('options', [{}, {'reuse_figures': True}, {'fast_figures': True}])
+def test_single_period_correlation_chart_has_no_trendline(cost_workbook, options):
+    analyzer = run_analysis(cost_workbook, '2024-10', '2024-10')
+    assert len(analyzer.df) == 1
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        spec = json.loads(ReportGenerator(analyzer, **options).create_revenue_chart())
+    trend = spec['data'][1]
+    assert list(trend['x']) == [] and list(trend['y']) == []
+    assert trend['name'] == 'Trend regresji (brak danych)'
+    assert spec['layout']['title']['text'].endswith('<sub>brak danych</sub>')
+
+
+def test_generate_html_records_chart_timings(fp_analyzer, tmp_path):
+    generator = ReportGenerator(fp_analyzer, max_workers=2)
+    out = generator.generate_html(str(tmp_path / 'raport.html'))
+    assert set(generator.chart_timings) == set(dict(ReportGenerator.CHART_BUILDERS))
+    html = open(out, encoding='utf-8').read()
+    assert '<script type="application/json" id="chart-spec-revenue-chart">{"data":' in html
+    assert '<script type="application/json" id="report-data">' in html
+
+
+def test_stream_html_writes_sections_incrementally(fp_analyzer):
+    class RecordingStream:
+        def __init__(self):
+            self.chunks = []
+
+        def write(self, chunk):
+            self.chunks.append(chunk)
+
+    stream = RecordingStream()
+    written = ReportGenerator(fp_analyzer, max_workers=2).stream_html(stream)
+    html = ''.join(stream.chunks)
+    assert written == len(html)
+    assert len(stream.chunks) > 1
+    assert stream.chunks[0].startswith('<!DOCTYPE html>')
+    assert html.rstrip().endswith('</html>')
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='wymaga node')
+def test_charts_render_lazily_and_resize_only_visible(fp_analyzer, tmp_path):
+    out = ReportGenerator(fp_analyzer, max_workers=1).generate_html(str(tmp_path / 'raport.html'))
+    html = open(out, encoding='utf-8').read()
+    charts = chart_layout(first_top=0, spacing=1500, height=500)
+    steps = [{'resize': 10}, {'frame': True}, {'scroll': 7500}, {'frame': True}]
+    scenario = {'viewport': 900, 'charts': charts, 'steps': steps, 'reportData': extract_dataset(html),
+                'specs': extract_chart_specs(html)}
+    counts = run_harness(extract_loader(html), scenario)
+
+    # Przy starcie widoczny jest tylko pierwszy wykres (+ margines 300 px)
+    assert counts['afterLoad']['newPlot'] == 1
+    # 10 zdarzeń resize w jednej klatce -> jeden resize widocznego wykresu
+    assert counts['total']['resize'] == 1
+    assert counts['total']['newPlot'] == 2
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='wymaga node')
+def test_live_update_redraws_only_changed_rendered_charts(fp_analyzer, tmp_path):
+    out = ReportGenerator(fp_analyzer, max_workers=1).generate_html(str(tmp_path / 'raport.html'))
+    html = open(out, encoding='utf-8').read()
+    specs = extract_chart_specs(html)
+    changed = dict(specs)
+    changed['revenue-chart'] = specs['revenue-chart'].replace('"data":', '"data" :', 1)
+    changed['profit-chart'] = specs['profit-chart'].replace('"data":', '"data" :', 1)
+    update = {'reportData': extract_dataset(html), 'specs': changed}
+    scenario = {'viewport': 900, 'charts': chart_layout(first_top=0, spacing=1500, height=500),
+                'reportData': extract_dataset(html), 'specs': specs,
+                'steps': [{'update': update}, {'update': update}]}
+    counts = run_harness(extract_loader(html), scenario)
+
+    # Widoczny wykres przychodów jest przerysowany raz, niewyrenderowany wykres zysku tylko dostaje nową specyfikację
+    assert counts['total']['react'] == 1
+    assert counts['total']['newPlot'] == 1
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='wymaga node')
+def test_live_update_refreshes_kpi_cards_and_simulator_data(cost_workbook, tmp_path):
+    def report(start, end):
+        out = ReportGenerator(run_analysis(cost_workbook, start, end), max_workers=1).generate_html(
+            str(tmp_path / f'{start}.html'))
+        return open(out, encoding='utf-8').read()
+
+    old, new = report('2024-10', '2025-03'), report('2024-10', '2024-12')
+    update = {'reportData': extract_dataset(new), 'specs': extract_chart_specs(new), 'kpi': extract_kpi_cards(new)}
+    scenario = {'viewport': 900, 'charts': chart_layout(first_top=0, spacing=1500, height=500),
+                'reportData': extract_dataset(old), 'specs': extract_chart_specs(old),
+                'kpi': extract_kpi_cards(old), 'steps': [{'update': update}]}
+    result = run_harness(extract_loader(old), scenario)
+
+    assert len(result['kpi']) == 8
+    assert result['kpi'] == update['kpi'] != extract_kpi_cards(old)
+    # Symulator dostaje KPI nowej wersji (baseData)
+    assert result['events'] == [{'type': 'report-data-updated', 'detail': json.loads(update['reportData'])}]
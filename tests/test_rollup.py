@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from sales_reports.benchmarks.synthetic import daily_rows, sales_orders
+from sales_reports.src.columnar import ColumnarStore
+from sales_reports.src.advanced_dashboard import AdvancedSalesDashboard
+from sales_reports.src.ingest import parse_daily_rows
+from sales_reports.src.rollup import GRAINS, RollupCube
+
+
+def test_incremental_updates_match_full_build():
+    orders = sales_orders(20_000, seed=2)
+    full = RollupCube.from_frame('a', orders, 'date', ['revenue'])
+
+    cube = RollupCube(['revenue'])
+    for offset in range(0, len(orders), 5_000):
+        chunk = orders.iloc[offset:offset + 5_000]
+        cube.add('a', chunk['date'], chunk[['revenue']])
+    # Ponowny import ostatniego kwartału niczego nie podwaja
+    last = orders[orders['date'] >= '2024-10-01']
+    cube.replace('a', last['date'], last[['revenue']])
+    for grain in GRAINS:
+        pdt.assert_frame_equal(cube.cells('a', grain), full.cells('a', grain), check_freq=False)
+
+    quarters = cube.query('a', 'quarter')
+    assert quarters['label'].iloc[0] == '2020-Q1'
+    assert quarters['revenue_count'].sum() == len(orders)
+    assert np.isclose(quarters['revenue_sum'].sum(), orders['revenue'].sum())
+    assert (quarters['revenue_min'].min(), quarters['revenue_max'].max()) == (orders['revenue'].min(),
+                                                                              orders['revenue'].max())
+
+
+def test_store_keeps_cube_and_dashboard_reads_grains(tmp_path):
+    rows = parse_daily_rows(daily_rows(2_000))
+    store = ColumnarStore(tmp_path)
+    store.ingest_daily('k1', rows)
+    store.ingest_sales('k1', sales_orders(1_000))
+
+    reopened = ColumnarStore(tmp_path).rollup('daily')
+    pdt.assert_frame_equal(reopened.cells('k1', 'month'), store.rollup('daily').cells('k1', 'month'),
+                           check_freq=False, check_index_type=False)
+
+    # Import innej encji zapisuje tylko jej tabele kostki
+    k1_tables = sorted(path.read_text() for path in (tmp_path / '_rollup' / 'daily' / 'k1').glob('*/_current'))
+    assert len(k1_tables) == len(GRAINS)
+    store.ingest_daily('k2', rows.iloc[:100])
+    assert sorted(path.read_text() for path in (tmp_path / '_rollup' / 'daily' / 'k1').glob('*/_current')) \
+        == k1_tables
+    assert ColumnarStore(tmp_path).rollup('daily').entities() == ['k1', 'k2']
+
+    dashboard = AdvancedSalesDashboard(None, None, store=ColumnarStore(tmp_path), entity='k1', start='2016-01')
+    per_day = rows[rows['date'] >= '2016-01-01'].groupby('date')['amount'].sum()
+    assert len(dashboard.df_daily) == len(per_day)
+    assert np.allclose(dashboard.df_daily['amount'], per_day.to_numpy())
+    assert len(dashboard.df_monthly) == 60
+    assert dashboard.df_weekly['label'].iloc[0] == '2015-W53'
+    # Słupki tygodni kolejnych lat mają osobne etykiety
+    weeks = dashboard.create_daily_chart().data[-1].x
+    assert len(set(weeks)) == len(weeks) == len(dashboard.df_weekly) and weeks[1] == '2016-W01'
+
+    # Brzegowe tygodnie i miesiące obejmują tylko dni zakresu
+    clipped = AdvancedSalesDashboard(None, None, store=ColumnarStore(tmp_path), entity='k1',
+                                     start='2020-01-15', end='2020-03-10')
+    assert np.isclose(clipped.df_weekly['amount_sum'].sum(), clipped.df_daily['amount'].sum())
+    assert list(clipped.df_weekly['label'].iloc[[0, -1]]) == ['2020-W03', '2020-W11']
+    orders = sales_orders(1_000)
+    in_range = orders[(orders['date'] >= '2020-01-15') & (orders['date'] <= '2020-03-10')]
+    assert len(clipped.df_monthly) == 3
+    assert np.isclose(clipped.df_monthly['revenue'].sum(), in_range['revenue'].sum())
+
@@ -0,0 +1,104 @@
+import gzip
+import http.client
+import os
+import socket
+import time
+
+from sales_reports.src.compression import precompress
+from sales_reports.src.server import ServerThread, make_server
+
+
+def test_keep_alive_serves_several_requests_on_one_connection(tmp_path):
+    (tmp_path / 'raport.html').write_text('<html>raport</html>', encoding='utf-8')
+    with ServerThread(make_server(tmp_path, '127.0.0.1', 0, workers=2)) as url:
+        conn = http.client.HTTPConnection(url.split('//')[1])
+        for _ in range(3):
+            conn.request('GET', '/raport.html')
+            response = conn.getresponse()
+            assert response.status == 200
+            assert response.version == 11
+            assert response.read() == b'<html>raport</html>'
+        sock = conn.sock
+        conn.request('GET', '/raport.html')
+        conn.getresponse().read()
+        assert conn.sock is sock
+        conn.close()
+
+
+def test_idle_connections_do_not_hold_workers(tmp_path):
+    (tmp_path / 'a.html').write_text('a', encoding='utf-8')
+    server = make_server(tmp_path, '127.0.0.1', 0, workers=1)
+    with ServerThread(server) as url:
+        host, port = url.split('//')[1].split(':')
+        # Bezczynne keep-alive po żądaniu i połączenia otwarte na zapas (bez żądania)...
+        idle = [http.client.HTTPConnection(host, int(port)) for _ in range(6)]
+        for conn in idle[:3]:
+            conn.request('GET', '/a.html')
+            assert conn.getresponse().read() == b'a'
+        spare = [socket.create_connection((host, int(port))) for _ in range(6)]
+        # ...nie zajmują jedynego workera
+        start = time.perf_counter()
+        other = http.client.HTTPConnection(host, int(port), timeout=5)
+        other.request('GET', '/a.html')
+        assert other.getresponse().read() == b'a'
+        assert time.perf_counter() - start < 1
+        # Bezczynne połączenie dalej obsługuje kolejne żądania
+        idle[0].request('GET', '/a.html')
+        assert idle[0].getresponse().read() == b'a'
+        other.close()
+
+        # Zamknięcie serwera nie czeka na timeout bezczynnych połączeń
+        start = time.perf_counter()
+    assert time.perf_counter() - start < 5
+    for conn in idle:
+        conn.close()
+    for sock in spare:
+        sock.close()
+
+
+def _get(url, path, **headers):
+    conn = http.client.HTTPConnection(url.split('//')[1])
+    conn.request('GET', path, headers=headers)
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response, body
+
+
+def test_conditional_requests_get_304(tmp_path):
+    (tmp_path / 'raport.html').write_text('<html>raport</html>', encoding='utf-8')
+    with ServerThread(make_server(tmp_path, '127.0.0.1', 0)) as url:
+        first, _ = _get(url, '/raport.html')
+        etag = first.getheader('ETag')
+        assert etag.startswith('"') and first.getheader('Cache-Control') == 'no-cache'
+
+        again, body = _get(url, '/raport.html', **{'If-None-Match': etag})
+        assert again.status == 304 and body == b''
+        assert again.getheader('ETag') == etag
+
+        since, _ = _get(url, '/raport.html', **{'If-Modified-Since': first.getheader('Last-Modified')})
+        assert since.status == 304
+
+        (tmp_path / 'raport.html').write_text('<html>nowy raport</html>', encoding='utf-8')
+        changed, body = _get(url, '/raport.html', **{'If-None-Match': etag})
+        assert changed.status == 200 and body == b'<html>nowy raport</html>'
+
+
+def test_precompressed_variant_is_negotiated(tmp_path):
+    report = tmp_path / 'raport.html'
+    report.write_text('<html>' + 'raport ' * 1000 + '</html>', encoding='utf-8')
+    precompress(report)
+    with ServerThread(make_server(tmp_path, '127.0.0.1', 0)) as url:
+        plain, plain_body = _get(url, '/raport.html')
+        assert plain.getheader('Content-Encoding') is None
+
+        gz, gz_body = _get(url, '/raport.html', **{'Accept-Encoding': 'gzip, br;q=0'})
+        assert gz.getheader('Content-Encoding') == 'gzip'
+        assert gz.getheader('Content-Type') == 'text/html'
+        assert gzip.decompress(gz_body) == plain_body
+        assert gz.getheader('ETag') != plain.getheader('ETag')
+
+        # Wariant starszy niż raport jest ignorowany
+        os.utime(tmp_path / 'raport.html.gz', ns=(0, 0))
+        stale, stale_body = _get(url, '/raport.html', **{'Accept-Encoding': 'gzip'})
+        assert stale.getheader('Content-Encoding') is None and stale_body == plain_body
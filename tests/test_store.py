@@ -0,0 +1,93 @@
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from sales_reports.benchmarks.synthetic import daily_sheet, monthly_sales, write_cost_workbook, write_dashboard_sources
+from sales_reports.src import cli
+from sales_reports.src.advanced_dashboard import AdvancedSalesDashboard
+from sales_reports.src.fp_holding_analyzer import FPHoldingAnalyzer
+from sales_reports.src.ingest import parse_daily_rows
+from sales_reports.src.store import AnalyticsStore
+
+
+def test_monthly_slice_matches_workbook_analysis(cost_workbook, tmp_path):
+    store = AnalyticsStore(tmp_path / 'dane.db')
+    assert store.ingest_cost_workbook('fp', cost_workbook) == 13
+    # Niezmieniony plik nie jest importowany drugi raz
+    assert store.ingest_cost_workbook('fp', cost_workbook) is None
+
+    from_file = FPHoldingAnalyzer(str(cost_workbook)).load_and_clean()
+    from_file.df = from_file.df[(from_file.df['Okres'] >= '2024-10-01') & (from_file.df['Okres'] <= '2025-03-01')]
+    from_store = FPHoldingAnalyzer('fp').load_from_store(store, 'fp', '2024-10', '2025-03')
+    pdt.assert_frame_equal(from_store.df.reset_index(drop=True), from_file.df.reset_index(drop=True),
+                           check_dtype=False)
+    assert from_store.analyze().analysis['summary'] == from_file.analyze().analysis['summary']
+    assert store.entities() == ['fp']
+
+
+def test_shorter_cost_workbook_replaces_all_periods(tmp_path):
+    store = AnalyticsStore(tmp_path / 'dane.db')
+    workbook = write_cost_workbook(tmp_path / 'koszty.xlsx')
+    store.ingest_cost_workbook('fp', workbook)
+    periods = list(store.monthly('fp')['Okres'])
+
+    write_cost_workbook(workbook, seed=1, months=6)
+    count = store.ingest_cost_workbook('fp', workbook, force=True)
+    assert count < len(periods)
+    assert list(store.monthly('fp')['Okres']) == periods[:count]
+
+
+def test_daily_reingest_replaces_range():
+    store = AnalyticsStore()
+    sheet = parse_daily_rows(daily_sheet(30))
+    store.ingest_daily('k1', sheet)
+    store.ingest_daily('k1', sheet.iloc[:10])
+    pdt.assert_frame_equal(store.daily('k1'), sheet.reset_index(drop=True), check_dtype=False)
+
+    september = store.daily('k1', '2025-09-10', '2025-09')
+    assert september['date'].min() == pd.Timestamp('2025-09-10')
+    assert len(september) == 21
+    assert store.daily('inna').empty
+
+
+def test_sources_over_the_same_days_are_kept_apart(tmp_path):
+    first, second = tmp_path / 'k1.xlsx', tmp_path / 'k2.xlsx'
+    daily_sheet(30, seed=1).to_excel(first, index=False)
+    daily_sheet(30, seed=2).to_excel(second, index=False)
+    store = AnalyticsStore()
+    assert store.ingest_daily_sheet('k1', first) == 30
+    assert store.ingest_daily_sheet('k1', second) == 30
+    assert len(store.daily('k1')) == 60
+
+    # Poprawiony pierwszy plik podmienia tylko swoje wiersze
+    daily_sheet(20, seed=3).to_excel(first, index=False)
+    assert store.ingest_daily_sheet('k1', first, force=True) == 20
+    amounts = store.daily('k1')['amount']
+    expected = pd.concat([daily_sheet(20, seed=3)['Kwota'], daily_sheet(30, seed=2)['Kwota']])
+    assert len(amounts) == 50 and amounts.sum() == pytest.approx(expected.sum())
+
+
+def test_dashboard_from_store_matches_files(tmp_path, capsys):
+    csv_path, excel_path = write_dashboard_sources(tmp_path)
+    db = tmp_path / 'dane.db'
+    assert cli.main(['ingest', '--db', str(db), '--entity', 'k1', '--daily', excel_path,
+                     '--sales', csv_path]) == 0
+    assert '📥' in capsys.readouterr().out
+
+    with AnalyticsStore(db) as store:
+        from_store = AdvancedSalesDashboard(None, None, store=store, entity='k1')
+    from_files = AdvancedSalesDashboard(csv_path, excel_path)
+    pdt.assert_frame_equal(from_store.df_daily, from_files.df_daily.reset_index(drop=True), check_dtype=False)
+    pdt.assert_frame_equal(from_store.df_monthly, from_files.df_monthly, check_dtype=False)
+    assert from_store.calculate_trends() == from_files.calculate_trends()
+
+    output = tmp_path / 'dashboard.html'
+    assert cli.main(['dashboard', '--db', str(db), '--entity', 'k1', '-o', str(output), '-q']) == 0
+    assert output.exists()
+
+
+def test_sales_slice(tmp_path):
+    store = AnalyticsStore()
+    store.ingest_sales('a', monthly_sales())
+    sliced = store.sales('a', '2025-01', '2025-03')
+    assert list(sliced['date']) == ['2025-01-01', '2025-02-01', '2025-03-01']
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from sales_reports.benchmarks import synthetic
+from sales_reports.benchmarks.measure import measure
+from sales_reports.src.advanced_dashboard import AdvancedSalesDashboard
+from sales_reports.src.analysis import summarize_sales
+from sales_reports.src.fp_holding_analyzer import FPHoldingAnalyzer
+from sales_reports.src.ingest import read_sales_csv
+
+
+def test_sales_csv_is_seeded_and_written_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(synthetic, '_CHUNK_ROWS', 400)
+    first = synthetic.write_sales_csv(tmp_path / 'a.csv', 1000, seed=3)
+    second = synthetic.write_sales_csv(tmp_path / 'b.csv', 1000, seed=3)
+    assert first.read_bytes() == second.read_bytes()
+
+    df = read_sales_csv(first)
+    assert list(df.columns) == ['date', 'customer', 'revenue']
+    summary = summarize_sales(df)
+    assert summary['orders_count'] == 1000
+    assert summary['total_revenue'] == pytest.approx(df['revenue'].sum())
+    assert pd.to_datetime(df['date'], format='%Y-%m-%d').notna().all()
+
+
+def test_daily_rows_match_extract_daily_data_layout():
+    sheet = synthetic.daily_rows(1000, seed=1)
+    assert sheet.loc[0, 'Okres'].endswith(' do 01.01.2015 23:00')
+    assert sheet.loc[9, 'Kwota'].count(',') == 1
+
+    dashboard = AdvancedSalesDashboard.__new__(AdvancedSalesDashboard)
+    dashboard.extract_daily_data(sheet)
+    # Co setny wiersz to podsumowanie bez zakresu dat
+    assert len(dashboard.df_daily) == 990
+    expected = sheet['Kwota'].dropna().map(lambda v: float(str(v).replace(' ', '').replace(',', '.'))).sum()
+    assert dashboard.df_daily['amount'].sum() == pytest.approx(expected)
+    assert dashboard.df_daily['date'].is_monotonic_increasing
+
+
+def test_long_cost_workbook_loads_like_the_real_one(tmp_path):
+    workbook = synthetic.write_cost_workbook(tmp_path / 'koszty.xlsx', months=2000)
+    analyzer = FPHoldingAnalyzer(str(workbook)).load_and_clean()
+    assert len(analyzer.df) == 13
+    assert str(analyzer.df['Okres'].iloc[0])[:7] == '2024-09'
+    with pytest.raises(ValueError):
+        synthetic.write_cost_workbook(tmp_path / 'za_duzy.xlsx', months=synthetic.EXCEL_MAX_ROWS)
+
+
+def test_measure_reports_repeats_and_peak_memory():
+    calls = []
+    result = measure(lambda: calls.append(bytearray(1_000_000)), repeat=3, warmup=1)
+    assert len(calls) == 5
+    assert len(result['times_s']) == 3
+    assert result['min_s'] <= result['median_s']
+    assert result['peak_bytes'] >= 1_000_000
+    assert measure(lambda: None, repeat=1, warmup=0, memory=False)['peak_bytes'] is None
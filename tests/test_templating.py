@@ -0,0 +1,32 @@
+import pytest
+from jinja2 import TemplateSyntaxError
+
+from sales_reports.src import report, templating
+
+
+def test_environment_is_shared_and_precompiled(tmp_path):
+    env = templating.get_environment(cache_dir=str(tmp_path))
+    assert templating.get_environment(cache_dir=str(tmp_path)) is env
+
+    compiled = list(tmp_path.glob('compiled-*/tmpl_*.py'))
+    assert len(compiled) == len(list(templating.TEMPLATE_DIR.glob('*.j2')))
+    # Szablon pochodzi z prekompilowanego modułu, a nie z pliku .j2
+    assert env.get_template('report.html.j2').filename.endswith('.py')
+
+
+def test_syntax_error_leaves_no_staging_directory(tmp_path):
+    templates = tmp_path / 'szablony'
+    templates.mkdir()
+    (templates / 'zly.html.j2').write_text('{% if %}', encoding='utf-8')
+    with pytest.raises(TemplateSyntaxError):
+        templating.precompile_templates(templates, tmp_path / 'cache')
+    assert list((tmp_path / 'cache').iterdir()) == []
+
+
+def test_generate_report_renders_summary(tmp_path, monkeypatch):
+    monkeypatch.setenv('FP_HOLDING_CACHE_DIR', str(tmp_path / 'cache'))
+    summary = {'total_revenue': 1234.5, 'orders_count': 3, 'avg_order_value': 411.5}
+    out = report.generate_report(summary, str(tmp_path / 'out' / 'report.html'))
+    html = open(out, encoding='utf-8').read()
+    assert '1,234.50 zł' in html
+    assert '<td class="value">3</td>' in html
@@ -0,0 +1,52 @@
+import json
+import threading
+
+from sales_reports.src import metrics, tracing
+from sales_reports.src.parallel import run_builders
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = tracing.Tracer()
+    with tracer.span('load') as span:
+        pass
+    assert span is None
+    assert tracer.spans == []
+
+
+def test_nested_spans_keep_parent_memory_peak(tmp_path):
+    tracer = tracing.Tracer().start(memory=True)
+    with tracer.span('analyze', rows=10):
+        blob = bytearray(2_000_000)
+        del blob
+        with tracer.span('inner'):
+            sum(range(1000))
+    tracer.stop()
+
+    inner, outer = tracer.spans
+    assert (outer.name, inner.name) == ('analyze', 'inner')
+    # Szczyt przed zagnieżdżonym spanem nie ginie przy jego reset_peak()
+    assert outer.memory_peak >= 2_000_000
+    assert inner.memory_peak < 1_000_000
+    assert outer.duration_ns >= inner.duration_ns and outer.cpu_ns > 0
+
+    trace = json.loads(tracer.write(tmp_path / 'trace.json').read_text(encoding='utf-8'))
+    complete = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+    assert [event['name'] for event in complete] == ['analyze', 'inner']
+    assert complete[0]['args']['rows'] == 10
+    assert complete[0]['ts'] <= complete[1]['ts']
+    assert complete[0]['ts'] + complete[0]['dur'] >= complete[1]['ts'] + complete[1]['dur']
+    names = {event['tid']: event['args']['name'] for event in trace['traceEvents'] if event['ph'] == 'M'}
+    assert names[complete[0]['tid']] == threading.current_thread().name
+
+
+def test_chart_builders_and_stages_use_global_tracer():
+    tracer = tracing.enable()
+    try:
+        run_builders({'a': lambda: 1, 'b': lambda: 2}, max_workers=2)
+        with metrics.stage('render'):
+            pass
+    finally:
+        tracing.disable()
+    assert sorted((s['category'], s['name']) for s in tracer.summary()) == [
+        ('chart', 'a'), ('chart', 'b'), ('stage', 'render')]
+    assert all(span.memory_peak is None for span in tracer.spans)
@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+
+import pytest
+
+from sales_reports.benchmarks.synthetic import write_cost_workbook
+from sales_reports.src.atomic import atomic_open
+from sales_reports.src.jobs import JobQueue
+from sales_reports.src.watcher import FPReportTarget, Watcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def touch(path, seconds):
+    os.utime(path, ns=(seconds * 10**9, seconds * 10**9))
+
+
+def test_bursts_of_saves_are_debounced(tmp_path):
+    class Target:
+        def __init__(self, source):
+            self.name, self.sources, self.runs = source, [str(source)], 0
+
+        def run(self, timer):
+            self.runs += 1
+            return True
+
+    cost, sales = tmp_path / 'koszty.xlsx', tmp_path / 'sprzedaz.csv'
+    cost.write_text('a')
+    sales.write_text('b')
+    cost_target, sales_target = Target(cost), Target(sales)
+    clock = FakeClock()
+    watcher = Watcher([cost_target, sales_target], debounce=2.0, clock=clock)
+
+    for second in (1, 2, 3):
+        clock.now = second
+        touch(cost, second)
+        assert watcher.poll() == []
+    clock.now = 4.5
+    assert watcher.poll() == []
+    clock.now = 5.0
+    assert watcher.poll() == [cost_target]
+    assert (cost_target.runs, sales_target.runs) == (1, 0)
+    clock.now = 10.0
+    assert watcher.poll() == []
+
+
+def test_fp_target_skips_unchanged_data_and_writes_atomically(tmp_path):
+    workbook = write_cost_workbook(tmp_path / 'koszty.xlsx')
+    output = tmp_path / 'raport.html'
+    target = FPReportTarget(workbook, output_path=str(output), max_workers=1)
+    watcher = Watcher([target], debounce=0.0, clock=FakeClock())
+
+    touch(workbook, 100)
+    assert watcher.poll() == [target]
+    assert watcher.regenerations == 1
+    assert output.read_text(encoding='utf-8').rstrip().endswith('</html>')
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['koszty.xlsx', 'raport.html', 'raport.html.gz']
+
+    # Zapis bez zmiany danych - tylko etap load
+    touch(workbook, 200)
+    watcher.poll()
+    assert watcher.regenerations == 1
+
+    write_cost_workbook(workbook, seed=1)
+    touch(workbook, 300)
+    watcher.poll()
+    assert watcher.regenerations == 2
+
+
+def test_fp_target_with_job_queue_never_writes_alongside_startup_job(tmp_path):
+    started, release = threading.Event(), threading.Event()
+    lock = threading.Lock()
+    state = {'active': 0, 'max_active': 0, 'runs': 0}
+
+    def runner(spec, path, progress):
+        with lock:
+            state['active'] += 1
+            state['max_active'] = max(state['max_active'], state['active'])
+            state['runs'] += 1
+        started.set()
+        release.wait(5)
+        path.write_text('raport')
+        with lock:
+            state['active'] -= 1
+
+    workbook = write_cost_workbook(tmp_path / 'koszty.xlsx')
+    output = tmp_path / 'raport.html'
+    jobs = JobQueue(tmp_path, max_workers=2, runner=runner)
+    startup = jobs.submit(workbook, 'fp_holding', output_path=output)
+    assert started.wait(5)
+
+    submitted = []
+    submit = jobs.submit
+
+    def recording_submit(*args, **kwargs):
+        submitted.append(submit(*args, **kwargs))
+        return submitted[-1]
+
+    jobs.submit = recording_submit
+
+    # Zapis arkusza w trakcie zadania startowego
+    target = FPReportTarget(workbook, output_path=output, jobs=jobs)
+    watcher = Watcher([target], debounce=0.0, clock=FakeClock())
+    touch(workbook, 100)
+    poll = threading.Thread(target=watcher.poll)
+    poll.start()
+    while not submitted:
+        time.sleep(0.01)
+    # Ten sam klucz - watcher dostaje trwające zadanie startowe, a nie drugi zapis obok niego
+    assert submitted[0] is startup
+    release.set()
+    poll.join(10)
+    jobs.shutdown()
+
+    assert startup.status == 'done'
+    assert watcher.regenerations == 1
+    # Raport przebudowany po zadaniu startowym (mogło czytać starą wersję), nigdy równolegle
+    assert (state['runs'], state['max_active']) == (2, 1)
+
+
+def test_atomic_open_keeps_old_file_on_error(tmp_path):
+    path = tmp_path / 'raport.html'
+    path.write_text('stary')
+    with pytest.raises(RuntimeError):
+        with atomic_open(path) as f:
+            f.write('połowa')
+            raise RuntimeError
+    assert path.read_text() == 'stary'
+    assert list(tmp_path.iterdir()) == [path]